@@ -3,14 +3,89 @@ import os
 import json
 import datetime
 import tempfile
-from src.weather_data_enhanced import WeatherDataCollector
+import time
+from src.weather_data_enhanced import WeatherDataCollector, MODE_FULL, MODE_FAST
 from src.script_generator_improved import ScriptGenerator
+from src.rate_limiter import get_rate_limiter
+from src.http_session import get_session_pool
+from src.http_cache import get_http_cache
+from src.prefetch_scheduler import PrefetchScheduler
+from src.snapshot_cache import SnapshotCache
+from src.single_flight import SingleFlight
+from src.circuit_breaker import get_circuit_breakers
+from src.fetch_stats import get_fetch_stats
+from src.deadline import Deadline
+from src.raw_archive import get_raw_archive
 
 app = Flask(__name__, static_url_path='/static', static_folder='static')
 
 # 現在のスクリプトを保存するグローバル変数
 current_script = None
 
+# データ収集クラス（ワーカー内で共有し、接続プールを再利用する）
+collector = WeatherDataCollector()
+
+# 同時に発生した天気データ取得を1回にまとめる
+collector_flight = SingleFlight()
+
+def load_weather_data(deadline=None):
+    """天気データを取得する（同時に要求された取得は1回にまとめる）"""
+    return collector_flight.do("complete", collector.get_complete_weather_data, deadline=deadline)
+
+# 原稿生成1回あたりの処理期限（gunicornのワーカータイムアウトより短くする）
+GENERATE_DEADLINE_SECONDS = float(os.environ.get("WEATHER_GENERATE_DEADLINE_SECONDS", "25"))
+
+# 先読み・裏での再取得1回あたりの処理期限
+# （期限のない取得に原稿生成のリクエストが相乗りして、ワーカーが止まり続けないようにする）
+REFRESH_DEADLINE_SECONDS = float(os.environ.get("WEATHER_REFRESH_DEADLINE_SECONDS", str(GENERATE_DEADLINE_SECONDS)))
+
+# 天気データのスナップショットキャッシュ（期限切れ後は裏で再取得）
+snapshot_cache = SnapshotCache(
+    load_weather_data,
+    ttl_seconds=float(os.environ.get("WEATHER_SNAPSHOT_TTL_SECONDS", "600")),
+    is_partial=lambda snapshot: bool(snapshot.missing_regions),
+    background_deadline_seconds=REFRESH_DEADLINE_SECONDS
+)
+
+# 気象庁の定時発表に合わせて天気データを先読みするスケジューラー（ワーカーごとに起動）
+prefetcher = PrefetchScheduler(
+    snapshot_cache.refresh,
+    issue_delay_minutes=float(os.environ.get("WEATHER_PREFETCH_DELAY_MINUTES", "10")),
+    interval_minutes=float(os.environ.get("WEATHER_PREFETCH_INTERVAL_MINUTES", "60")),
+    keep_snapshot=False,  # スナップショットはsnapshot_cacheのみが保持する
+    deadline_seconds=REFRESH_DEADLINE_SECONDS
+)
+if os.environ.get("WEATHER_PREFETCH_ENABLED", "1") == "1":
+    prefetcher.start()
+
+def get_weather_data(deadline=None):
+    """キャッシュ済みの天気データを取得する（未取得の場合のみ期限内でその場で取得）"""
+    return snapshot_cache.get(deadline=deadline)
+
+def get_fast_weather_data(deadline=None):
+    """
+    高速モードの天気データを取得する
+    保持中のスナップショットがあれば鮮度に関係なく使い、なければ気象庁の予報データのみを取得する
+    
+    Returns:
+        tuple: (天気データ, データを生成したモード)
+    """
+    weather_data = snapshot_cache.peek()
+    if weather_data is not None:
+        return weather_data, "cached"
+    
+    weather_data = collector_flight.do("fast", collector.get_complete_weather_data, deadline=deadline, mode=MODE_FAST)
+    return weather_data, MODE_FAST
+
+def build_timings(weather_data, data_seconds, generate_seconds):
+    """レスポンスに含める段階ごとの処理時間を組み立てる"""
+    return {
+        "weather_data": round(data_seconds, 3),
+        "generate": round(generate_seconds, 3),
+        "total": round(data_seconds + generate_seconds, 3),
+        "fetch": weather_data.timings
+    }
+
 @app.route('/')
 def index():
     """メインページを表示"""
@@ -22,18 +97,34 @@ def generate_script():
     global current_script
     
     try:
-        # 天気データを取得
-        collector = WeatherDataCollector()
-        weather_data = collector.get_complete_weather_data()
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode', MODE_FULL)
+        
+        # 天気データを取得（処理期限を過ぎた場合は取得済みの地域のみ）
+        deadline = Deadline(GENERATE_DEADLINE_SECONDS)
+        if mode == MODE_FAST:
+            weather_data, produced_by = get_fast_weather_data(deadline)
+        else:
+            weather_data, produced_by = get_weather_data(deadline), MODE_FULL
+        data_seconds = deadline.elapsed()
         
         # 原稿を生成
+        generate_started_at = time.monotonic()
         generator = ScriptGenerator()
         script = generator.generate_complete_script(weather_data)
+        generate_seconds = time.monotonic() - generate_started_at
         
         # 現在のスクリプトを保存
         current_script = script
         
-        return jsonify({"success": True, "script": script})
+        return jsonify({
+            "success": True,
+            "mode": produced_by,
+            "script": script,
+            "missing_regions": weather_data.missing_regions,
+            "snapshot_id": weather_data.snapshot_id,
+            "timings": build_timings(weather_data, data_seconds, generate_seconds)
+        })
     except Exception as e:
         print(f"Error generating script: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -50,11 +141,13 @@ def regenerate_script():
         data = request.json
         instruction = data.get('instruction', '')
         
-        # 天気データを取得
-        collector = WeatherDataCollector()
-        weather_data = collector.get_complete_weather_data()
+        # 天気データを取得（処理期限を過ぎた場合は取得済みの地域のみ）
+        deadline = Deadline(GENERATE_DEADLINE_SECONDS)
+        weather_data = get_weather_data(deadline)
+        data_seconds = deadline.elapsed()
         
         # 原稿を生成
+        generate_started_at = time.monotonic()
         generator = ScriptGenerator()
         script = generator.generate_complete_script(weather_data)
         
@@ -76,10 +169,18 @@ def regenerate_script():
         reading_time = total_chars / 250
         script["reading_time"] = f"{reading_time:.1f}"
         
+        generate_seconds = time.monotonic() - generate_started_at
+        
         # 現在のスクリプトを更新
         current_script = script
         
-        return jsonify({"success": True, "script": script})
+        return jsonify({
+            "success": True,
+            "script": script,
+            "missing_regions": weather_data.missing_regions,
+            "snapshot_id": weather_data.snapshot_id,
+            "timings": build_timings(weather_data, data_seconds, generate_seconds)
+        })
     except Exception as e:
         print(f"Error regenerating script: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -176,6 +277,26 @@ def export_text():
         print(f"Error exporting text: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+@app.route('/api/nationwide_weather', methods=['GET'])
+def nationwide_weather():
+    """全国の全府県予報区の予報を返すAPI（地方局向け）"""
+    try:
+        include_overview = request.args.get('overview') == '1'
+        deadline = Deadline(GENERATE_DEADLINE_SECONDS)
+        
+        # 同時に要求された全国取得は1回にまとめる
+        nationwide_data = collector_flight.do(
+            "nationwide_overview" if include_overview else "nationwide",
+            collector.get_nationwide_weather_data,
+            deadline=deadline,
+            include_overview=include_overview
+        )
+        
+        return jsonify({"success": True, **nationwide_data})
+    except Exception as e:
+        print(f"Error fetching nationwide weather: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 # デバッグ用ルート
 @app.route('/debug')
 def debug():
@@ -188,6 +309,35 @@ def debug():
     }
     return jsonify(debug_info)
 
+@app.route('/debug/fetch_stats')
+def debug_fetch_stats():
+    """外部データ取得の統計情報を表示"""
+    fetch_stats = {
+        "rate_limiter": get_rate_limiter().get_stats(),
+        "http_sessions": get_session_pool().get_stats(),
+        "http_cache": get_http_cache().get_stats(),
+        "prefetch": prefetcher.get_stats(),
+        "snapshot_cache": snapshot_cache.get_stats(),
+        "single_flight": collector_flight.get_stats(),
+        "source_health": get_circuit_breakers().get_stats(),
+        "transfer": get_fetch_stats().get_stats(),
+        "raw_archive": get_raw_archive().get_stats() if get_raw_archive() else None
+    }
+    return jsonify(fetch_stats)
+
+@app.route('/debug/raw_data/<snapshot_id>')
+def debug_raw_data(snapshot_id):
+    """スナップショットの元になった取得結果を表示（保持・アーカイブする設定の場合のみ）"""
+    snapshot = snapshot_cache.peek()
+    if snapshot is not None and snapshot.snapshot_id == snapshot_id and snapshot.raw_data is not None:
+        return jsonify(snapshot.raw_data)
+    
+    raw_archive = get_raw_archive()
+    raw_data = raw_archive.load(snapshot_id) if raw_archive else None
+    if raw_data is None:
+        return jsonify({"success": False, "error": "Raw data not found"}), 404
+    return jsonify(raw_data)
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,85 @@
+"""
+HTML抽出のベンチマーク
+記録済みのウェザーマップ・Yahoo!天気のページ（なければ合成ページ）を使い、
+従来の全体解析（html.parser）と対象要素のみの解析の処理時間を比較します。
+抽出結果が従来の処理と一致することも確認します。
+
+使い方:
+    python benchmarks/bench_html_extract.py [--fixture-dir fixtures] [--repeat 50]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.html_extract import parse_weathermap_html, parse_yahoo_html, DEFAULT_PARSER
+from src.mock_upstream_server import synthetic_weathermap_html, synthetic_yahoo_html
+from src.replay_transport import DEFAULT_FIXTURE_DIR
+
+
+# 合成ページに加える、実ページのナビゲーション・広告枠に相当する要素
+_FILLER = "".join(
+    f'<div class="nav-item"><a href="/area/{i}"><span>地点{i}</span></a><p>関連情報{i}</p></div>'
+    for i in range(300)
+)
+
+
+def load_pages(fixture_dir, host, synthetic):
+    """記録済みのページを読み込む（なければ実ページ程度の大きさにした合成ページを使う）"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, host, "**", "*.body"), recursive=True)):
+        with open(path, "rb") as f:
+            pages.append(f.read().decode("utf-8", errors="replace"))
+    if not pages:
+        html = synthetic().decode("utf-8")
+        pages = [html.replace("<body>", "<body>" + _FILLER).replace("</body>", _FILLER + "</body>")]
+    return pages
+
+
+def measure(parse, pages, repeat, **kwargs):
+    """全ページを repeat 回解析したときの1ページあたりの平均時間（ミリ秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parse(page, **kwargs)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(pages))
+
+
+def run(name, parse, pages, repeat):
+    baseline_kwargs = {"parser": "html.parser", "scoped": False}
+    variants = [
+        ("full tree / html.parser", baseline_kwargs),
+        ("scoped / html.parser", {"parser": "html.parser", "scoped": True}),
+    ]
+    if DEFAULT_PARSER != "html.parser":
+        variants.append((f"scoped / {DEFAULT_PARSER}", {"parser": DEFAULT_PARSER, "scoped": True}))
+
+    # 抽出結果が従来の処理と一致するか確認
+    for page in pages:
+        expected = parse(page, **baseline_kwargs)
+        for label, kwargs in variants[1:]:
+            if parse(page, **kwargs) != expected:
+                print(f"[{name}] result mismatch: {label}")
+
+    print(f"{name}: {len(pages)} page(s), {repeat} round(s)")
+    baseline = None
+    for label, kwargs in variants:
+        elapsed = measure(parse, pages, repeat, **kwargs)
+        baseline = baseline or elapsed
+        print(f"  {label:<28} {elapsed:8.3f} ms/page  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML抽出のベンチマーク")
+    parser.add_argument("--fixture-dir", default=os.environ.get("WEATHER_FIXTURE_DIR", DEFAULT_FIXTURE_DIR))
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    run("weathermap", parse_weathermap_html,
+        load_pages(args.fixture_dir, "weathermap.jp", lambda: synthetic_weathermap_html("東京都")), args.repeat)
+    run("yahoo", parse_yahoo_html,
+        load_pages(args.fixture_dir, "weather.yahoo.co.jp", synthetic_yahoo_html), args.repeat)
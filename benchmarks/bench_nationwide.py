@@ -0,0 +1,66 @@
+"""
+全国モードのベンチマーク
+ローカルのモックサーバー（遅延を設定した合成の気象庁JSON）に対して全府県予報区を取得し、
+同時リクエスト数ごとの処理時間と、正規化した区域・地点の数を計測します。
+レート制限は本番と同じ設定（create_rate_limiter）を使い、実行ごとに作り直して前の実行の待ちを持ち越しません。
+処理時間が原稿生成と同じ期限（WEATHER_GENERATE_DEADLINE_SECONDS、既定25秒）に収まるかも表示します。
+
+使い方:
+    python benchmarks/bench_nationwide.py [--latency 0.2] [--sub-areas 8] [--concurrency 1 4 16] [--overview]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.mock_upstream_server as mock
+from src.mock_upstream_server import MockUpstreamServer, EndpointBehavior
+
+
+def start_mock_server(latency, sub_areas):
+    """遅延を設定したモックサーバーを起動し、ベースURLを返す"""
+    synthetic = mock.synthetic_jma_forecast
+    mock.synthetic_jma_forecast = lambda area_code: synthetic(area_code, sub_areas=sub_areas)
+
+    server = MockUpstreamServer(("127.0.0.1", 0), {"default": EndpointBehavior(latency=latency)}, fixture_dir=None)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="全国モードのベンチマーク")
+    parser.add_argument("--latency", type=float, default=0.2, help="モックサーバーの応答遅延（秒）")
+    parser.add_argument("--sub-areas", type=int, default=8, help="予報区ごとの区域・地点の数")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--overview", action="store_true", help="府県予報区ごとの概況も取得する")
+    args = parser.parse_args()
+
+    base_url = start_mock_server(args.latency, args.sub_areas)
+
+    # 全てモックサーバーに向ける（レート制限は本番の設定のまま）
+    os.environ["WEATHER_JMA_BASE_URL"] = base_url
+    os.environ.setdefault("WEATHER_HTTP_POOL_MAXSIZE", str(max(args.concurrency)))
+    deadline_seconds = float(os.environ.get("WEATHER_GENERATE_DEADLINE_SECONDS", "25"))
+
+    from src.rate_limiter import create_rate_limiter
+    from src.weather_data_enhanced import WeatherDataCollector
+
+    collector = WeatherDataCollector()
+    print(f"mock latency {args.latency}s, {args.sub_areas} areas per series, overview {args.overview}, "
+          f"deadline {deadline_seconds:g}s")
+    for concurrency in args.concurrency:
+        collector.nationwide_concurrency = concurrency
+        collector.rate_limiter = create_rate_limiter()
+        started_at = time.perf_counter()
+        result = collector.get_nationwide_weather_data(include_overview=args.overview)
+        elapsed = time.perf_counter() - started_at
+        limits = next(iter(collector.rate_limiter.get_stats().values()))
+        print(f"  concurrency {concurrency:>3}: {elapsed:7.3f}s {'ok' if elapsed <= deadline_seconds else 'OVER':>4}"
+              f"  offices {len(result['offices']) - len(result['missing_offices'])}/{len(result['offices'])}"
+              f"  areas {result['area_count']}  normalize {result['timings']['normalize']}s"
+              f"  requests {limits['requests']} (rate {limits['rate']:g}/s, burst {limits['burst']},"
+              f" throttled {limits['throttled']}, wait {limits['total_wait']}s)")
@@ -0,0 +1,118 @@
+"""
+天気テキスト→天気コードの逆引きのベンチマーク
+天気コード表の全テキストについて、リゾルバーが自身のコードを返すことを表で確認し、
+組み合わせたテキストでは総当たりの最長一致と結果が一致することを確認します。
+従来の逐次走査（表の先頭から部分一致したコードを返す）との処理時間も比較します。
+
+使い方:
+    python benchmarks/bench_weather_text_resolver.py [--repeat 20] [--table]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.weather_data_enhanced import WeatherDataCollector
+from src.weather_text_resolver import WeatherTextResolver
+
+# 天気テキストの前後に付けて、スクレイピング結果に近い表記にする語句
+_DECORATIONS = [("", ""), ("", " 所により雨"), ("", "で雷を伴う"), ("夜は", ""), ("くもり ", " のち晴れ")]
+
+
+def first_hit(mapping, weather_text):
+    """従来の逆引き（表の先頭から部分一致したコード）"""
+    for code, text in mapping.items():
+        if text in weather_text:
+            return code
+    return None
+
+
+def longest_match(mapping, weather_text):
+    """総当たりの最長一致（同じ長さなら表で先に現れるコード）"""
+    best = None
+    for code, text in mapping.items():
+        if text in weather_text and (best is None or len(text) > len(mapping[best])):
+            best = code
+    return best
+
+
+def check_table(mapping, resolver, show_table):
+    """全テキストが自身のコードに逆引きされることを確認する"""
+    failures = 0
+    changed = []
+    for code, text in mapping.items():
+        resolved = resolver.resolve(text)
+        legacy = first_hit(mapping, text)
+        if resolved != code:
+            failures += 1
+        if legacy != code:
+            changed.append((code, text, legacy))
+        if show_table:
+            mark = "ok" if resolved == code else "NG"
+            print(f"  {mark} {code} {text:<14} -> {resolved} (legacy {legacy})")
+    print(f"table: {len(mapping)} entries, {failures} failure(s)")
+    print(f"  legacy first-hit returned a less specific code for {len(changed)} entries, e.g.")
+    for code, text, legacy in changed[:5]:
+        print(f"    {text} ({code}) -> {legacy} ({mapping[legacy]})")
+    return failures
+
+
+def build_inputs(mapping):
+    """表のテキストを装飾・連結した入力を作る"""
+    texts = list(mapping.values())
+    inputs = [prefix + text + suffix for text in texts for prefix, suffix in _DECORATIONS]
+    inputs += [a + " " + b for a in texts for b in texts]
+    return inputs
+
+
+def check_inputs(mapping, resolver, inputs):
+    """組み合わせたテキストで総当たりの最長一致と一致することを確認する"""
+    mismatches = [text for text in inputs if resolver.resolve(text) != longest_match(mapping, text)]
+    print(f"combined inputs: {len(inputs)} texts, {len(mismatches)} mismatch(es)")
+    for text in mismatches[:5]:
+        print(f"    {text}: {resolver.resolve(text)} != {longest_match(mapping, text)}")
+    return len(mismatches)
+
+
+def measure(resolve, inputs, repeat):
+    """全入力を repeat 回逆引きしたときの1件あたりの平均時間（マイクロ秒）"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in inputs:
+            resolve(text)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(inputs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="天気テキスト逆引きのベンチマーク")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--table", action="store_true", help="全テキストの逆引き結果を表示する")
+    args = parser.parse_args()
+
+    mapping = WeatherDataCollector().weather_code_mapping
+
+    failures = check_table(mapping, WeatherTextResolver(mapping), args.table)
+    inputs = build_inputs(mapping)
+    failures += check_inputs(mapping, WeatherTextResolver(mapping, memo_size=len(inputs)), inputs)
+
+    # スクレイピングで実際に現れる程度の種類の入力
+    sample = [prefix + text + suffix for text in mapping.values() for prefix, suffix in _DECORATIONS]
+    unmemoized = WeatherTextResolver(mapping, memo_size=0)
+    memoized = WeatherTextResolver(mapping, memo_size=len(sample))
+
+    print(f"timing: {len(sample)} texts, {args.repeat} round(s)")
+    baseline = None
+    for label, resolve in [
+        ("legacy first-hit scan", lambda text: first_hit(mapping, text)),
+        ("brute-force longest", lambda text: longest_match(mapping, text)),
+        ("automaton (no memo)", unmemoized._scan),
+        ("automaton + memo", memoized.resolve),
+    ]:
+        elapsed = measure(resolve, sample, args.repeat)
+        baseline = baseline or elapsed
+        print(f"  {label:<24} {elapsed:8.3f} us/text  x{baseline / elapsed:.2f}")
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,229 @@
+"""
+サーキットブレーカーモジュール
+情報源（気象庁の予報・概況、ウェザーマップ、Yahoo!天気）ごとに失敗を監視し、
+連続して失敗した情報源へのリクエストを一定時間遮断します。
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Any
+
+try:
+    from src.latency_tracker import get_latency_tracker
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from latency_tracker import get_latency_tracker
+
+# ブレーカーの状態
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """ブレーカーが開いているためリクエストを送信しなかったことを示す例外"""
+
+    def __init__(self, source: str):
+        super().__init__(f"Circuit breaker for {source} is open")
+        self.source = source
+
+
+class CircuitBreaker:
+    """1情報源分のサーキットブレーカー"""
+
+    def __init__(self, name: str, failure_threshold: int = 5,
+                 reset_timeout: float = 30, half_open_max_calls: int = 1):
+        """
+        Args:
+            name: 情報源の名前
+            failure_threshold: ブレーカーを開くまでの連続失敗回数
+            reset_timeout: 開いてから試行リクエストを許可するまでの秒数
+            half_open_max_calls: 半開状態で同時に許可する試行リクエスト数
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.half_open_calls = 0
+        self._lock = threading.Lock()
+
+        # 健全性の統計
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.open_count = 0
+
+    def _cooldown_elapsed(self) -> bool:
+        return self.opened_at is not None and time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def is_open(self) -> bool:
+        """
+        リクエストを送っても遮断される状態かどうかを確認する（試行枠は消費しない）
+
+        Returns:
+            bool: 遮断中の場合はTrue
+        """
+        with self._lock:
+            if self.state == STATE_OPEN:
+                return not self._cooldown_elapsed()
+            if self.state == STATE_HALF_OPEN:
+                return self.half_open_calls >= self.half_open_max_calls
+            return False
+
+    def allow_request(self) -> bool:
+        """
+        リクエストを送信してよいか判定する
+        開いた状態で一定時間が経過していれば半開状態に移り、試行リクエストを許可する
+
+        Returns:
+            bool: 送信してよい場合はTrue
+        """
+        with self._lock:
+            if self.state == STATE_OPEN and self._cooldown_elapsed():
+                self.state = STATE_HALF_OPEN
+                self.half_open_calls = 0
+
+            if self.state == STATE_CLOSED:
+                return True
+
+            if self.state == STATE_HALF_OPEN and self.half_open_calls < self.half_open_max_calls:
+                self.half_open_calls += 1
+                return True
+
+            self.rejected += 1
+            return False
+
+    def release_probe(self):
+        """
+        試行リクエストの枠を返す
+        期限切れなどで応答の成否を判定せずに打ち切った場合に呼び出し、半開状態の枠が埋まったままにならないようにする
+        """
+        with self._lock:
+            if self.state == STATE_HALF_OPEN and self.half_open_calls > 0:
+                self.half_open_calls -= 1
+
+    def record_success(self):
+        """成功を記録する（半開状態なら閉じる）"""
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            if self.state == STATE_HALF_OPEN:
+                self.state = STATE_CLOSED
+                self.opened_at = None
+                self.half_open_calls = 0
+
+    def record_failure(self):
+        """失敗を記録する（連続失敗が閾値に達するか、半開状態での失敗なら開く）"""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.state == STATE_HALF_OPEN or \
+               (self.state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+                self.half_open_calls = 0
+                self.open_count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        ブレーカーの状態と成功率を取得する
+
+        Returns:
+            Dict[str, Any]: 状態・成功率などの統計
+        """
+        with self._lock:
+            total = self.successes + self.failures
+            state = self.state
+            if state == STATE_OPEN and self._cooldown_elapsed():
+                state = STATE_HALF_OPEN
+            return {
+                "state": state,
+                "successes": self.successes,
+                "failures": self.failures,
+                "rejected": self.rejected,
+                "success_rate": round(self.successes / total, 3) if total else None,
+                "consecutive_failures": self.consecutive_failures,
+                "open_count": self.open_count
+            }
+
+
+class CircuitBreakerRegistry:
+    """情報源ごとのブレーカーを管理するクラス"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30,
+                 half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CircuitBreaker:
+        """
+        情報源のブレーカーを取得する（なければ生成する）
+
+        Args:
+            source: 情報源の名前
+
+        Returns:
+            CircuitBreaker: 情報源のブレーカー
+        """
+        with self._lock:
+            breaker = self._breakers.get(source)
+            if breaker is None:
+                breaker = CircuitBreaker(source, self.failure_threshold,
+                                         self.reset_timeout, self.half_open_max_calls)
+                self._breakers[source] = breaker
+            return breaker
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        情報源ごとの健全性の統計を取得する
+        ブレーカーの状態・成功率に応答時間のパーセンタイルを加える
+
+        Returns:
+            Dict[str, Any]: 情報源名をキーとした統計
+        """
+        with self._lock:
+            breakers = list(self._breakers.items())
+
+        latency_tracker = get_latency_tracker()
+        stats = {}
+        for source, breaker in breakers:
+            source_stats = breaker.get_stats()
+            key = f"source:{source}"
+            for p in (50, 90, 99):
+                latency = latency_tracker.percentile(key, p)
+                source_stats[f"latency_p{p}"] = round(latency, 3) if latency is not None else None
+            stats[source] = source_stats
+        return stats
+
+
+# プロセス全体で共有するブレーカー
+_shared_breakers = None
+_shared_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """
+    プロセス共通のブレーカーを取得する
+    WEATHER_BREAKER_FAILURE_THRESHOLD（開くまでの連続失敗回数）、
+    WEATHER_BREAKER_RESET_SECONDS（試行を許可するまでの秒数）、
+    WEATHER_BREAKER_HALF_OPEN_CALLS（半開状態で許可する試行数）で設定できる
+
+    Returns:
+        CircuitBreakerRegistry: 共有のブレーカー
+    """
+    global _shared_breakers
+    with _shared_breakers_lock:
+        if _shared_breakers is None:
+            _shared_breakers = CircuitBreakerRegistry(
+                failure_threshold=int(os.environ.get("WEATHER_BREAKER_FAILURE_THRESHOLD", "5")),
+                reset_timeout=float(os.environ.get("WEATHER_BREAKER_RESET_SECONDS", "30")),
+                half_open_max_calls=int(os.environ.get("WEATHER_BREAKER_HALF_OPEN_CALLS", "1"))
+            )
+        return _shared_breakers
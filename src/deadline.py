@@ -0,0 +1,57 @@
+"""
+処理期限（デッドライン）モジュール
+1回の原稿生成にかけられる全体の時間を管理し、
+各リクエストのタイムアウトを残り時間に合わせて短縮します。
+"""
+
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """処理期限を過ぎたことを示す例外"""
+
+
+class Deadline:
+    """処理全体の期限を表すクラス"""
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: 現在から期限までの秒数
+        """
+        self.seconds = seconds
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + seconds
+
+    def remaining(self) -> float:
+        """期限までの残り秒数（期限切れの場合は0）"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def elapsed(self) -> float:
+        """開始からの経過秒数"""
+        return time.monotonic() - self.started_at
+
+    def expired(self) -> bool:
+        """期限を過ぎているかどうか"""
+        return time.monotonic() >= self.expires_at
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """
+        リクエストに設定するタイムアウトを求める
+
+        Args:
+            default: 通常のタイムアウト（秒）
+
+        Returns:
+            float: 通常のタイムアウトと残り時間の短いほう
+
+        Raises:
+            DeadlineExceeded: 既に期限を過ぎている場合
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:.1f}s exceeded")
+        if default is None:
+            return remaining
+        return min(default, remaining)
@@ -0,0 +1,88 @@
+"""
+取得処理の計測モジュール
+情報源ごと・地域ごとに、転送量（圧縮後・展開後のバイト数）やダウンロードの打ち切り回数などを集計します。
+"""
+
+import threading
+from typing import Dict, Any, Optional
+
+
+class FetchStats:
+    """情報源ごと・地域ごとの取得処理のカウンター"""
+
+    def __init__(self):
+        self._sources: Dict[str, Dict[str, float]] = {}
+        self._regions: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _add(table: Dict[str, Dict[str, float]], key: str, counters: Dict[str, float]):
+        values = table.get(key)
+        if values is None:
+            values = {}
+            table[key] = values
+        for name, amount in counters.items():
+            values[name] = values.get(name, 0) + amount
+
+    def record(self, source: str, region: Optional[str] = None, **counters: float):
+        """
+        カウンターを加算する
+
+        Args:
+            source: 情報源の名前
+            region: 地域名（指定した場合は地域ごとにも集計する）
+            **counters: カウンター名と加算する値（bytes=1024 など）
+        """
+        with self._lock:
+            self._add(self._sources, source, counters)
+            if region is not None:
+                self._add(self._regions, f"{source}:{region}", counters)
+
+    def get_totals(self, *names: str) -> Dict[str, float]:
+        """
+        全情報源を合計したカウンターの値を取得する
+
+        Args:
+            *names: 合計するカウンター名
+
+        Returns:
+            Dict[str, float]: カウンター名と合計値
+        """
+        with self._lock:
+            return {name: sum(values.get(name, 0) for values in self._sources.values()) for name in names}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        集計結果を取得する
+
+        Returns:
+            Dict[str, Any]: 情報源ごと（sources）と情報源:地域ごと（regions）のカウンター
+        """
+        with self._lock:
+            def rounded(values):
+                return {name: round(amount, 6) if isinstance(amount, float) else amount
+                        for name, amount in values.items()}
+
+            return {
+                "sources": {key: rounded(values) for key, values in self._sources.items()},
+                "regions": {key: rounded(values) for key, values in self._regions.items()}
+            }
+
+
+# プロセス全体で共有するカウンター
+_shared_fetch_stats = None
+_shared_fetch_stats_lock = threading.Lock()
+
+
+def get_fetch_stats() -> FetchStats:
+    """
+    プロセス共通の取得処理のカウンターを取得する
+
+    Returns:
+        FetchStats: 共有のカウンター
+    """
+    global _shared_fetch_stats
+    with _shared_fetch_stats_lock:
+        if _shared_fetch_stats is None:
+            _shared_fetch_stats = FetchStats()
+        return _shared_fetch_stats
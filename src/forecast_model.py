@@ -0,0 +1,146 @@
+"""
+天気データのモデルモジュール
+get_complete_weather_data から原稿生成に渡す天気データを、入れ子の辞書ではなく
+__slots__ を使った小さなレコードで保持します。
+気温・降水確率は取り込み時に1回だけ数値に変換し、原稿生成では変換し直しません。
+JSONで返す場合は to_dict() で従来と同じ形の辞書に変換します。
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Union
+
+Number = Union[int, float]
+
+# 文字列から数値部分を取り出す（"25"・"25℃"・"-3"・"−3" など）
+_NUMBER_RE = re.compile(r"[-−]?\d+(?:\.\d+)?")
+
+
+def parse_number(value: Any) -> Optional[Number]:
+    """
+    気温・降水確率などの値を数値に変換する
+
+    Args:
+        value: 変換する値（文字列・数値・None）
+
+    Returns:
+        Optional[Number]: 数値（整数で表せる場合はint。数値を含まない場合はNone）
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    match = _NUMBER_RE.search(str(value))
+    if match is None:
+        return None
+    text = match.group(0).replace("−", "-")
+    return float(text) if "." in text else int(text)
+
+
+def _record_to_dict(record) -> Dict[str, Any]:
+    return {name: getattr(record, name) for name in record.__slots__}
+
+
+class RegionWeather:
+    """地域ごとの1日分の天気"""
+
+    __slots__ = ("weather", "code")
+
+    def __init__(self, weather: Optional[str], code: Optional[str]):
+        self.weather = weather
+        self.code = code
+
+
+class RegionTemperature:
+    """地域ごとの1日分の最低・最高気温（℃）"""
+
+    __slots__ = ("min", "max")
+
+    def __init__(self, min_temp: Any = None, max_temp: Any = None):
+        self.min: Optional[Number] = parse_number(min_temp)
+        self.max: Optional[Number] = parse_number(max_temp)
+
+
+class WeeklyDay:
+    """週間予報の1日分"""
+
+    __slots__ = ("weather_code", "weather", "pop", "temp_min", "temp_max", "weekday")
+
+    def __init__(self, weather_code: Optional[str], weather: Optional[str], pop: Any = None,
+                 temp_min: Any = None, temp_max: Any = None, weekday: Optional[str] = None):
+        self.weather_code = weather_code
+        self.weather = weather
+        self.weekday = weekday  # 曜日（月〜日。分からない場合はNone）
+        self.pop: Optional[Number] = parse_number(pop)
+        self.temp_min: Optional[Number] = parse_number(temp_min)
+        self.temp_max: Optional[Number] = parse_number(temp_max)
+
+
+class WeatherSnapshot:
+    """原稿生成に使う天気データ一式（get_complete_weather_data の結果）"""
+
+    __slots__ = ("date", "mode", "overview", "temperature", "weekly", "warnings", "missing_regions",
+                 "deadline_exceeded", "timings", "transfer", "snapshot_id", "raw_data")
+
+    def __init__(self, date: str, mode: str,
+                 overview: Dict[str, Dict[str, Any]],
+                 temperature: Dict[str, Dict[str, RegionTemperature]],
+                 weekly: Dict[str, WeeklyDay],
+                 warnings: List[str],
+                 missing_regions: List[str],
+                 deadline_exceeded: bool = False,
+                 timings: Optional[Dict[str, float]] = None,
+                 transfer: Optional[Dict[str, float]] = None,
+                 snapshot_id: Optional[str] = None,
+                 raw_data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            date: 取得日（表示用の文字列）
+            mode: データを生成したモード
+            overview: 日（today / tomorrow）→ 地域名 → RegionWeather と、
+                      week → 地域名 → 週間予報の天気コードのタプル
+            temperature: 日（today / tomorrow）→ 地域名 → RegionTemperature
+            weekly: 日付（%m/%d）→ WeeklyDay
+            warnings: 注意報・警報情報
+            missing_regions: どの情報源からも天気を取得できなかった地域
+            deadline_exceeded: 処理期限を過ぎたかどうか
+            timings: 段階ごとの処理時間（秒）
+            transfer: この取得での転送量
+            snapshot_id: スナップショットID（取得結果のアーカイブを引くときに使う）
+            raw_data: 情報源ごとの取得結果（保持する設定の場合のみ。通常はNone）
+        """
+        self.date = date
+        self.mode = mode
+        self.overview = overview
+        self.temperature = temperature
+        self.weekly = weekly
+        self.warnings = warnings
+        self.missing_regions = missing_regions
+        self.deadline_exceeded = deadline_exceeded
+        self.timings = timings or {}
+        self.transfer = transfer or {}
+        self.snapshot_id = snapshot_id
+        self.raw_data = raw_data
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONで返すための辞書に変換する"""
+        overview = {
+            day: {region: _record_to_dict(weather) for region, weather in regions.items()}
+            for day, regions in self.overview.items() if day != "week"
+        }
+        overview["week"] = {region: {"codes": list(codes)} for region, codes in self.overview.get("week", {}).items()}
+        return {
+            "date": self.date,
+            "mode": self.mode,
+            "overview": overview,
+            "temperature": {
+                day: {region: _record_to_dict(temps) for region, temps in regions.items()}
+                for day, regions in self.temperature.items()
+            },
+            "weekly": {date: _record_to_dict(day) for date, day in self.weekly.items()},
+            "warnings": list(self.warnings),
+            "missing_regions": list(self.missing_regions),
+            "deadline_exceeded": self.deadline_exceeded,
+            "timings": self.timings,
+            "transfer": self.transfer,
+            "snapshot_id": self.snapshot_id,
+            "raw_data": self.raw_data
+        }
+
@@ -0,0 +1,342 @@
+"""
+HTML抽出モジュール
+ウェザーマップ・Yahoo!天気のページから天気予報データを抽出します。
+必要な要素（.today-weather, .forecastCity, .forecastTable など）の部分木だけを解析し、
+lxmlがインストールされていれば高速なlxmlパーサーを使います。
+本文をストリーミングで読み込み、必要な要素を読み終えた時点で打ち切る処理も提供します。
+文字コードはヘッダーかmetaタグから決め、文字コードの自動判定は行いません。
+"""
+
+import codecs
+import re
+from typing import Dict, Any, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_PARSER = "lxml"
+except ImportError:  # lxmlがない環境では標準のパーサーを使う
+    DEFAULT_PARSER = "html.parser"
+
+# 「25℃ / 15℃」のような表記から最高・最低気温を取り出す
+_TEMP_PAIR_RE = re.compile(r"(\d+)[^\d]+(\d+)")
+
+# 解析対象の要素（これ以外の部分木は解析しない）
+WEATHERMAP_TARGET_CLASSES = ["today-weather", "tomorrow-weather", "temperature", "weekly-forecast"]
+YAHOO_TARGET_CLASSES = ["forecastCity", "forecastTable"]
+
+# 読み終えたらダウンロードを打ち切る要素（ページ内で解析対象の要素のうち最後に現れるもの）
+WEATHERMAP_END_CLASS = "weekly-forecast"
+YAHOO_END_CLASS = "forecastTable"
+
+_WEATHERMAP_STRAINER = SoupStrainer(class_=WEATHERMAP_TARGET_CLASSES)
+_YAHOO_STRAINER = SoupStrainer(class_=YAHOO_TARGET_CLASSES)
+
+Markup = Union[str, bytes]
+
+
+# 文字コードの指定（Content-Typeヘッダーとmetaタグ）
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([A-Za-z0-9_.:\-]+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([A-Za-z0-9_.:\-]+)", re.IGNORECASE)
+
+# metaタグを探す範囲（先頭からのバイト数）
+_META_SCAN_BYTES = 4096
+
+# 日本語ページの文字コード名の読み替え（機種依存文字を含むページに対応）
+_ENCODING_ALIASES = {
+    "shift_jis": "cp932",
+    "shift-jis": "cp932",
+    "sjis": "cp932",
+    "x-sjis": "cp932",
+    "windows-31j": "cp932"
+}
+
+DEFAULT_ENCODING = "utf-8"
+
+# ストリーミング読み込みの停止理由
+STOP_TARGET = "target"        # 対象要素の終わりまで読み込んだ
+STOP_EOF = "eof"              # 本文の最後まで読み込んだ
+STOP_MAX_BYTES = "max_bytes"  # 上限バイト数に達した
+STOP_DEADLINE = "deadline"    # 処理全体の期限を過ぎた（本文が途中までのため解析に使わない）
+
+
+class ElementEndScanner:
+    """
+    読み込み途中のHTMLから、指定したクラスを持つ要素の終わりを探すクラス
+    開始タグを見つけた後は同名タグの入れ子を数え、閉じタグの位置を求める
+    """
+
+    def __init__(self, class_name: str):
+        self._open_re = re.compile(
+            rb"<([a-zA-Z][a-zA-Z0-9]*)\b[^>]*?\bclass\s*=\s*[\"'](?:[^\"']*\s)?"
+            + re.escape(class_name.encode("ascii")) + rb"(?:\s[^\"']*)?[\"'][^>]*>"
+        )
+        self._tag_re = None
+        self._pos = 0
+        self._depth = 0
+
+    def feed(self, buffer: bytes) -> Optional[int]:
+        """
+        読み込み済みのバッファを調べる（前回の続きから走査する）
+
+        Args:
+            buffer: 先頭からの読み込み済みのバイト列
+
+        Returns:
+            Optional[int]: 要素の終わりの位置（まだ見つからない場合はNone）
+        """
+        if self._tag_re is None:
+            match = self._open_re.search(buffer, self._pos)
+            if match is None:
+                # 開始タグが途中で切れている可能性があるため、末尾の一部は次回も走査する
+                self._pos = max(0, len(buffer) - 512)
+                return None
+            tag = re.escape(match.group(1))
+            self._tag_re = re.compile(rb"<(/?)" + tag + rb"\b[^>]*>", re.IGNORECASE)
+            self._pos = match.end()
+            self._depth = 1
+
+        for match in self._tag_re.finditer(buffer, self._pos):
+            if match.group(1):
+                self._depth -= 1
+            elif not match.group(0).endswith(b"/>"):
+                self._depth += 1
+            self._pos = match.end()
+            if self._depth == 0:
+                return match.end()
+        return None
+
+
+def read_html_stream(response, end_class: Optional[str], max_bytes: int,
+                     chunk_size: int = 16384, deadline=None):
+    """
+    レスポンス本文を少しずつ読み込み、必要な要素を読み終えた時点で打ち切る
+
+    Args:
+        response: stream=Trueで取得したレスポンス
+        end_class: 読み終えたら打ち切る要素のクラス名（Noneの場合は打ち切らない）
+        max_bytes: 読み込むバイト数の上限
+        chunk_size: 1回に読み込むバイト数
+        deadline: 処理全体の期限（過ぎた場合はその時点で打ち切る）
+
+    Returns:
+        Tuple[bytes, str]: 読み込んだ本文と停止理由（STOP_*）
+    """
+    scanner = ElementEndScanner(end_class) if end_class else None
+    buffer = bytearray()
+
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += chunk
+
+        if scanner is not None:
+            end = scanner.feed(buffer)
+            if end is not None:
+                return bytes(buffer[:end]), STOP_TARGET
+
+        if len(buffer) >= max_bytes:
+            return bytes(buffer[:max_bytes]), STOP_MAX_BYTES
+
+        if deadline is not None and deadline.expired():
+            return bytes(buffer), STOP_DEADLINE
+
+    return bytes(buffer), STOP_EOF
+
+
+def _normalize_encoding(name: Optional[str]) -> Optional[str]:
+    """文字コード名を検証し、Pythonで使える名前にする（不明な場合はNone）"""
+    if not name:
+        return None
+    name = _ENCODING_ALIASES.get(name.lower(), name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_encoding(body: bytes, content_type: Optional[str] = None) -> str:
+    """
+    ページの文字コードをヘッダーまたはmetaタグから決める（本文全体の自動判定は行わない）
+
+    Args:
+        body: ページの本文
+        content_type: Content-Typeヘッダーの値
+
+    Returns:
+        str: 文字コード（指定がない場合はUTF-8）
+    """
+    if content_type:
+        match = _HEADER_CHARSET_RE.search(content_type)
+        encoding = _normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            return encoding
+
+    match = _META_CHARSET_RE.search(body, 0, _META_SCAN_BYTES)
+    if match:
+        encoding = _normalize_encoding(match.group(1).decode("ascii"))
+        if encoding:
+            return encoding
+
+    return DEFAULT_ENCODING
+
+
+def decode_html(body: bytes, content_type: Optional[str] = None):
+    """
+    ページの本文を決めた文字コードで1回だけデコードする
+
+    Args:
+        body: ページの本文
+        content_type: Content-Typeヘッダーの値
+
+    Returns:
+        Tuple[str, str]: デコードした本文と文字コード
+    """
+    encoding = detect_encoding(body, content_type)
+    return body.decode(encoding, errors="replace"), encoding
+
+
+def _make_soup(markup: Markup, strainer: Optional[SoupStrainer], parser: Optional[str],
+               encoding: Optional[str] = None) -> BeautifulSoup:
+    """対象要素に絞ってHTMLを解析する（strainerがNoneの場合は全体を解析する）"""
+    kwargs = {}
+    if strainer is not None:
+        kwargs["parse_only"] = strainer
+    if encoding is not None and isinstance(markup, bytes):
+        kwargs["from_encoding"] = encoding
+    return BeautifulSoup(markup, parser or DEFAULT_PARSER, **kwargs)
+
+
+def _split_temps(text: str):
+    """気温の表記から（最高, 最低）を取り出す（取り出せない場合はNone）"""
+    match = _TEMP_PAIR_RE.search(text)
+    if match:
+        return match.group(1), match.group(2)
+    return None
+
+
+def parse_weathermap_html(markup: Markup, parser: Optional[str] = None, scoped: bool = True,
+                          encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    ウェザーマップの地点ページから天気予報データを抽出する
+
+    Args:
+        markup: ページのHTML
+        parser: BeautifulSoupのパーサー（Noneの場合はlxml、なければhtml.parser）
+        scoped: Trueの場合は対象要素の部分木だけを解析する
+        encoding: markupがバイト列の場合の文字コード
+
+    Returns:
+        Dict[str, Any]: 今日・明日の天気、気温、週間天気
+    """
+    soup = _make_soup(markup, _WEATHERMAP_STRAINER if scoped else None, parser, encoding)
+
+    # 今日の天気
+    today_weather = None
+    today_element = soup.select_one(".today-weather")
+    if today_element:
+        today_weather = today_element.text.strip()
+
+    # 明日の天気
+    tomorrow_weather = None
+    tomorrow_element = soup.select_one(".tomorrow-weather")
+    if tomorrow_element:
+        tomorrow_weather = tomorrow_element.text.strip()
+
+    # 気温データ
+    temps = {}
+    temp_elements = soup.select(".temperature")
+    if temp_elements and len(temp_elements) >= 2:
+        today_pair = _split_temps(temp_elements[0].text.strip())
+        if today_pair:
+            temps["today_max"], temps["today_min"] = today_pair
+
+        tomorrow_pair = _split_temps(temp_elements[1].text.strip())
+        if tomorrow_pair:
+            temps["tomorrow_max"], temps["tomorrow_min"] = tomorrow_pair
+
+    # 週間天気（7日分まで）
+    weekly = {}
+    for element in soup.select(".weekly-forecast .day")[:7]:
+        date_elem = element.select_one(".date")
+        weather_elem = element.select_one(".weather")
+        temp_elem = element.select_one(".temp")
+
+        if date_elem and weather_elem and temp_elem:
+            pair = _split_temps(temp_elem.text.strip())
+            weekly[date_elem.text.strip()] = {
+                "weather": weather_elem.text.strip(),
+                "max_temp": pair[0] if pair else None,
+                "min_temp": pair[1] if pair else None
+            }
+
+    return {
+        "today_weather": today_weather,
+        "tomorrow_weather": tomorrow_weather,
+        "temperatures": temps,
+        "weekly": weekly
+    }
+
+
+def _img_alt(element) -> Optional[str]:
+    """要素内の画像の代替テキスト（天気）を取り出す"""
+    if element is None:
+        return None
+    img = element.select_one("img")
+    if img and img.get("alt"):
+        return img.get("alt")
+    return None
+
+
+def parse_yahoo_html(markup: Markup, parser: Optional[str] = None, scoped: bool = True,
+                     encoding: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Yahoo!天気の地点ページから天気予報データを抽出する
+
+    Args:
+        markup: ページのHTML
+        parser: BeautifulSoupのパーサー（Noneの場合はlxml、なければhtml.parser）
+        scoped: Trueの場合は対象要素の部分木だけを解析する
+        encoding: markupがバイト列の場合の文字コード
+
+    Returns:
+        Dict[str, Any]: 今日・明日の天気、気温、週間天気
+    """
+    soup = _make_soup(markup, _YAHOO_STRAINER if scoped else None, parser, encoding)
+
+    # 今日・明日の天気
+    today_weather = _img_alt(soup.select_one(".forecastCity > table td.pict"))
+    tomorrow_weather = _img_alt(soup.select_one(".forecastCity > table td.pict + td.pict"))
+
+    # 気温データ
+    temps = {}
+    high_elements = soup.select(".forecastCity > table td.temp .high em")
+    low_elements = soup.select(".forecastCity > table td.temp .low em")
+
+    if high_elements and len(high_elements) >= 2:
+        temps["today_max"] = high_elements[0].text.strip()
+        temps["tomorrow_max"] = high_elements[1].text.strip()
+
+    if low_elements and len(low_elements) >= 2:
+        temps["today_min"] = low_elements[0].text.strip()
+        temps["tomorrow_min"] = low_elements[1].text.strip()
+
+    # 週間天気（ヘッダー行を除いて7日分）
+    weekly = {}
+    for element in soup.select(".forecastTable table tr")[1:8]:
+        cells = element.select("td")
+        if len(cells) >= 5:
+            high_elem = cells[3].select_one(".high em")
+            low_elem = cells[3].select_one(".low em")
+
+            weekly[cells[0].text.strip()] = {
+                "weather": _img_alt(cells[1]),
+                "max_temp": high_elem.text.strip() if high_elem else None,
+                "min_temp": low_elem.text.strip() if low_elem else None
+            }
+
+    return {
+        "today_weather": today_weather,
+        "tomorrow_weather": tomorrow_weather,
+        "temperatures": temps,
+        "weekly": weekly
+    }
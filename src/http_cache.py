@@ -0,0 +1,132 @@
+"""
+条件付きGET用キャッシュモジュール
+レスポンス本文をETag・Last-Modifiedとともに保持し、
+304 Not Modifiedが返された場合は保存済みのデータを再利用します。
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class CacheEntry:
+    """1URL分のキャッシュデータ"""
+
+    __slots__ = ("body", "etag", "last_modified")
+
+    def __init__(self, body: Any, etag: Optional[str], last_modified: Optional[str]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validators(self) -> Dict[str, str]:
+        """条件付きGETで送信するリクエストヘッダーを生成する"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ConditionalGetCache:
+    """URLごとに検証子と解析済みの本文を保持するキャッシュ"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        URLに対応するキャッシュを取得する
+
+        Args:
+            url: リクエスト先のURL
+
+        Returns:
+            Optional[CacheEntry]: キャッシュ（存在しない場合はNone）
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def store(self, url: str, body: Any, headers) -> bool:
+        """
+        レスポンスをキャッシュに保存する（検証子がない場合は保存しない）
+
+        Args:
+            url: リクエスト先のURL
+            body: 解析済みのレスポンス本文
+            headers: レスポンスヘッダー
+
+        Returns:
+            bool: 保存した場合はTrue
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+
+        with self._lock:
+            self._entries[url] = CacheEntry(body, etag, last_modified)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def record(self, key: str, hit: bool):
+        """
+        キャッシュのヒット・ミスを記録する
+
+        Args:
+            key: 集計単位のキー（エリアコード）
+            hit: 304で保存済みデータを再利用した場合はTrue
+        """
+        with self._lock:
+            stats = self._stats.setdefault(key, {"hits": 0, "misses": 0})
+            stats["hits" if hit else "misses"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        キーごとのヒット・ミス数を取得する
+
+        Returns:
+            Dict[str, Any]: エリアコードをキーとした統計情報
+        """
+        with self._lock:
+            stats = {}
+            for key, counts in self._stats.items():
+                total = counts["hits"] + counts["misses"]
+                stats[key] = {
+                    "hits": counts["hits"],
+                    "misses": counts["misses"],
+                    "hit_ratio": round(counts["hits"] / total, 3) if total else 0.0
+                }
+            return stats
+
+
+# プロセス全体で共有するキャッシュ
+_shared_http_cache = None
+_shared_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> ConditionalGetCache:
+    """
+    プロセス共通の条件付きGETキャッシュを取得する
+    WEATHER_HTTP_CACHE_MAX_ENTRIES（保持するURL数の上限）で設定できる
+
+    Returns:
+        ConditionalGetCache: 共有のキャッシュ
+    """
+    global _shared_http_cache
+    with _shared_http_cache_lock:
+        if _shared_http_cache is None:
+            _shared_http_cache = ConditionalGetCache(
+                max_entries=int(os.environ.get("WEATHER_HTTP_CACHE_MAX_ENTRIES", "256"))
+            )
+        return _shared_http_cache
@@ -0,0 +1,148 @@
+"""
+HTTPセッション管理モジュール
+上流ホストごとにキープアライブ接続をプールしたrequests.Sessionを保持し、
+プロセス内の全てのデータ収集処理で共有します。
+"""
+
+import importlib.util
+import os
+import threading
+from typing import Callable, Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+try:
+    from src.replay_transport import create_transport_adapter, get_transport_mode, TRANSPORT_LIVE
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from replay_transport import create_transport_adapter, get_transport_mode, TRANSPORT_LIVE
+
+# 上流に伝える対応圧縮形式（brotliはデコーダーがインストールされている場合のみ）
+if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+    ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class SessionPool:
+    """上流ホストごとに接続プール付きのセッションを管理するクラス"""
+
+    def __init__(self, pool_maxsize: int = 10, pool_block: bool = False,
+                 adapter_factory: Optional[Callable[..., BaseAdapter]] = None):
+        """
+        Args:
+            pool_maxsize: ホストごとに保持する接続数の上限
+            pool_block: 上限到達時に空きを待つかどうか
+            adapter_factory: トランスポートアダプターを生成する関数
+                             （記録・再生用のアダプターに差し替える場合に指定する）
+        """
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.adapter_factory = adapter_factory or HTTPAdapter
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        """URLからセッションを引くキー（スキーム + ホスト + ポート）を求める"""
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _create_session(self) -> requests.Session:
+        """接続プールと圧縮転送を設定したセッションを生成する"""
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = self.adapter_factory(
+            pool_connections=1,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        URLのホストに対応するセッションを取得する（なければ生成する）
+
+        Args:
+            url: リクエスト先のURL
+
+        Returns:
+            requests.Session: ホスト専用のセッション
+        """
+        key = self._host_key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[key] = session
+            return session
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        ホストごとの接続再利用の統計を取得する
+
+        Returns:
+            Dict[str, Any]: ホストをキーとした新規接続数・再利用数の統計
+        """
+        stats = {}
+        with self._lock:
+            sessions = list(self._sessions.items())
+
+        for key, session in sessions:
+            requests_count = 0
+            connections_opened = 0
+            adapter = session.get_adapter(key)
+            if not hasattr(adapter, "poolmanager"):
+                # 再生用アダプターは実際の接続を持たない
+                if hasattr(adapter, "get_stats"):
+                    stats[key] = adapter.get_stats()
+                continue
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                try:
+                    pool = pools[pool_key]
+                except KeyError:
+                    continue
+                requests_count += pool.num_requests
+                connections_opened += pool.num_connections
+
+            reused = max(0, requests_count - connections_opened)
+            stats[key] = {
+                "requests": requests_count,
+                "connections_opened": connections_opened,
+                "connections_reused": reused,
+                "reuse_ratio": round(reused / requests_count, 3) if requests_count else 0.0
+            }
+        return stats
+
+
+# プロセス全体で共有するセッションプール
+_shared_session_pool = None
+_shared_session_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """
+    プロセス共通のセッションプールを取得する
+    WEATHER_HTTP_POOL_MAXSIZE（ホストごとの最大接続数）と
+    WEATHER_HTTP_POOL_BLOCK（上限到達時に空きを待つ場合は1）で設定できる
+    WEATHER_TRANSPORT_MODE が record / replay の場合は記録・再生用のアダプターを使う
+
+    Returns:
+        SessionPool: 共有のセッションプール
+    """
+    global _shared_session_pool
+    with _shared_session_pool_lock:
+        if _shared_session_pool is None:
+            _shared_session_pool = SessionPool(
+                pool_maxsize=int(os.environ.get("WEATHER_HTTP_POOL_MAXSIZE", "10")),
+                pool_block=os.environ.get("WEATHER_HTTP_POOL_BLOCK", "0") == "1",
+                adapter_factory=create_transport_adapter
+            )
+            mode = get_transport_mode()
+            if mode != TRANSPORT_LIVE:
+                print(f"HTTP transport mode: {mode}")
+        return _shared_session_pool
@@ -0,0 +1,251 @@
+"""
+気象庁の予報区モジュール
+同梱の予報区ファイル（data/jma_areas.json）を読み込み、
+地方予報区（centers）→ 府県予報区（offices）→ 一次細分区域（class10s）→ 市町村等（class15s / class20s）
+の階層をコードから名称・親・子を定数時間で引ける索引として保持します。
+放送で使う地域（北海道・東北 など）と各情報源での地点の対応も同じファイルで管理します。
+
+予報区ファイルの更新（気象庁の area.json から細分区域まで取り込む）:
+    python -m src.jma_areas update
+    python -m src.jma_areas update area.json  # ダウンロード済みのファイルから更新する場合
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+# 予報区の階層（粗い順）
+LEVEL_CENTERS = "centers"
+LEVEL_OFFICES = "offices"
+LEVEL_CLASS10 = "class10s"
+LEVEL_CLASS15 = "class15s"
+LEVEL_CLASS20 = "class20s"
+AREA_LEVELS = (LEVEL_CENTERS, LEVEL_OFFICES, LEVEL_CLASS10, LEVEL_CLASS15, LEVEL_CLASS20)
+
+# 各階層の親の階層
+_PARENT_LEVELS = dict(zip(AREA_LEVELS[1:], AREA_LEVELS[:-1]))
+
+# 同梱の予報区ファイル
+DEFAULT_AREA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "jma_areas.json")
+
+# 気象庁の予報区一覧
+JMA_AREA_URL = "https://www.jma.go.jp/bosai/common/const/area.json"
+
+
+class AreaRecord:
+    """1予報区分の情報"""
+
+    __slots__ = ("code", "level", "name", "parent", "children")
+
+    def __init__(self, code: str, level: str, name: str, parent: Optional[str], children: Tuple[str, ...]):
+        self.code = code
+        self.level = level
+        self.name = name
+        self.parent = parent
+        self.children = children
+
+    def __repr__(self):
+        return f"AreaRecord({self.level}:{self.code} {self.name})"
+
+
+class AreaIndex:
+    """予報区の階層をコードから引く索引"""
+
+    def __init__(self, data: Dict[str, Any]):
+        """
+        Args:
+            data: 予報区ファイルの内容（気象庁の area.json と同じ階層ごとの表を含む）
+        """
+        self._tables: Dict[str, Dict[str, AreaRecord]] = {}
+        for level in AREA_LEVELS:
+            self._tables[level] = {
+                code: AreaRecord(code, level, entry.get("name"), entry.get("parent"), tuple(entry.get("children", ())))
+                for code, entry in data.get(level, {}).items()
+            }
+
+        self.forecast_file_aliases: Dict[str, str] = dict(data.get("forecast_file_aliases", {}))
+
+        # 放送で使う地域と各情報源での地点（読み込み時に1回だけ組み立てる）
+        self.broadcast_regions: Dict[str, Dict[str, Any]] = dict(data.get("broadcast_regions", {}))
+        self.region_offices = {region: info["office"] for region, info in self.broadcast_regions.items()}
+        self.office_regions = {office: region for region, office in self.region_offices.items()}
+        self.weathermap_area_names = {region: info["weathermap"] for region, info in self.broadcast_regions.items()}
+        self.yahoo_weather_ids = {region: info["yahoo"] for region, info in self.broadcast_regions.items()}
+        self.region_groups: Dict[str, List[str]] = {}
+        for region, info in self.broadcast_regions.items():
+            self.region_groups.setdefault(info.get("group", region), []).append(region)
+
+    def get(self, code: str, level: Optional[str] = None) -> Optional[AreaRecord]:
+        """
+        コードから予報区を引く
+
+        Args:
+            code: 予報区コード
+            level: 階層（省略時は府県予報区→地方予報区→細分区域の順に探す。
+                   地方予報区と府県予報区でコードが重なる場合があるため、分かる場合は指定する）
+
+        Returns:
+            Optional[AreaRecord]: 予報区（見つからない場合はNone）
+        """
+        if level is not None:
+            return self._tables[level].get(code)
+        for candidate in (LEVEL_OFFICES, LEVEL_CENTERS, LEVEL_CLASS10, LEVEL_CLASS15, LEVEL_CLASS20):
+            record = self._tables[candidate].get(code)
+            if record is not None:
+                return record
+        return None
+
+    def name(self, code: str, level: Optional[str] = None) -> Optional[str]:
+        """コードから予報区の名称を引く（見つからない場合はNone）"""
+        record = self.get(code, level)
+        return record.name if record else None
+
+    def parent(self, code: str, level: Optional[str] = None) -> Optional[AreaRecord]:
+        """コードから1つ上の階層の予報区を引く"""
+        record = self.get(code, level)
+        if record is None or record.parent is None or record.level not in _PARENT_LEVELS:
+            return None
+        return self._tables[_PARENT_LEVELS[record.level]].get(record.parent)
+
+    def children(self, code: str, level: Optional[str] = None) -> List[AreaRecord]:
+        """コードから1つ下の階層の予報区を引く"""
+        record = self.get(code, level)
+        if record is None:
+            return []
+        child_level = AREA_LEVELS[AREA_LEVELS.index(record.level) + 1] if record.level != LEVEL_CLASS20 else None
+        if child_level is None:
+            return []
+        table = self._tables[child_level]
+        return [table[child] for child in record.children if child in table]
+
+    def office_of(self, code: str, level: Optional[str] = None) -> Optional[AreaRecord]:
+        """細分区域・市町村等のコードから、それを含む府県予報区を引く"""
+        record = self.get(code, level)
+        while record is not None and record.level not in (LEVEL_OFFICES, LEVEL_CENTERS):
+            record = self.parent(record.code, record.level)
+        return record if record is not None and record.level == LEVEL_OFFICES else None
+
+    def offices(self) -> List[AreaRecord]:
+        """全ての府県予報区"""
+        return list(self._tables[LEVEL_OFFICES].values())
+
+    def centers(self) -> List[AreaRecord]:
+        """全ての地方予報区"""
+        return list(self._tables[LEVEL_CENTERS].values())
+
+    def forecast_file_code(self, office_code: str) -> str:
+        """
+        府県予報区の予報JSONを取得するときのコードを求める
+        （十勝地方は釧路・根室地方、奄美地方は鹿児島県のファイルにまとめて発表される）
+
+        Args:
+            office_code: 府県予報区コード
+
+        Returns:
+            str: 予報JSONのファイル名に使うコード
+        """
+        return self.forecast_file_aliases.get(office_code, office_code)
+
+    def forecast_area_codes(self, office_code: str) -> Set[str]:
+        """
+        府県予報区の予報JSONで、その予報区のものとして現れる区域のコード
+        （府県予報区自身と一次細分区域のコード）
+
+        Args:
+            office_code: 府県予報区コード
+
+        Returns:
+            Set[str]: 区域のコード
+        """
+        codes = {office_code}
+        codes.update(child.code for child in self.children(office_code, LEVEL_OFFICES))
+        return codes
+
+    def get_stats(self) -> Dict[str, int]:
+        """階層ごとの予報区の数"""
+        return {level: len(table) for level, table in self._tables.items()}
+
+
+def load_area_data(path: Optional[str] = None) -> Dict[str, Any]:
+    """予報区ファイルを読み込む"""
+    with open(path or DEFAULT_AREA_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# プロセス全体で共有する索引（ワーカーごとに1回だけ読み込む）
+_shared_area_index = None
+_shared_area_index_lock = threading.Lock()
+
+
+def get_area_index() -> AreaIndex:
+    """
+    プロセス共通の予報区の索引を取得する
+    WEATHER_AREA_FILE で同梱以外の予報区ファイルを指定できる
+
+    Returns:
+        AreaIndex: 共有の索引
+    """
+    global _shared_area_index
+    with _shared_area_index_lock:
+        if _shared_area_index is None:
+            _shared_area_index = AreaIndex(load_area_data(os.environ.get("WEATHER_AREA_FILE")))
+        return _shared_area_index
+
+
+def update_area_file(area_json: Dict[str, Any], path: Optional[str] = None) -> Dict[str, int]:
+    """
+    気象庁の area.json の内容で予報区ファイルを更新する
+    放送地域の設定と予報JSONのまとめ先は既存のファイルの内容を引き継ぐ
+
+    Args:
+        area_json: 気象庁の area.json の内容
+        path: 更新する予報区ファイル
+
+    Returns:
+        Dict[str, int]: 階層ごとの予報区の数
+
+    Raises:
+        ValueError: area.json に含まれない階層がある場合（予報区ファイルは更新しない）
+    """
+    path = path or DEFAULT_AREA_FILE
+    current = load_area_data(path)
+
+    data = {"source": JMA_AREA_URL}
+    for level in AREA_LEVELS:
+        data[level] = {
+            code: {key: entry[key] for key in ("name", "parent", "children") if key in entry}
+            for code, entry in area_json.get(level, {}).items()
+        }
+    # 一部の階層だけの予報区ファイルで同梱のファイルを上書きしない
+    missing_levels = [level for level in AREA_LEVELS if not data[level]]
+    if missing_levels:
+        raise ValueError(f"area.json has no entries for {', '.join(missing_levels)}")
+
+    data["forecast_file_aliases"] = current.get("forecast_file_aliases", {})
+    data["broadcast_regions"] = current.get("broadcast_regions", {})
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    return {level: len(data[level]) for level in AREA_LEVELS}
+
+
+# 予報区ファイルの更新用
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != "update":
+        sys.exit("Usage: python -m src.jma_areas update [area.json]")
+
+    if len(sys.argv) > 2:
+        # ダウンロード済みの area.json から更新
+        with open(sys.argv[2], encoding="utf-8") as f:
+            area_json = json.load(f)
+    else:
+        import requests
+
+        response = requests.get(JMA_AREA_URL, timeout=30)
+        response.raise_for_status()
+        area_json = response.json()
+
+    print(update_area_file(area_json))
@@ -0,0 +1,335 @@
+"""
+気象庁予報データの正規化モジュール
+府県予報区の予報JSONを1回だけ走査し、全ての細分区域・地点（timeSeries[].areas の全要素）を
+型の決まった中間形式（OfficeForecast）に整理します。
+天気概況・気温・週間予報・注意報の抽出は全てこの中間形式から行います。
+気温・降水確率はこの走査で数値に変換します（値がない場合はNone）。
+timeDefines の時刻は TimestampCache で同じ文字列を1回だけ解析し、表示用の日付・曜日も合わせて求めます。
+"""
+
+import datetime
+from typing import Dict, Any, List, Optional
+
+try:
+    from src.jma_areas import get_area_index, LEVEL_OFFICES
+    from src.forecast_model import parse_number, Number
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from jma_areas import get_area_index, LEVEL_OFFICES
+    from forecast_model import parse_number, Number
+
+
+# 曜日の表示（datetime.weekday() の順）
+_WEEKDAY_LABELS = "月火水木金土日"
+
+
+class TimeDefine:
+    """timeDefines の1時刻（解析済みの日時と表示用の日付・曜日）"""
+
+    __slots__ = ("text", "datetime", "label", "weekday")
+
+    def __init__(self, text: str):
+        self.text = text
+        try:
+            self.datetime: Optional[datetime.datetime] = datetime.datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            self.datetime = None
+        # 日付（%m/%d）と曜日（月〜日）。解析できない時刻はNone
+        self.label: Optional[str] = self.datetime.strftime("%m/%d") if self.datetime else None
+        self.weekday: Optional[str] = _WEEKDAY_LABELS[self.datetime.weekday()] if self.datetime else None
+
+
+class TimestampCache:
+    """
+    timeDefines の時刻の解析結果を共有するキャッシュ
+    1回のスナップショット（全国モードでは全府県予報区）で同じ時刻の文字列を1回だけ解析する
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, TimeDefine] = {}
+        self.parsed = 0
+        self.hits = 0
+
+    def get(self, text: str) -> TimeDefine:
+        """時刻の文字列に対応する解析済みの時刻を取得する"""
+        time_define = self._entries.get(text)
+        if time_define is None:
+            time_define = TimeDefine(text)
+            self._entries[text] = time_define
+            self.parsed += 1
+        else:
+            self.hits += 1
+        return time_define
+
+    def get_all(self, texts: List[str]) -> List[TimeDefine]:
+        """timeDefines の並びを解析済みの時刻の並びに変換する"""
+        return [self.get(text) for text in texts]
+
+    def get_stats(self) -> Dict[str, int]:
+        """解析した時刻の数と、解析済みの結果を使った回数"""
+        return {"parsed": self.parsed, "hits": self.hits}
+
+
+class AreaForecast:
+    """細分区域ごとの短期予報（今日・明日・明後日の天気・風・降水確率）"""
+
+    __slots__ = ("code", "name", "dates", "weather_codes", "weathers", "winds", "pop_times", "pops")
+
+    def __init__(self, code: str, name: Optional[str]):
+        self.code = code
+        self.name = name
+        self.dates: List[TimeDefine] = []
+        self.weather_codes: List[str] = []
+        self.weathers: List[str] = []
+        self.winds: List[str] = []
+        self.pop_times: List[TimeDefine] = []
+        self.pops: List[Optional[Number]] = []
+
+
+class CityTemperature:
+    """地点ごとの短期予報の気温"""
+
+    __slots__ = ("code", "name", "temp_times", "temps")
+
+    def __init__(self, code: str, name: Optional[str]):
+        self.code = code
+        self.name = name
+        self.temp_times: List[TimeDefine] = []
+        self.temps: List[Optional[Number]] = []
+
+
+class WeeklyAreaForecast:
+    """区域ごとの週間予報（天気・降水確率・信頼度）"""
+
+    __slots__ = ("code", "name", "dates", "weather_codes", "pops", "reliabilities")
+
+    def __init__(self, code: str, name: Optional[str]):
+        self.code = code
+        self.name = name
+        self.dates: List[TimeDefine] = []
+        self.weather_codes: List[str] = []
+        self.pops: List[Optional[Number]] = []
+        self.reliabilities: List[str] = []
+
+
+class WeeklyCityTemperature:
+    """地点ごとの週間予報の最低・最高気温"""
+
+    __slots__ = ("code", "name", "dates", "temps_min", "temps_max")
+
+    def __init__(self, code: str, name: Optional[str]):
+        self.code = code
+        self.name = name
+        self.dates: List[TimeDefine] = []
+        self.temps_min: List[Optional[Number]] = []
+        self.temps_max: List[Optional[Number]] = []
+
+
+def _plain(value):
+    # 時刻の並びはJSONで返すため元の文字列に戻す
+    if isinstance(value, list) and value and isinstance(value[0], TimeDefine):
+        return [time_define.text for time_define in value]
+    return value
+
+
+def _record_to_dict(record) -> Dict[str, Any]:
+    return {name: _plain(getattr(record, name)) for name in record.__slots__ if name != "code"}
+
+
+class OfficeForecast:
+    """府県予報区1つ分の正規化済みの予報"""
+
+    __slots__ = ("office_code", "office_name", "publishing_office", "report_datetime", "overview_text",
+                 "areas", "cities", "weekly_areas", "weekly_cities")
+
+    def __init__(self, office_code: str, office_name: Optional[str]):
+        self.office_code = office_code
+        self.office_name = office_name
+        self.publishing_office: Optional[str] = None
+        self.report_datetime: Optional[str] = None
+        self.overview_text: Optional[str] = None
+        self.areas: Dict[str, AreaForecast] = {}
+        self.cities: Dict[str, CityTemperature] = {}
+        self.weekly_areas: Dict[str, WeeklyAreaForecast] = {}
+        self.weekly_cities: Dict[str, WeeklyCityTemperature] = {}
+
+    @staticmethod
+    def _first(table):
+        return next(iter(table.values()), None)
+
+    @property
+    def primary_area(self) -> Optional[AreaForecast]:
+        """代表の細分区域（予報JSONで最初に現れる区域）"""
+        return self._first(self.areas)
+
+    @property
+    def primary_city(self) -> Optional[CityTemperature]:
+        """代表の地点（予報JSONで最初に現れる地点）"""
+        return self._first(self.cities)
+
+    @property
+    def primary_weekly_area(self) -> Optional[WeeklyAreaForecast]:
+        """週間予報の代表の区域"""
+        return self._first(self.weekly_areas)
+
+    @property
+    def primary_weekly_city(self) -> Optional[WeeklyCityTemperature]:
+        """週間予報の代表の地点"""
+        return self._first(self.weekly_cities)
+
+    def subset(self, office_code: str, area_codes) -> "OfficeForecast":
+        """
+        指定した区域と、それに対応する地点だけを含む予報を作る
+        別の府県予報区のファイルにまとめて発表される予報区（十勝地方・奄美地方）を、
+        ファイル全体ではなく自身の区域だけで返すために使う
+
+        Args:
+            office_code: 府県予報区コード
+            area_codes: 残す区域のコード
+
+        Returns:
+            OfficeForecast: 絞り込んだ予報（このインスタンスは変更しない）
+        """
+        subset = OfficeForecast(office_code, get_area_index().name(office_code, LEVEL_OFFICES))
+        subset.publishing_office = self.publishing_office
+        subset.report_datetime = self.report_datetime
+        subset.overview_text = self.overview_text
+        subset.areas = _pick_areas(self.areas, area_codes)
+        subset.cities = _pick_points(self.cities, self.areas, area_codes)
+        subset.weekly_areas = _pick_areas(self.weekly_areas, area_codes)
+        subset.weekly_cities = _pick_points(self.weekly_cities, self.weekly_areas, area_codes)
+        return subset
+
+    def area_count(self) -> int:
+        """含まれる区域・地点の数"""
+        return len(self.areas) + len(self.cities) + len(self.weekly_areas) + len(self.weekly_cities)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONで返すための辞書に変換する"""
+        return {
+            "office_code": self.office_code,
+            "office_name": self.office_name,
+            "publishing_office": self.publishing_office,
+            "report_datetime": self.report_datetime,
+            "overview_text": self.overview_text,
+            "areas": {code: _record_to_dict(record) for code, record in self.areas.items()},
+            "cities": {code: _record_to_dict(record) for code, record in self.cities.items()},
+            "weekly_areas": {code: _record_to_dict(record) for code, record in self.weekly_areas.items()},
+            "weekly_cities": {code: _record_to_dict(record) for code, record in self.weekly_cities.items()}
+        }
+
+
+def _pick_areas(areas: Dict[str, Any], area_codes) -> Dict[str, Any]:
+    """指定したコードの区域だけを選ぶ"""
+    return {code: record for code, record in areas.items() if code in area_codes}
+
+
+def _pick_points(points: Dict[str, Any], areas: Dict[str, Any], area_codes) -> Dict[str, Any]:
+    """
+    指定した区域に対応する地点だけを選ぶ
+    予報JSONでは地点は区域と同じ順に1つずつ並ぶため、数が一致する場合は同じ位置の地点を対応させる
+    （数が一致しない場合は対応が分からないため、どの地点も選ばない）
+    """
+    if len(points) != len(areas):
+        return {}
+    return {code: record for (code, record), area_code in zip(points.items(), areas) if area_code in area_codes}
+
+
+def _entry(table: Dict[str, Any], area: Dict[str, Any], record_class):
+    """区域コードに対応する項目を取得する（なければ生成する）"""
+    info = area.get("area", {})
+    code = info.get("code")
+    record = table.get(code)
+    if record is None:
+        record = record_class(code, info.get("name"))
+        table[code] = record
+    return record
+
+
+def _numbers(values: List[Any]) -> List[Optional[Number]]:
+    """気温・降水確率の文字列の並びを数値に変換する（空文字列はNone）"""
+    return [parse_number(value) for value in values]
+
+
+def normalize_office_forecast(office_code: str, forecast: Optional[List[Dict[str, Any]]],
+                              overview: Optional[Dict[str, Any]] = None,
+                              timestamps: Optional[TimestampCache] = None) -> OfficeForecast:
+    """
+    府県予報区の予報JSONを1回だけ走査して中間形式に整理する
+    timeSeriesの各区域は含まれる項目（weatherCodes・pops・temps など）で種類を判定する
+
+    Args:
+        office_code: 府県予報区コード（予報JSONのファイル名に使ったコード）
+        forecast: 予報JSON（forecast/{office_code}.json の内容）
+        overview: 天気概況JSON（overview_forecast/{office_code}.json の内容）
+        timestamps: 時刻の解析結果のキャッシュ（同じスナップショット内の予報区で共有する。省略時はこの予報区のみ）
+
+    Returns:
+        OfficeForecast: 正規化済みの予報
+    """
+    if timestamps is None:
+        timestamps = TimestampCache()
+    normalized = OfficeForecast(office_code, get_area_index().name(office_code, LEVEL_OFFICES))
+    if overview:
+        normalized.overview_text = overview.get("text", "")
+    if not forecast:
+        return normalized
+
+    # 短期予報（今日・明日・明後日）
+    short_term = forecast[0]
+    normalized.publishing_office = short_term.get("publishingOffice")
+    normalized.report_datetime = short_term.get("reportDatetime")
+
+    for series in short_term.get("timeSeries", []):
+        time_defines = timestamps.get_all(series.get("timeDefines", []))
+        for area in series.get("areas", []):
+            if "weatherCodes" in area:
+                record = _entry(normalized.areas, area, AreaForecast)
+                record.dates = time_defines
+                record.weather_codes = area["weatherCodes"]
+                record.weathers = area.get("weathers", [])
+                record.winds = area.get("winds", [])
+            elif "pops" in area:
+                record = _entry(normalized.areas, area, AreaForecast)
+                record.pop_times = time_defines
+                record.pops = _numbers(area["pops"])
+            elif "temps" in area:
+                record = _entry(normalized.cities, area, CityTemperature)
+                record.temp_times = time_defines
+                record.temps = _numbers(area["temps"])
+
+    # 週間予報
+    if len(forecast) > 1:
+        for series in forecast[1].get("timeSeries", []):
+            time_defines = timestamps.get_all(series.get("timeDefines", []))
+            for area in series.get("areas", []):
+                if "weatherCodes" in area:
+                    record = _entry(normalized.weekly_areas, area, WeeklyAreaForecast)
+                    record.dates = time_defines
+                    record.weather_codes = area["weatherCodes"]
+                    record.pops = _numbers(area.get("pops", []))
+                    record.reliabilities = area.get("reliabilities", [])
+                elif "tempsMin" in area or "tempsMax" in area:
+                    record = _entry(normalized.weekly_cities, area, WeeklyCityTemperature)
+                    record.dates = time_defines
+                    record.temps_min = _numbers(area.get("tempsMin", []))
+                    record.temps_max = _numbers(area.get("tempsMax", []))
+
+    return normalized
+
+
+def normalize_region_data(office_code: str, data: Optional[Dict[str, Any]],
+                          timestamps: Optional[TimestampCache] = None) -> Optional[OfficeForecast]:
+    """
+    地域ごとに取得した気象庁データ（{"forecast": ..., "overview": ...}）を正規化する
+
+    Args:
+        office_code: 府県予報区コード
+        data: 取得した予報・天気概況（既に正規化済みの場合はそのまま返す）
+        timestamps: 時刻の解析結果のキャッシュ
+
+    Returns:
+        Optional[OfficeForecast]: 正規化済みの予報（データがない場合はNone）
+    """
+    if data is None or isinstance(data, OfficeForecast):
+        return data
+    return normalize_office_forecast(office_code, data.get("forecast"), data.get("overview"), timestamps)
@@ -0,0 +1,103 @@
+"""
+応答時間の計測モジュール
+キーごとに直近の応答時間を保持し、パーセンタイルを計算します。
+"""
+
+import math
+import os
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+
+class LatencyTracker:
+    """キーごとに直近の応答時間を保持するクラス"""
+
+    def __init__(self, window: int = 100):
+        # キーごとに保持するサンプル数
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        """
+        応答時間を記録する
+
+        Args:
+            key: 計測対象のキー
+            seconds: 応答時間（秒）
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = deque(maxlen=self.window)
+                self._samples[key] = samples
+            samples.append(seconds)
+
+    def count(self, key: str) -> int:
+        """キーに記録されているサンプル数を取得する"""
+        with self._lock:
+            samples = self._samples.get(key)
+            return len(samples) if samples else 0
+
+    def percentile(self, key: str, p: float) -> Optional[float]:
+        """
+        応答時間のパーセンタイルを計算する（最近傍法）
+
+        Args:
+            key: 計測対象のキー
+            p: パーセンタイル（0〜100）
+
+        Returns:
+            Optional[float]: 応答時間（サンプルがない場合はNone）
+        """
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples:
+                return None
+            ordered = sorted(samples)
+
+        rank = math.ceil(p / 100 * len(ordered))
+        return ordered[min(len(ordered), max(1, rank)) - 1]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        キーごとの応答時間の統計を取得する
+
+        Returns:
+            Dict[str, Any]: サンプル数とp50・p90・p99
+        """
+        with self._lock:
+            keys = list(self._samples.keys())
+
+        stats = {}
+        for key in keys:
+            stats[key] = {
+                "count": self.count(key),
+                "p50": round(self.percentile(key, 50), 3),
+                "p90": round(self.percentile(key, 90), 3),
+                "p99": round(self.percentile(key, 99), 3)
+            }
+        return stats
+
+
+# プロセス全体で共有する計測器
+_shared_latency_tracker = None
+_shared_latency_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """
+    プロセス共通の応答時間計測器を取得する
+    WEATHER_LATENCY_WINDOW（キーごとに保持するサンプル数）で設定できる
+
+    Returns:
+        LatencyTracker: 共有の計測器
+    """
+    global _shared_latency_tracker
+    with _shared_latency_tracker_lock:
+        if _shared_latency_tracker is None:
+            _shared_latency_tracker = LatencyTracker(
+                window=int(os.environ.get("WEATHER_LATENCY_WINDOW", "100"))
+            )
+        return _shared_latency_tracker
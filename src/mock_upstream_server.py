@@ -0,0 +1,414 @@
+"""
+上流サービスのモックサーバーモジュール
+気象庁・ウェザーマップ・Yahoo!天気と同じURL構成で、記録済みまたは合成した応答を返すローカルHTTPサーバーです。
+エンドポイントごとに遅延・エラー率・本文の低速送信を設定でき、実サービスに負荷をかけずに負荷試験を行えます。
+
+使い方:
+    python -m src.mock_upstream_server --port 8081 --latency 0.2 --config mock_behaviors.json
+
+    WEATHER_JMA_BASE_URL=http://127.0.0.1:8081 \\
+    WEATHER_WEATHERMAP_BASE_URL=http://127.0.0.1:8081 \\
+    WEATHER_YAHOO_BASE_URL=http://127.0.0.1:8081 \\
+    WEATHER_RATE_LIMIT_RPS=1000 WEATHER_RATE_LIMIT_BURST=1000 \\
+    WEATHER_JMA_RATE_LIMIT_RPS=1000 WEATHER_JMA_RATE_LIMIT_BURST=1000 \\
+    gunicorn -w 4 app:app
+
+※ 全情報源が同じホストになるため、レート制限はホスト単位で共有される点に注意。
+  このホストは WEATHER_JMA_BASE_URL と一致するので、ウェザーマップ・Yahoo!天気も含めて
+  気象庁向けの設定（WEATHER_JMA_RATE_LIMIT_RPS・WEATHER_JMA_RATE_LIMIT_BURST）で制限される。
+  本番と同じ制限で計測する場合はどちらも設定しない
+"""
+
+import argparse
+import datetime
+import gzip
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import unquote
+
+try:
+    from src.replay_transport import fixture_path, DEFAULT_FIXTURE_DIR
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from replay_transport import fixture_path, DEFAULT_FIXTURE_DIR
+
+# 日本標準時
+JST = datetime.timezone(datetime.timedelta(hours=9))
+
+# エンドポイント名・パス・記録時のホスト名
+ROUTES = [
+    ("jma_forecast", re.compile(r"^/bosai/forecast/data/forecast/(\d+)\.json$"), "www.jma.go.jp"),
+    ("jma_overview", re.compile(r"^/bosai/forecast/data/overview_forecast/(\d+)\.json$"), "www.jma.go.jp"),
+    ("weathermap", re.compile(r"^/s/0/([^/]+)/$"), "weathermap.jp"),
+    ("yahoo", re.compile(r"^/weather/jp/(\d+)/(\d+)/(\d+)\.html$"), "weather.yahoo.co.jp"),
+]
+
+
+class EndpointBehavior:
+    """1エンドポイント分の応答の振る舞い"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, slow_body: float = 0.0, chunk_size: int = 1024):
+        """
+        Args:
+            latency: 応答ヘッダーを返すまでの遅延（秒）
+            jitter: 遅延に加える揺らぎの最大値（秒）
+            error_rate: エラー応答を返す割合（0〜1）
+            error_status: エラー時のステータスコード
+            slow_body: 本文をchunk_sizeバイト送るごとに待つ秒数
+            chunk_size: 本文を分割して送る単位（バイト）
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.slow_body = slow_body
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any], base: Optional["EndpointBehavior"] = None) -> "EndpointBehavior":
+        """設定の辞書から振る舞いを生成する（指定のない項目はbaseの値を使う）"""
+        values = dict(vars(base)) if base is not None else {}
+        values.update(config)
+        return cls(**values)
+
+
+def _dates(days: int):
+    """今日から指定日数分の日付（JST 0時）をISO形式で返す"""
+    today = datetime.datetime.now(JST).replace(hour=0, minute=0, second=0, microsecond=0)
+    return [(today + datetime.timedelta(days=i)).isoformat() for i in range(days)]
+
+
+def synthetic_jma_forecast(area_code: str, sub_areas: int = 3) -> bytes:
+    """気象庁の予報JSONと同じ構造の合成データを生成する（区域・地点をsub_areas個ずつ含む）"""
+    areas = [{"name": f"模擬地域{area_code}", "code": area_code}]
+    areas += [{"name": f"模擬地域{area_code}-{i}", "code": f"{area_code[:4]}{i:02d}"} for i in range(1, sub_areas)]
+    days3 = _dates(3)
+    days7 = _dates(7)
+    report = datetime.datetime.now(JST).replace(minute=0, second=0, microsecond=0).isoformat()
+
+    forecast = [
+        {
+            "publishingOffice": "模擬気象台",
+            "reportDatetime": report,
+            "timeSeries": [
+                {
+                    "timeDefines": days3,
+                    "areas": [{
+                        "area": area,
+                        "weatherCodes": ["100", "201", "300"],
+                        "weathers": ["晴れ", "くもり　時々　晴れ", "雨"],
+                        "winds": ["北の風", "南の風", "南の風　やや強く"]
+                    } for area in areas]
+                },
+                {
+                    "timeDefines": days3[:2],
+                    "areas": [{"area": area, "pops": ["0", "10", "20", "50"]} for area in areas]
+                },
+                {
+                    "timeDefines": days3[:2] + days3[1:],
+                    "areas": [{"area": area, "temps": ["25", "25", "16", "26"]} for area in areas]
+                }
+            ]
+        },
+        {
+            "publishingOffice": "模擬気象台",
+            "reportDatetime": report,
+            "timeSeries": [
+                {
+                    "timeDefines": days7,
+                    "areas": [{
+                        "area": area,
+                        "weatherCodes": ["100", "201", "300", "101", "200", "100", "202"],
+                        "pops": ["", "20", "70", "10", "30", "0", "40"],
+                        "reliabilities": ["", "", "A", "B", "B", "C", "C"]
+                    } for area in areas]
+                },
+                {
+                    "timeDefines": days7,
+                    "areas": [{
+                        "area": area,
+                        "tempsMin": ["", "16", "17", "15", "14", "15", "16"],
+                        "tempsMax": ["", "26", "22", "25", "24", "26", "23"]
+                    } for area in areas]
+                }
+            ]
+        }
+    ]
+    return json.dumps(forecast, ensure_ascii=False).encode("utf-8")
+
+
+def synthetic_jma_overview(area_code: str) -> bytes:
+    """気象庁の天気概況JSONと同じ構造の合成データを生成する"""
+    overview = {
+        "publishingOffice": "模擬気象台",
+        "reportDatetime": datetime.datetime.now(JST).replace(minute=0, second=0, microsecond=0).isoformat(),
+        "targetArea": f"模擬地域{area_code}",
+        "headlineText": "",
+        "text": "高気圧に覆われて晴れています。明日は気圧の谷の影響で雲が広がり、雨の降る所があるでしょう。"
+    }
+    return json.dumps(overview, ensure_ascii=False).encode("utf-8")
+
+
+def synthetic_weathermap_html(area_name: str) -> bytes:
+    """ウェザーマップの地点ページと同じ要素構成の合成HTMLを生成する"""
+    days = []
+    for i, date in enumerate(_dates(8)[1:]):
+        month_day = date[5:10].replace("-", "月") + "日"
+        days.append(
+            f'<div class="day"><span class="date">{month_day}</span>'
+            f'<span class="weather">{"晴れ" if i % 2 == 0 else "くもり"}</span>'
+            f'<span class="temp">{24 + i % 3}℃ / {15 + i % 2}℃</span></div>'
+        )
+    html = (
+        f'<html><head><meta charset="utf-8"><title>{area_name}の天気</title></head><body>'
+        f'<div class="today-weather">晴れ</div>'
+        f'<div class="tomorrow-weather">くもり時々晴れ</div>'
+        f'<div class="temperature">25℃ / 15℃</div>'
+        f'<div class="temperature">26℃ / 16℃</div>'
+        f'<div class="weekly-forecast">{"".join(days)}</div>'
+        f'</body></html>'
+    )
+    return html.encode("utf-8")
+
+
+def synthetic_yahoo_html() -> bytes:
+    """Yahoo!天気の地点ページと同じ要素構成の合成HTMLを生成する"""
+    rows = []
+    for i, date in enumerate(_dates(8)[1:]):
+        month_day = date[5:10].replace("-", "月") + "日"
+        rows.append(
+            f'<tr><td>{month_day}</td>'
+            f'<td><img alt="{"晴れ" if i % 2 == 0 else "曇り"}"></td>'
+            f'<td>{10 * (i % 4)}</td>'
+            f'<td><ul><li class="high"><em>{24 + i % 3}</em>℃</li>'
+            f'<li class="low"><em>{15 + i % 2}</em>℃</li></ul></td>'
+            f'<td></td></tr>'
+        )
+    html = (
+        '<html><head><meta charset="utf-8"><title>天気予報</title></head><body>'
+        '<div class="forecastCity"><table>'
+        '<tr><td class="pict"><img alt="晴れ"></td><td class="pict"><img alt="曇時々晴"></td></tr>'
+        '<tr><td class="temp"><ul><li class="high"><em>25</em>℃</li><li class="low"><em>15</em>℃</li></ul></td>'
+        '<td class="temp"><ul><li class="high"><em>26</em>℃</li><li class="low"><em>16</em>℃</li></ul></td></tr>'
+        '</table></div>'
+        '<div class="forecastTable"><table>'
+        '<tr><th>日付</th><th>天気</th><th>降水確率</th><th>気温</th><th></th></tr>'
+        f'{"".join(rows)}'
+        '</table></div>'
+        '</body></html>'
+    )
+    return html.encode("utf-8")
+
+
+class MockUpstreamServer(ThreadingHTTPServer):
+    """上流サービスのモックサーバー"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], behaviors: Dict[str, EndpointBehavior],
+                 fixture_dir: Optional[str] = None, seed: int = 0, compress: bool = True):
+        """
+        Args:
+            address: 待ち受けるホストとポート
+            behaviors: エンドポイント名をキーとした応答の振る舞い（"default"は全体の既定値）
+            fixture_dir: 記録済みフィクスチャのディレクトリ（ない応答は合成データを返す）
+            seed: エラー発生・遅延の揺らぎを再現するための乱数シード
+            compress: クライアントが対応していればgzipで圧縮して返すかどうか
+        """
+        super().__init__(address, MockUpstreamHandler)
+        self.behaviors = behaviors
+        self.fixture_dir = fixture_dir
+        self.compress = compress
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {name: {"requests": 0, "errors": 0, "fixtures": 0, "synthetic": 0}
+                      for name, _, _ in ROUTES}
+
+    def behavior(self, endpoint: str) -> EndpointBehavior:
+        """エンドポイントの振る舞いを取得する"""
+        return self.behaviors.get(endpoint) or self.behaviors.get("default") or EndpointBehavior()
+
+    def random(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def count(self, endpoint: str, key: str):
+        with self._lock:
+            self.stats[endpoint][key] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: dict(values) for name, values in self.stats.items()}
+
+
+class MockUpstreamHandler(BaseHTTPRequestHandler):
+    """モックサーバーのリクエストハンドラー"""
+
+    # キープアライブで接続を再利用できるようにする
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # 負荷試験中の大量のアクセスログは出さない
+        pass
+
+    def _route(self):
+        path = self.path.split("?", 1)[0]
+        for name, pattern, host in ROUTES:
+            match = pattern.match(path)
+            if match:
+                return name, match, host
+        return None, None, None
+
+    def _load_fixture(self, host: str):
+        """記録済みのフィクスチャを読み込む（存在しない場合はNone）"""
+        if not self.server.fixture_dir:
+            return None, None
+        path = fixture_path(self.server.fixture_dir, f"https://{host}{self.path}")
+        try:
+            with open(path + ".meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None, None
+        return meta, body
+
+    def _synthetic(self, endpoint: str, match) -> Tuple[bytes, str]:
+        """合成データと Content-Type を返す"""
+        if endpoint == "jma_forecast":
+            return synthetic_jma_forecast(match.group(1)), "application/json; charset=utf-8"
+        if endpoint == "jma_overview":
+            return synthetic_jma_overview(match.group(1)), "application/json; charset=utf-8"
+        if endpoint == "weathermap":
+            return synthetic_weathermap_html(unquote(match.group(1))), "text/html; charset=utf-8"
+        return synthetic_yahoo_html(), "text/html; charset=utf-8"
+
+    def _send(self, status: int, body: bytes, content_type: str,
+              behavior: Optional[EndpointBehavior] = None, headers: Optional[Dict[str, str]] = None):
+        # 実サービスと同様に、対応しているクライアントにはgzipで返す
+        if self.server.compress and body and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            headers = dict(headers or {}, **{"Content-Encoding": "gzip"})
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+        if behavior is None or behavior.slow_body <= 0:
+            self.wfile.write(body)
+            return
+
+        # 本文を少しずつ送る（低速な上流の再現）
+        for start in range(0, len(body), behavior.chunk_size):
+            self.wfile.write(body[start:start + behavior.chunk_size])
+            self.wfile.flush()
+            time.sleep(behavior.slow_body)
+
+    def do_GET(self):
+        if self.path == "/_mock/stats":
+            body = json.dumps(self.server.get_stats(), ensure_ascii=False).encode("utf-8")
+            self._send(200, body, "application/json; charset=utf-8")
+            return
+
+        endpoint, match, host = self._route()
+        if endpoint is None:
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        behavior = self.server.behavior(endpoint)
+        self.server.count(endpoint, "requests")
+
+        delay = behavior.latency + behavior.jitter * self.server.random()
+        if delay > 0:
+            time.sleep(delay)
+
+        if self.server.random() < behavior.error_rate:
+            self.server.count(endpoint, "errors")
+            self._send(behavior.error_status, b"Injected error", "text/plain")
+            return
+
+        meta, body = self._load_fixture(host)
+        if meta is not None:
+            self.server.count(endpoint, "fixtures")
+            recorded = {k.lower(): v for k, v in meta.get("headers", {}).items()}
+            content_type = recorded.get("content-type", "application/octet-stream")
+            headers = {key: recorded[key.lower()] for key in ("ETag", "Last-Modified") if key.lower() in recorded}
+
+            # 条件付きGETは記録済みのETagと比較して304を返す
+            if "ETag" in headers and self.headers.get("If-None-Match") == headers["ETag"]:
+                self._send(304, b"", content_type, headers=headers)
+                return
+            self._send(meta.get("status", 200), body, content_type, behavior, headers)
+            return
+
+        self.server.count(endpoint, "synthetic")
+        body, content_type = self._synthetic(endpoint, match)
+        self._send(200, body, content_type, behavior)
+
+
+def load_behaviors(config_path: Optional[str], default: EndpointBehavior) -> Dict[str, EndpointBehavior]:
+    """
+    設定ファイルからエンドポイントごとの振る舞いを読み込む
+
+    設定ファイルの例:
+        {"jma_forecast": {"latency": 0.3, "jitter": 0.2},
+         "yahoo": {"error_rate": 0.2, "error_status": 500},
+         "weathermap": {"slow_body": 0.05}}
+
+    Args:
+        config_path: 設定ファイル（JSON）のパス
+        default: 設定のない項目に使う既定の振る舞い
+
+    Returns:
+        Dict[str, EndpointBehavior]: エンドポイント名をキーとした振る舞い
+    """
+    behaviors = {"default": default}
+    if config_path:
+        with open(config_path, encoding="utf-8") as f:
+            config = json.load(f)
+        for name, values in config.items():
+            behaviors[name] = EndpointBehavior.from_dict(values, base=default)
+    return behaviors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="気象庁・ウェザーマップ・Yahoo!天気のモックサーバー")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--fixture-dir", default=os.environ.get("WEATHER_FIXTURE_DIR", DEFAULT_FIXTURE_DIR),
+                        help="記録済みフィクスチャのディレクトリ（ない応答は合成データを返す）")
+    parser.add_argument("--config", help="エンドポイントごとの振る舞いを記述したJSONファイル")
+    parser.add_argument("--latency", type=float, default=0.0, help="既定の遅延（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="既定の遅延の揺らぎ（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="既定のエラー率（0〜1）")
+    parser.add_argument("--error-status", type=int, default=503, help="エラー時のステータスコード")
+    parser.add_argument("--slow-body", type=float, default=0.0, help="本文1チャンクごとの待ち時間（秒）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-gzip", action="store_true", help="応答をgzipで圧縮しない")
+    args = parser.parse_args()
+
+    default_behavior = EndpointBehavior(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        slow_body=args.slow_body
+    )
+    server = MockUpstreamServer((args.host, args.port), load_behaviors(args.config, default_behavior),
+                                fixture_dir=args.fixture_dir, seed=args.seed, compress=not args.no_gzip)
+    print(f"Mock upstream server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
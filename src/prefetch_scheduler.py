@@ -0,0 +1,181 @@
+"""
+天気データ先読みスケジューラーモジュール
+気象庁の定時発表（5時・11時・17時 JST）の直後と、その間の一定間隔で
+天気データをバックグラウンドで取得し、最新のスナップショットを保持します。
+取得関数がスナップショットキャッシュの更新（SnapshotCache.refresh など）の場合は、
+キャッシュ側が保持するためスケジューラーではスナップショットを持たず、取得時刻と統計のみを記録します。
+"""
+
+import datetime
+import threading
+import time
+from typing import Callable, Dict, Any, Optional, Iterable
+
+try:
+    from src.deadline import Deadline
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from deadline import Deadline
+
+# 日本標準時
+JST = datetime.timezone(datetime.timedelta(hours=9))
+
+
+class PrefetchScheduler:
+    """天気データを定期的に先読みするスケジューラー"""
+
+    def __init__(self, loader: Callable[[], Dict[str, Any]],
+                 issue_hours: Iterable[int] = (5, 11, 17),
+                 issue_delay_minutes: float = 10,
+                 interval_minutes: float = 60,
+                 keep_snapshot: bool = True,
+                 deadline_seconds: Optional[float] = None):
+        """
+        Args:
+            loader: 天気データを取得する関数（get_complete_weather_dataなど）
+            issue_hours: 気象庁の定時発表時刻（JSTの時）
+            issue_delay_minutes: 発表時刻から取得までの待ち時間（分）
+            interval_minutes: 発表時刻の間に取得する間隔（分）
+            keep_snapshot: Falseの場合は取得したスナップショットを保持しない
+                           （取得関数の側でキャッシュする場合に、同じデータを二重に持たないようにする）
+            deadline_seconds: 1回の取得の処理期限（秒）。指定した場合は取得関数に deadline として渡す
+        """
+        self.loader = loader
+        self.keep_snapshot = keep_snapshot
+        self.deadline_seconds = deadline_seconds
+        self.issue_hours = sorted(issue_hours)
+        self.issue_delay = datetime.timedelta(minutes=issue_delay_minutes)
+        self.interval = datetime.timedelta(minutes=interval_minutes)
+
+        self._snapshot = None
+        self._snapshot_at = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        # 実行状況の統計
+        self.refresh_count = 0
+        self.failure_count = 0
+        self.last_duration = None
+        self.last_error = None
+        self.next_run_at = None
+
+    def next_run_time(self, now: datetime.datetime) -> datetime.datetime:
+        """
+        次回の取得時刻を求める
+        定時発表の直後と一定間隔のうち、早いほうを採用する
+
+        Args:
+            now: 現在時刻（タイムゾーン付き）
+
+        Returns:
+            datetime.datetime: 次回の取得時刻（JST）
+        """
+        now = now.astimezone(JST)
+        candidates = [now + self.interval]
+
+        for day_offset in (0, 1):
+            day = (now + datetime.timedelta(days=day_offset)).date()
+            for hour in self.issue_hours:
+                issue_time = datetime.datetime(day.year, day.month, day.day, hour, tzinfo=JST) + self.issue_delay
+                if issue_time > now:
+                    candidates.append(issue_time)
+
+        return min(candidates)
+
+    def refresh(self, force: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        天気データを取得してスナップショットを更新する
+        取得に失敗した場合は以前のスナップショットを維持する
+
+        Args:
+            force: Falseの場合、既に取得済みであれば取得せずに保持中のスナップショットを返す
+
+        Returns:
+            Optional[Dict[str, Any]]: 最新のスナップショット
+            （保持しない設定の場合は今回取得したスナップショット。取得しなかった場合はNone）
+        """
+        # 同時に複数の取得が走らないようにする
+        with self._refresh_lock:
+            with self._lock:
+                loaded = self._snapshot_at is not None
+            if not force and loaded:
+                return self.get_snapshot()
+
+            snapshot = None
+            start = time.monotonic()
+            try:
+                if self.deadline_seconds is not None:
+                    snapshot = self.loader(deadline=Deadline(self.deadline_seconds))
+                else:
+                    snapshot = self.loader()
+                with self._lock:
+                    if self.keep_snapshot:
+                        self._snapshot = snapshot
+                    self._snapshot_at = datetime.datetime.now(JST)
+                self.refresh_count += 1
+                self.last_error = None
+            except Exception as e:
+                print(f"Error prefetching weather data: {e}")
+                self.failure_count += 1
+                self.last_error = str(e)
+            finally:
+                self.last_duration = time.monotonic() - start
+
+        return self.get_snapshot() if self.keep_snapshot else snapshot
+
+    def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        保持している最新のスナップショットを取得する（外部への通信は行わない）
+
+        Returns:
+            Optional[Dict[str, Any]]: スナップショット（未取得・保持しない設定の場合はNone）
+        """
+        with self._lock:
+            return self._snapshot
+
+    def _run(self):
+        """バックグラウンドスレッドの処理"""
+        # 起動直後に一度取得してスナップショットを温めておく
+        self.refresh()
+
+        while not self._stop_event.is_set():
+            now = datetime.datetime.now(JST)
+            self.next_run_at = self.next_run_time(now)
+            wait_seconds = (self.next_run_at - now).total_seconds()
+            if self._stop_event.wait(max(0.0, wait_seconds)):
+                break
+            self.refresh()
+
+    def start(self):
+        """バックグラウンドでの先読みを開始する"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="weather-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """バックグラウンドでの先読みを停止する"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        先読みの実行状況を取得する
+
+        Returns:
+            Dict[str, Any]: 実行状況の統計
+        """
+        with self._lock:
+            snapshot_at = self._snapshot_at
+        return {
+            "running": self._thread is not None and self._thread.is_alive(),
+            "snapshot_at": snapshot_at.isoformat() if snapshot_at else None,
+            "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
+            "refresh_count": self.refresh_count,
+            "failure_count": self.failure_count,
+            "last_duration": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "last_error": self.last_error
+        }
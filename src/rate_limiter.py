@@ -0,0 +1,193 @@
+"""
+ホスト単位のレート制限モジュール
+トークンバケット方式で外部サイトへのリクエスト間隔を制御します。
+固定のsleepの代わりに、ホストごとに許容量（バースト）を超えた分だけ待機します。
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    from src.deadline import Deadline, DeadlineExceeded
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from deadline import Deadline, DeadlineExceeded
+
+
+class TokenBucket:
+    """1ホスト分のトークンバケット"""
+
+    def __init__(self, rate: float, burst: int):
+        # 1秒あたりに補充されるトークン数と、バケットの最大容量
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+        # 待機時間の統計
+        self.request_count = 0
+        self.throttled_count = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+        self.deadline_rejected = 0
+
+    def _refill(self, now: float):
+        """経過時間に応じてトークンを補充する"""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def reserve(self) -> float:
+        """
+        トークンを1つ予約し、予約が有効になるまでの待機時間を返す
+        呼び出し側でロックを保持していること
+
+        Returns:
+            float: 待機が必要な秒数
+        """
+        self._refill(time.monotonic())
+        self.tokens -= 1.0
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        self.request_count += 1
+        if wait > 0:
+            self.throttled_count += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.last_wait = wait
+        return wait
+
+    def current_wait(self) -> float:
+        """次のリクエストが待たされる秒数（呼び出し側でロックを保持していること）"""
+        self._refill(time.monotonic())
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class HostRateLimiter:
+    """ホストごとにトークンバケットを管理するレートリミッター"""
+
+    def __init__(self, rate: float = 2.0, burst: int = 4,
+                 host_limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        """
+        Args:
+            rate: 1秒あたりに許可するリクエスト数（ホストごと）
+            burst: 連続で許可するリクエスト数（ホストごと）
+            host_limits: ホスト名をキーとした個別の (rate, burst)（指定のないホストは共通の設定）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.host_limits = dict(host_limits or {})
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.host_limits.get(host, (self.rate, self.burst))
+            bucket = TokenBucket(rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str, deadline: Optional[Deadline] = None) -> float:
+        """
+        URLのホストに対するリクエスト許可を取得する（必要な場合のみ待機する）
+
+        Args:
+            url: リクエスト先のURL
+            deadline: 呼び出し元の処理期限（待機が期限を超える場合はトークンを予約せずに例外を送出する）
+
+        Returns:
+            float: 実際に待機した秒数
+
+        Raises:
+            DeadlineExceeded: 待機すると期限を過ぎる場合
+        """
+        host = urlsplit(url).hostname or ""
+        with self._lock:
+            bucket = self._get_bucket(host)
+            if deadline is not None and bucket.current_wait() > deadline.remaining():
+                # 期限内に送信できないリクエストのためにトークンを消費しない
+                bucket.deadline_rejected += 1
+                raise DeadlineExceeded(f"Rate limit wait for {host} exceeds the deadline")
+            wait = bucket.reserve()
+
+        # ロックの外で待機し、他ホストへのリクエストを妨げない
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        ホストごとの待機時間の統計を取得する
+
+        Returns:
+            Dict[str, Any]: ホスト名をキーとした統計情報
+        """
+        stats = {}
+        with self._lock:
+            for host, bucket in self._buckets.items():
+                stats[host] = {
+                    "rate": bucket.rate,
+                    "burst": bucket.burst,
+                    "requests": bucket.request_count,
+                    "throttled": bucket.throttled_count,
+                    "deadline_rejected": bucket.deadline_rejected,
+                    "current_wait": round(bucket.current_wait(), 3),
+                    "last_wait": round(bucket.last_wait, 3),
+                    "max_wait": round(bucket.max_wait, 3),
+                    "total_wait": round(bucket.total_wait, 3),
+                    "avg_wait": round(bucket.total_wait / bucket.request_count, 3) if bucket.request_count else 0.0
+                }
+        return stats
+
+
+# プロセス全体で共有するレートリミッター
+_shared_rate_limiter = None
+_shared_rate_limiter_lock = threading.Lock()
+
+
+def create_rate_limiter() -> HostRateLimiter:
+    """
+    環境変数の設定でレートリミッターを作成する
+    WEATHER_RATE_LIMIT_RPS（1秒あたりのリクエスト数）と
+    WEATHER_RATE_LIMIT_BURST（連続で許可するリクエスト数）はスクレイピング先などの共通の設定。
+    気象庁（WEATHER_JMA_BASE_URL のホスト）は静的なJSONの配信で、原稿1回の生成で
+    予報・概況の20件をまとめて取得するため、WEATHER_JMA_RATE_LIMIT_RPS・
+    WEATHER_JMA_RATE_LIMIT_BURST で別に設定する（既定は10件/秒、連続24件）。
+    全国モード（予報56件、概況も取得する場合は114件）もこの設定で約3秒・約9秒となり、
+    処理期限（既定25秒）に収まる。下げる場合は 24 + 10 × (期限 - 応答時間) 件を目安にする
+
+    Returns:
+        HostRateLimiter: レートリミッター
+    """
+    jma_host = urlsplit(os.environ.get("WEATHER_JMA_BASE_URL", "https://www.jma.go.jp")).hostname or ""
+    return HostRateLimiter(
+        rate=float(os.environ.get("WEATHER_RATE_LIMIT_RPS", "2.0")),
+        burst=int(os.environ.get("WEATHER_RATE_LIMIT_BURST", "4")),
+        host_limits={
+            jma_host: (
+                float(os.environ.get("WEATHER_JMA_RATE_LIMIT_RPS", "10.0")),
+                int(os.environ.get("WEATHER_JMA_RATE_LIMIT_BURST", "24"))
+            )
+        }
+    )
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """
+    プロセス共通のレートリミッターを取得する（設定は create_rate_limiter を参照）
+
+    Returns:
+        HostRateLimiter: 共有のレートリミッター
+    """
+    global _shared_rate_limiter
+    with _shared_rate_limiter_lock:
+        if _shared_rate_limiter is None:
+            _shared_rate_limiter = create_rate_limiter()
+        return _shared_rate_limiter
@@ -0,0 +1,163 @@
+"""
+取得結果のアーカイブモジュール
+各情報源から取得した生のデータ（気象庁JSON・ウェザーマップ・Yahoo!天気の抽出結果）を
+スナップショットIDごとに1ファイルとしてディスクに保存します。
+スナップショット自体には生のデータを持たせず、調査が必要なときにIDから読み出します。
+"""
+
+import datetime
+import json
+import os
+import re
+import secrets
+import threading
+from typing import Dict, Any, List, Optional
+
+# スナップショットIDの形式（取得日時-乱数）。読み出し時のパスの検証にも使う
+_SNAPSHOT_ID_RE = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{6}$")
+
+
+def new_snapshot_id(now: Optional[datetime.datetime] = None) -> str:
+    """
+    スナップショットIDを発行する（辞書順が取得順になる）
+
+    Args:
+        now: 取得日時（省略時は現在時刻）
+
+    Returns:
+        str: スナップショットID
+    """
+    now = now or datetime.datetime.now()
+    return f"{now.strftime('%Y%m%dT%H%M%S')}-{secrets.token_hex(3)}"
+
+
+class RawArchive:
+    """スナップショットIDごとに取得結果を保存するディスク上のアーカイブ"""
+
+    def __init__(self, directory: str, max_files: int = 48):
+        """
+        Args:
+            directory: 保存先のディレクトリ
+            max_files: 保持するファイル数の上限（超えた分は古い順に削除する）
+        """
+        self.directory = directory
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+        # アーカイブの統計
+        self.saves = 0
+        self.save_failures = 0
+        self.pruned = 0
+
+    def _path(self, snapshot_id: str) -> Optional[str]:
+        if not _SNAPSHOT_ID_RE.match(snapshot_id):
+            return None
+        return os.path.join(self.directory, f"{snapshot_id}.json")
+
+    def _snapshot_ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith(".json") and _SNAPSHOT_ID_RE.match(name[:-5]))
+
+    def save(self, snapshot_id: str, raw_data: Dict[str, Any]) -> bool:
+        """
+        取得結果を保存する（失敗しても例外は出さない）
+
+        Args:
+            snapshot_id: スナップショットID
+            raw_data: 情報源ごとの取得結果
+
+        Returns:
+            bool: 保存できたかどうか
+        """
+        path = self._path(snapshot_id)
+        if path is None:
+            return False
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(raw_data, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error archiving raw data for snapshot {snapshot_id}: {e}")
+            with self._lock:
+                self.save_failures += 1
+            return False
+
+        with self._lock:
+            self.saves += 1
+            # 上限を超えた古いファイルを削除
+            snapshot_ids = self._snapshot_ids()
+            for old_id in snapshot_ids[:max(0, len(snapshot_ids) - self.max_files)]:
+                try:
+                    os.remove(self._path(old_id))
+                    self.pruned += 1
+                except OSError:
+                    pass
+        return True
+
+    def load(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """
+        保存済みの取得結果を読み出す
+
+        Args:
+            snapshot_id: スナップショットID
+
+        Returns:
+            Optional[Dict[str, Any]]: 取得結果（見つからない場合はNone）
+        """
+        path = self._path(snapshot_id)
+        if path is None:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        アーカイブの統計情報を取得する
+
+        Returns:
+            Dict[str, Any]: 保存先・保持中のファイル数・保存回数など
+        """
+        with self._lock:
+            return {
+                "directory": self.directory,
+                "files": len(self._snapshot_ids()),
+                "max_files": self.max_files,
+                "saves": self.saves,
+                "save_failures": self.save_failures,
+                "pruned": self.pruned
+            }
+
+
+# プロセス全体で共有するアーカイブ（WEATHER_RAW_ARCHIVE_DIR を指定した場合のみ）
+_shared_raw_archive = None
+_shared_raw_archive_lock = threading.Lock()
+
+
+def get_raw_archive() -> Optional[RawArchive]:
+    """
+    プロセス共通の取得結果アーカイブを取得する
+    WEATHER_RAW_ARCHIVE_DIR（保存先。未指定の場合はアーカイブしない）、
+    WEATHER_RAW_ARCHIVE_MAX_FILES（保持するファイル数の上限）で設定できる
+
+    Returns:
+        Optional[RawArchive]: 共有のアーカイブ（無効な場合はNone）
+    """
+    global _shared_raw_archive
+    directory = os.environ.get("WEATHER_RAW_ARCHIVE_DIR")
+    if not directory:
+        return None
+    with _shared_raw_archive_lock:
+        if _shared_raw_archive is None:
+            _shared_raw_archive = RawArchive(
+                directory,
+                max_files=int(os.environ.get("WEATHER_RAW_ARCHIVE_MAX_FILES", "48"))
+            )
+        return _shared_raw_archive
@@ -0,0 +1,282 @@
+"""
+記録・再生用トランスポートモジュール
+気象庁JSON・ウェザーマップHTML・Yahoo!天気HTMLのレスポンスをフィクスチャとして保存し（記録モード）、
+ネットワークに接続せずに保存済みのレスポンスを返します（再生モード）。
+再生時は遅延や失敗を人工的に加え、実環境に近いタイミングを再現できます。
+
+使い方:
+    WEATHER_TRANSPORT_MODE=record python -m src.replay_transport record
+    WEATHER_TRANSPORT_MODE=replay python -m src.replay_transport replay
+"""
+
+import io
+import json
+import os
+import random
+import threading
+import time
+import datetime
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit, unquote, quote
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# トランスポートのモード
+TRANSPORT_LIVE = "live"
+TRANSPORT_RECORD = "record"
+TRANSPORT_REPLAY = "replay"
+
+# 保存しないレスポンスヘッダー（本文は展開済みの状態で保存するため）
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+# 既定のフィクスチャ保存先
+DEFAULT_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+
+def fixture_path(fixture_dir: str, url: str) -> str:
+    """
+    URLに対応するフィクスチャのパス（拡張子なし）を求める
+    ホスト名とパスをそのままディレクトリ構成にし、人が見て分かる名前にする
+
+    Args:
+        fixture_dir: フィクスチャの保存先ディレクトリ
+        url: リクエストURL
+
+    Returns:
+        str: フィクスチャのパス（.body / .meta.json を付けて使う）
+    """
+    parts = urlsplit(url)
+    host = parts.hostname or "unknown"
+    if parts.port:
+        host = f"{host}_{parts.port}"
+
+    path = unquote(parts.path).lstrip("/")
+    if not path or path.endswith("/"):
+        path += "index"
+    if parts.query:
+        path += "__" + quote(parts.query, safe="")
+
+    segments = [segment for segment in path.split("/") if segment not in ("", ".", "..")]
+    return os.path.join(fixture_dir, host, *segments)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """実際に通信し、レスポンスをフィクスチャとして保存するアダプター"""
+
+    def __init__(self, fixture_dir: str, **kwargs):
+        super().__init__(**kwargs)
+        self.fixture_dir = fixture_dir
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+
+        # 304は本文がないため保存しない（以前の記録を残す）
+        if response.status_code != 304:
+            try:
+                self._save(request.url, response)
+            except OSError as e:
+                print(f"Error recording fixture for {request.url}: {e}")
+        return response
+
+    def _save(self, url: str, response: requests.Response):
+        """レスポンスの本文とメタデータを保存する"""
+        path = fixture_path(self.fixture_dir, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 本文は展開済みの状態で読み切る（以降の読み出しは保持した本文から行われる）
+        body = response.content
+        with open(path + ".body", "wb") as f:
+            f.write(body)
+
+        meta = {
+            "url": url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _SKIPPED_HEADERS},
+            "elapsed": response.elapsed.total_seconds(),
+            "recorded_at": datetime.datetime.now().isoformat()
+        }
+        with open(path + ".meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+class ReplayAdapter(BaseAdapter):
+    """保存済みのフィクスチャをネットワークなしで返すアダプター"""
+
+    def __init__(self, fixture_dir: str, latency: Optional[float] = None,
+                 latency_scale: float = 1.0, failure_rate: float = 0.0, seed: int = 0):
+        """
+        Args:
+            fixture_dir: フィクスチャの保存先ディレクトリ
+            latency: 応答までの遅延（秒）。Noneの場合は記録時の応答時間を使う
+            latency_scale: 遅延に掛ける倍率
+            failure_rate: 接続エラーを発生させる割合（0〜1）
+            seed: 失敗の発生を再現するための乱数シード
+        """
+        super().__init__()
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # 再生の統計
+        self.served = 0
+        self.not_found = 0
+        self.injected_failures = 0
+
+    def _load(self, url: str):
+        """フィクスチャを読み込む（存在しない場合はNone）"""
+        path = fixture_path(self.fixture_dir, url)
+        try:
+            with open(path + ".meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(path + ".body", "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None, None
+        return meta, body
+
+    def _build_response(self, request, status: int, reason: str, headers: Dict[str, str],
+                        body: bytes, elapsed: float) -> requests.Response:
+        """保存済みのデータからレスポンスを組み立てる"""
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["Content-Length"] = str(len(body))
+        response.raw = io.BytesIO(body)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        response.connection = self
+        return response
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        meta, body = self._load(request.url)
+
+        with self._lock:
+            fail = self._random.random() < self.failure_rate
+
+        # 遅延（記録時の応答時間または固定値）を再現
+        if self.latency is not None:
+            delay = self.latency * self.latency_scale
+        else:
+            delay = (meta or {}).get("elapsed", 0.0) * self.latency_scale
+
+        read_timeout = timeout[1] if isinstance(timeout, tuple) else timeout
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise requests.exceptions.ReadTimeout(f"Replay latency {delay:.2f}s exceeded timeout", request=request)
+        if delay > 0:
+            time.sleep(delay)
+
+        if fail:
+            with self._lock:
+                self.injected_failures += 1
+            raise requests.exceptions.ConnectionError(f"Injected replay failure for {request.url}", request=request)
+
+        if meta is None:
+            with self._lock:
+                self.not_found += 1
+            return self._build_response(request, 404, "Not Found", {}, b"", delay)
+
+        with self._lock:
+            self.served += 1
+
+        # 条件付きGETは記録済みの検証子と比較して304を返す
+        headers = CaseInsensitiveDict(meta.get("headers", {}))
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if (etag and request.headers.get("If-None-Match") == etag) or \
+           (last_modified and request.headers.get("If-Modified-Since") == last_modified):
+            return self._build_response(request, 304, "Not Modified", dict(headers), b"", delay)
+
+        return self._build_response(request, meta.get("status", 200), meta.get("reason", "OK"),
+                                    dict(headers), body, delay)
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """再生の統計を取得する"""
+        with self._lock:
+            return {
+                "served": self.served,
+                "not_found": self.not_found,
+                "injected_failures": self.injected_failures
+            }
+
+
+def get_transport_mode() -> str:
+    """環境変数WEATHER_TRANSPORT_MODEからトランスポートのモードを取得する"""
+    return os.environ.get("WEATHER_TRANSPORT_MODE", TRANSPORT_LIVE)
+
+
+def create_transport_adapter(**adapter_kwargs):
+    """
+    環境変数の設定に応じたトランスポートアダプターを生成する
+    - WEATHER_TRANSPORT_MODE: live（既定）/ record / replay
+    - WEATHER_FIXTURE_DIR: フィクスチャの保存先
+    - WEATHER_REPLAY_LATENCY: 再生時の固定遅延（秒、未設定なら記録時の応答時間）
+    - WEATHER_REPLAY_LATENCY_SCALE: 再生時の遅延の倍率
+    - WEATHER_REPLAY_FAILURE_RATE: 再生時に接続エラーを発生させる割合
+    - WEATHER_REPLAY_SEED: 失敗の発生を再現するための乱数シード
+
+    Args:
+        **adapter_kwargs: HTTPAdapterに渡す接続プールの設定
+
+    Returns:
+        BaseAdapter: トランスポートアダプター
+    """
+    mode = get_transport_mode()
+    fixture_dir = os.environ.get("WEATHER_FIXTURE_DIR", DEFAULT_FIXTURE_DIR)
+
+    if mode == TRANSPORT_RECORD:
+        return RecordingAdapter(fixture_dir, **adapter_kwargs)
+
+    if mode == TRANSPORT_REPLAY:
+        latency = os.environ.get("WEATHER_REPLAY_LATENCY")
+        return ReplayAdapter(
+            fixture_dir,
+            latency=float(latency) if latency else None,
+            latency_scale=float(os.environ.get("WEATHER_REPLAY_LATENCY_SCALE", "1.0")),
+            failure_rate=float(os.environ.get("WEATHER_REPLAY_FAILURE_RATE", "0")),
+            seed=int(os.environ.get("WEATHER_REPLAY_SEED", "0"))
+        )
+
+    return HTTPAdapter(**adapter_kwargs)
+
+
+# 記録・再生の実行用
+if __name__ == "__main__":
+    import sys
+
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.dirname(current_dir))
+
+    from src.weather_data_enhanced import WeatherDataCollector
+
+    command = sys.argv[1] if len(sys.argv) > 1 else get_transport_mode()
+    collector = WeatherDataCollector()
+
+    if command == TRANSPORT_RECORD:
+        # フォールバック元も含め、全情報源のレスポンスを記録する
+        if get_transport_mode() != TRANSPORT_RECORD:
+            sys.exit("Set WEATHER_TRANSPORT_MODE=record to record fixtures")
+        collector.get_jma_weather_data()
+        collector.get_weathermap_data()
+        collector.get_yahoo_weather_data()
+        print(f"Recorded fixtures to {os.environ.get('WEATHER_FIXTURE_DIR', DEFAULT_FIXTURE_DIR)}")
+    else:
+        # 保存済みのフィクスチャで全体の処理時間を計測する
+        if get_transport_mode() != TRANSPORT_REPLAY:
+            sys.exit("Set WEATHER_TRANSPORT_MODE=replay to replay fixtures")
+        data = collector.get_complete_weather_data()
+        print(json.dumps(data.timings, ensure_ascii=False, indent=2))
+        print(f"missing regions: {data.missing_regions}")
@@ -249,7 +249,7 @@ class ScriptGenerator:
         全国の天気概況を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 全国の天気概況
@@ -258,13 +258,13 @@ class ScriptGenerator:
             # 挨拶から始める
             greeting = self._get_random_expression(self.greeting_expressions)
             
-            overview = weather_data["overview"]["today"]
+            overview = weather_data.overview["today"]
             
             # 地域ごとの天気パターンをカウント
             weather_patterns = {}
             for region, data in overview.items():
-                weather = data["weather"]
-                weather_code = data["code"]
+                weather = data.weather
+                weather_code = data.code
                 
                 # 主要な天気パターンを抽出（晴れ、曇り、雨、雪など）
                 pattern = "その他"
@@ -316,17 +316,17 @@ class ScriptGenerator:
         今後の天気のポイントを生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 今後の天気のポイント
         """
         try:
             # 警報・注意報情報を取得
-            warnings = weather_data.get("warnings", [])
+            warnings = weather_data.warnings
             
             # 明日の天気概況を取得
-            tomorrow_overview = weather_data["overview"]["tomorrow"]
+            tomorrow_overview = weather_data.overview["tomorrow"]
             
             points_text = ""
             
@@ -341,7 +341,7 @@ class ScriptGenerator:
             # 明日の天気の特徴を抽出
             tomorrow_patterns = {}
             for region, data in tomorrow_overview.items():
-                weather = data["weather"]
+                weather = data.weather
                 
                 pattern = "その他"
                 if "晴" in weather:
@@ -395,14 +395,14 @@ class ScriptGenerator:
         全国の天気を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 全国の天気
         """
         try:
             # 今日の天気概況
-            today_overview = weather_data["overview"]["today"]
+            today_overview = weather_data.overview["today"]
             
             # 地域ごとの天気をまとめる
             region_groups = {
@@ -417,7 +417,7 @@ class ScriptGenerator:
                 weather_codes = []
                 for region in regions:
                     if region in today_overview:
-                        weather_codes.append(today_overview[region]["code"])
+                        weather_codes.append(today_overview[region].code)
                 
                 if weather_codes:
                     # 最も多い天気コードを代表として使用
@@ -459,15 +459,15 @@ class ScriptGenerator:
         全国の気温情報を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 全国の気温情報
         """
         try:
             # 今日の気温データ
-            today_temp = weather_data["temperature"]["today"]
-            tomorrow_temp = weather_data["temperature"]["tomorrow"]
+            today_temp = weather_data.temperature["today"]
+            tomorrow_temp = weather_data.temperature["tomorrow"]
             
             # 代表的な地域の気温を抽出
             key_regions = ["関東甲信", "北海道", "沖縄"]
@@ -475,15 +475,16 @@ class ScriptGenerator:
             
             for region in key_regions:
                 if region in today_temp and region in tomorrow_temp:
-                    today_max = today_temp[region].get("max")
-                    tomorrow_max = tomorrow_temp[region].get("max")
-                    tomorrow_min = tomorrow_temp[region].get("min")
+                    # 気温は取り込み時に数値に変換済み
+                    today_max = today_temp[region].max
+                    tomorrow_max = tomorrow_temp[region].max
+                    tomorrow_min = tomorrow_temp[region].min
                     
-                    if today_max and tomorrow_max:
+                    if today_max is not None and tomorrow_max is not None:
                         # 気温の変化を表現
-                        if int(tomorrow_max) > int(today_max):
+                        if tomorrow_max > today_max:
                             temp_texts.append(f"{region}地方は明日の最高気温が{tomorrow_max}度まで上昇")
-                        elif int(tomorrow_max) < int(today_max):
+                        elif tomorrow_max < today_max:
                             temp_texts.append(f"{region}地方は明日の最高気温が{tomorrow_max}度まで下降")
                         else:
                             temp_texts.append(f"{region}地方は明日も最高気温が{tomorrow_max}度")
@@ -513,13 +514,13 @@ class ScriptGenerator:
         週間天気予報を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 週間天気予報
         """
         try:
-            weekly = weather_data.get("weekly", {})
+            weekly = weather_data.weekly
             
             if not weekly:
                 return "週間予報については、明日以降も天気の変化にご注意ください。最新の気象情報をこまめに確認することをおすすめします。"
@@ -530,7 +531,7 @@ class ScriptGenerator:
             cloudy_days = 0
             
             for date, data in weekly.items():
-                weather_code = data.get("weather_code", "")
+                weather_code = data.weather_code or ""
                 if weather_code.startswith("1"):  # 晴れ系
                     sunny_days += 1
                 elif weather_code.startswith("2"):  # 曇り系
@@ -581,7 +582,7 @@ class ScriptGenerator:
         完全な天気予報原稿を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             Dict[str, str]: 各セクションの原稿
@@ -11,6 +11,11 @@ import random
 import re
 from typing import Dict, List, Any, Optional
 
+try:
+    from src.jma_areas import get_area_index
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from jma_areas import get_area_index
+
 class ScriptGenerator:
     """天気予報原稿を生成するクラス"""
     
@@ -294,7 +299,7 @@ class ScriptGenerator:
         現在の全国天気の概況を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 全国の天気概況
@@ -306,13 +311,13 @@ class ScriptGenerator:
             # 挨拶から始める
             greeting = self._get_random_expression(self.greeting_expressions)
             
-            overview = weather_data["overview"][target_day]
+            overview = weather_data.overview[target_day]
             
             # 地域ごとの天気パターンをカウント
             weather_patterns = {}
             for region, data in overview.items():
-                weather = data["weather"]
-                weather_code = data["code"]
+                weather = data.weather
+                weather_code = data.code
                 
                 # 主要な天気パターンを抽出（晴れ、曇り、雨、雪など）
                 pattern = "その他"
@@ -364,7 +369,7 @@ class ScriptGenerator:
         今後の天気のポイントを生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 今後の天気のポイント
@@ -374,10 +379,10 @@ class ScriptGenerator:
             target_day, next_day, day_expression = self._determine_forecast_day()
             
             # 警報・注意報情報を取得
-            warnings = weather_data.get("warnings", [])
+            warnings = weather_data.warnings
             
             # 翌日の天気概況を取得
-            next_day_overview = weather_data["overview"][next_day]
+            next_day_overview = weather_data.overview[next_day]
             
             points_text = "今後の天気のポイントをお伝えします。"
             
@@ -392,7 +397,7 @@ class ScriptGenerator:
             # 翌日の天気の特徴を抽出
             next_day_patterns = {}
             for region, data in next_day_overview.items():
-                weather = data["weather"]
+                weather = data.weather
                 
                 pattern = "その他"
                 if "晴" in weather:
@@ -448,7 +453,7 @@ class ScriptGenerator:
         全国の天気を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 全国の天気
@@ -458,22 +463,17 @@ class ScriptGenerator:
             target_day, next_day, day_expression = self._determine_forecast_day()
             
             # 対象日の天気概況
-            target_overview = weather_data["overview"][target_day]
+            target_overview = weather_data.overview[target_day]
             
-            # 地域ごとの天気をまとめる
-            region_groups = {
-                "北日本": ["北海道", "東北"],
-                "東日本": ["関東甲信", "北陸", "東海"],
-                "西日本": ["近畿", "中国", "四国", "九州"],
-                "沖縄": ["沖縄"]
-            }
+            # 地域ごとの天気をまとめる（北日本・東日本・西日本・沖縄の区分は予報区ファイルで定義）
+            region_groups = get_area_index().region_groups
             
             region_weather = {}
             for group_name, regions in region_groups.items():
                 weather_codes = []
                 for region in regions:
                     if region in target_overview:
-                        weather_codes.append(target_overview[region]["code"])
+                        weather_codes.append(target_overview[region].code)
                 
                 if weather_codes:
                     # 最も多い天気コードを代表として使用
@@ -515,7 +515,7 @@ class ScriptGenerator:
         全国の気温情報を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 全国の気温情報
@@ -525,8 +525,8 @@ class ScriptGenerator:
             target_day, next_day, day_expression = self._determine_forecast_day()
             
             # 気温データ
-            target_temp = weather_data["temperature"][target_day]
-            next_day_temp = weather_data["temperature"][next_day]
+            target_temp = weather_data.temperature[target_day]
+            next_day_temp = weather_data.temperature[next_day]
             
             # 代表的な地域の気温を抽出
             key_regions = ["関東甲信", "北海道", "沖縄"]
@@ -534,17 +534,18 @@ class ScriptGenerator:
             
             for region in key_regions:
                 if region in target_temp and region in next_day_temp:
-                    target_max = target_temp[region].get("max")
-                    next_day_max = next_day_temp[region].get("max")
-                    next_day_min = next_day_temp[region].get("min")
+                    # 気温は取り込み時に数値に変換済み
+                    target_max = target_temp[region].max
+                    next_day_max = next_day_temp[region].max
+                    next_day_min = next_day_temp[region].min
                     
                     next_day_expression = "明日" if target_day == "today" else "明後日"
                     
-                    if target_max and next_day_max:
+                    if target_max is not None and next_day_max is not None:
                         # 気温の変化を表現
-                        if int(next_day_max) > int(target_max):
+                        if next_day_max > target_max:
                             temp_texts.append(f"{region}地方は{next_day_expression}の最高気温が{next_day_max}度まで上昇")
-                        elif int(next_day_max) < int(target_max):
+                        elif next_day_max < target_max:
                             temp_texts.append(f"{region}地方は{next_day_expression}の最高気温が{next_day_max}度まで下降")
                         else:
                             temp_texts.append(f"{region}地方は{next_day_expression}も最高気温が{next_day_max}度")
@@ -574,13 +575,13 @@ class ScriptGenerator:
         週間天気予報を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             str: 週間天気予報
         """
         try:
-            weekly = weather_data.get("weekly", {})
+            weekly = weather_data.weekly
             
             if not weekly:
                 return self._format_sentence("週間予報については、明日以降も天気の変化にご注意ください。最新の気象情報をこまめに確認することをおすすめします。")
@@ -591,7 +592,7 @@ class ScriptGenerator:
             cloudy_days = 0
             
             for date, data in weekly.items():
-                weather_code = data.get("weather_code", "")
+                weather_code = data.weather_code or ""
                 if weather_code.startswith("1"):  # 晴れ系
                     sunny_days += 1
                 elif weather_code.startswith("2"):  # 曇り系
@@ -637,12 +638,29 @@ class ScriptGenerator:
             print(f"Error generating weekly forecast: {e}")
             return self._format_sentence("週間予報については、明日以降も天気の変化にご注意ください。最新の気象情報をこまめに確認することをおすすめします。")
     
+    def generate_missing_regions_note(self, weather_data):
+        """
+        データを取得できなかった地域の断り書きを生成
+        
+        Args:
+            weather_data: 天気データ（WeatherSnapshot）
+            
+        Returns:
+            str: 断り書き（欠けている地域がない場合は空文字列）
+        """
+        missing_regions = weather_data.missing_regions
+        if not missing_regions:
+            return ""
+        
+        regions_text = "、".join(missing_regions)
+        return f"なお、{regions_text}の最新データは取得できなかったため、この原稿には含まれていません。"
+    
     def generate_complete_script(self, weather_data):
         """
         完全な天気予報原稿を生成
         
         Args:
-            weather_data: 天気データ
+            weather_data: 天気データ（WeatherSnapshot）
             
         Returns:
             Dict[str, str]: 各セクションの原稿
@@ -697,6 +715,9 @@ class ScriptGenerator:
                 elif section == "週間予報":
                     weekly_forecast = self._adjust_text_length(weekly_forecast, int(self.target_char_count * 0.2))
         
+        # 取得できなかった地域を概況の末尾に明記（文字数調整の対象外）
+        current_national_overview += self.generate_missing_regions_note(weather_data)
+        
         # 日付情報
         now = datetime.datetime.now()
         date_str = now.strftime("%Y年%m月%d日(%a)")
@@ -0,0 +1,106 @@
+"""
+リクエスト集約（シングルフライト）モジュール
+同じキーの処理が同時に要求された場合、実際の処理は1回だけ実行し、
+待っていた呼び出し元全員にその結果を共有します。
+待つ側は自身の処理期限（deadline 引数）までしか待ちません。
+"""
+
+import threading
+from typing import Callable, Dict, Any
+
+try:
+    from src.deadline import DeadlineExceeded
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from deadline import DeadlineExceeded
+
+
+class _Call:
+    """実行中の処理1件分の状態"""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """キーごとに実行中の処理を1件にまとめるクラス"""
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+        # 集約の統計
+        self.executions = 0
+        self.shared = 0
+        self.timeouts = 0
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        キーに対応する処理を実行する
+        同じキーの処理が実行中であれば、その完了を待って結果を共有する
+        （kwargs に deadline があれば、その期限までしか待たない。
+        実行中の処理が期限のない先読みなどでも、呼び出し元の期限を超えて待たないようにする）
+
+        Args:
+            key: 処理を識別するキー
+            fn: 実行する関数
+            *args, **kwargs: 関数に渡す引数
+
+        Returns:
+            Any: 関数の戻り値（例外は待っていた呼び出し元全員に送出される）
+
+        Raises:
+            DeadlineExceeded: 実行中の処理が呼び出し元の期限までに終わらなかった場合
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            deadline = kwargs.get("deadline")
+            if not call.done.wait(deadline.remaining() if deadline is not None else None):
+                with self._lock:
+                    self.timeouts += 1
+                raise DeadlineExceeded(f"Deadline exceeded waiting for in-flight {key}")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        集約の統計を取得する
+
+        Returns:
+            Dict[str, Any]: 実行回数・結果を共有した回数・期限までに待ちきれなかった回数・実行中のキー
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "shared": self.shared,
+                "timeouts": self.timeouts,
+                "in_flight": {key: call.waiters for key, call in self._calls.items()}
+            }
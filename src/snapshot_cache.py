@@ -0,0 +1,150 @@
+"""
+天気データスナップショットのキャッシュモジュール
+取得済みの天気データを有効期限（TTL）付きでメモリに保持します。
+期限切れ後も保持中のデータを即座に返し、裏で1件だけ再取得を行います（stale-while-revalidate）。
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Any, Optional
+
+try:
+    from src.deadline import Deadline
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from deadline import Deadline
+
+
+class SnapshotCache:
+    """TTLとstale-while-revalidateに対応したスナップショットキャッシュ"""
+
+    def __init__(self, loader: Callable[..., Dict[str, Any]], ttl_seconds: float = 600,
+                 is_partial: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 background_deadline_seconds: Optional[float] = None):
+        """
+        Args:
+            loader: 天気データを取得する関数（get_complete_weather_dataなど）
+            ttl_seconds: スナップショットを新鮮とみなす秒数
+            is_partial: スナップショットが一部欠けているか判定する関数
+                        （欠けている場合はTTL内でも期限切れとして扱い、裏で再取得する）
+            background_deadline_seconds: 裏での再取得の処理期限（秒）。
+                                         指定した場合は取得関数に deadline として渡す
+        """
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.is_partial = is_partial
+        self.background_deadline_seconds = background_deadline_seconds
+
+        self._snapshot = None
+        self._loaded_at = None
+        self._partial = False
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+        # キャッシュの統計
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.background_refreshes = 0
+        self.refresh_failures = 0
+
+    def _store(self, snapshot: Dict[str, Any]):
+        partial = self.is_partial is not None and self.is_partial(snapshot)
+        with self._lock:
+            self._snapshot = snapshot
+            self._loaded_at = time.monotonic()
+            self._partial = partial
+
+    def refresh(self, **loader_kwargs) -> Dict[str, Any]:
+        """
+        天気データを取得してスナップショットを更新する
+
+        Args:
+            **loader_kwargs: 取得関数に渡す引数（deadlineなど）
+
+        Returns:
+            Dict[str, Any]: 取得したスナップショット
+        """
+        snapshot = self.loader(**loader_kwargs)
+        self._store(snapshot)
+        return snapshot
+
+    def _background_refresh(self):
+        """バックグラウンドスレッドでの再取得処理"""
+        try:
+            if self.background_deadline_seconds is not None:
+                self.refresh(deadline=Deadline(self.background_deadline_seconds))
+            else:
+                self.refresh()
+        except Exception as e:
+            print(f"Error refreshing weather snapshot: {e}")
+            with self._lock:
+                self.refresh_failures += 1
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self, **loader_kwargs) -> Dict[str, Any]:
+        """
+        スナップショットを取得する
+        - 新鮮なデータがあればそのまま返す
+        - 期限切れ・一部欠けたデータは即座に返し、裏で再取得を1件だけ開始する
+        - データがなければその場で取得する
+
+        Args:
+            **loader_kwargs: その場で取得する場合に取得関数へ渡す引数（deadlineなど）
+
+        Returns:
+            Dict[str, Any]: 天気データのスナップショット
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None:
+                age = time.monotonic() - self._loaded_at
+                if age <= self.ttl_seconds and not self._partial:
+                    self.hits += 1
+                    return snapshot
+
+                # 期限切れ：保持中のデータを返しつつ再取得を開始
+                self.stale_hits += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    self.background_refreshes += 1
+                    threading.Thread(target=self._background_refresh,
+                                     name="weather-snapshot-refresh", daemon=True).start()
+                return snapshot
+
+            self.misses += 1
+
+        return self.refresh(**loader_kwargs)
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        """
+        保持中のスナップショットを鮮度に関係なく取得する（取得処理は行わない）
+
+        Returns:
+            Optional[Dict[str, Any]]: スナップショット（未取得の場合はNone）
+        """
+        with self._lock:
+            return self._snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        キャッシュの統計を取得する
+
+        Returns:
+            Dict[str, Any]: ヒット・ミス・期限切れヒットの回数など
+        """
+        with self._lock:
+            age = time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "age_seconds": round(age, 1) if age is not None else None,
+                "stale": age is not None and age > self.ttl_seconds,
+                "partial": self._partial,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale_hits": self.stale_hits,
+                "background_refreshes": self.background_refreshes,
+                "refresh_failures": self.refresh_failures,
+                "refreshing": self._refreshing
+            }
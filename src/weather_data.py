@@ -3,11 +3,15 @@
 気象庁APIから最新の天気予報データを取得し、テレビ用天気予報原稿作成に必要な情報を提供します。
 """
 
-import requests
 import json
 import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    from src.http_session import get_session_pool
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from http_session import get_session_pool
+
 class WeatherDataCollector:
     """気象庁APIから天気予報データを収集するクラス"""
     
@@ -28,6 +32,9 @@ class WeatherDataCollector:
             "沖縄": "471000"     # 沖縄本島地方
         }
         
+        # ホストごとのキープアライブ接続プール（プロセス全体で共有）
+        self.session_pool = get_session_pool()
+        
     def get_weather_data(self) -> Dict[str, Any]:
         """
         全国の天気予報データを取得する
@@ -40,7 +47,7 @@ class WeatherDataCollector:
         for region_name, area_code in self.area_codes.items():
             try:
                 url = self.jma_forecast_url.format(area_code=area_code)
-                response = requests.get(url)
+                response = self.session_pool.get_session(url).get(url)
                 response.raise_for_status()  # エラーチェック
                 data = response.json()
                 all_weather_data[region_name] = data
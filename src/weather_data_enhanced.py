@@ -5,69 +5,125 @@
 複数情報源からのデータ統合とエラー時のフォールバック機能を備えています。
 """
 
-import requests
 import json
 import datetime
-import time
 import re
-from bs4 import BeautifulSoup
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from typing import Dict, List, Any, Optional
 
+try:
+    from src.rate_limiter import get_rate_limiter
+    from src.http_session import get_session_pool
+    from src.http_cache import get_http_cache
+    from src.latency_tracker import get_latency_tracker
+    from src.circuit_breaker import get_circuit_breakers, CircuitOpenError
+    from src.deadline import DeadlineExceeded
+    from src.html_extract import parse_weathermap_html, parse_yahoo_html, read_html_stream, decode_html
+    from src.html_extract import STOP_TARGET, STOP_MAX_BYTES, STOP_DEADLINE, WEATHERMAP_END_CLASS, YAHOO_END_CLASS
+    from src.fetch_stats import get_fetch_stats
+    from src.jma_areas import get_area_index
+    from src.jma_normalizer import normalize_office_forecast, normalize_region_data, TimestampCache
+    from src.forecast_model import RegionWeather, RegionTemperature, WeeklyDay, WeatherSnapshot
+    from src.raw_archive import get_raw_archive, new_snapshot_id
+    from src.weather_text_resolver import WeatherTextResolver
+except ImportError:  # src/ 直下でスクリプトとして実行された場合
+    from rate_limiter import get_rate_limiter
+    from http_session import get_session_pool
+    from http_cache import get_http_cache
+    from latency_tracker import get_latency_tracker
+    from circuit_breaker import get_circuit_breakers, CircuitOpenError
+    from deadline import DeadlineExceeded
+    from html_extract import parse_weathermap_html, parse_yahoo_html, read_html_stream, decode_html
+    from html_extract import STOP_TARGET, STOP_MAX_BYTES, STOP_DEADLINE, WEATHERMAP_END_CLASS, YAHOO_END_CLASS
+    from fetch_stats import get_fetch_stats
+    from jma_areas import get_area_index
+    from jma_normalizer import normalize_office_forecast, normalize_region_data, TimestampCache
+    from forecast_model import RegionWeather, RegionTemperature, WeeklyDay, WeatherSnapshot
+    from raw_archive import get_raw_archive, new_snapshot_id
+    from weather_text_resolver import WeatherTextResolver
+
+# データ取得モード
+MODE_FULL = "full"  # 気象庁の予報・概況とフォールバック元を使う通常モード
+MODE_FAST = "fast"  # 気象庁の予報データのみを使う高速モード
+
 class WeatherDataCollector:
     """複数の情報源から天気予報データを収集するクラス"""
     
-    def __init__(self):
+    def __init__(self, fetch_concurrency=None, hedge=None):
+        # 各情報源のベースURL（環境変数でモックサーバーなどに向けられる）
+        jma_base_url = os.environ.get("WEATHER_JMA_BASE_URL", "https://www.jma.go.jp").rstrip("/")
+        weathermap_base_url = os.environ.get("WEATHER_WEATHERMAP_BASE_URL", "https://weathermap.jp").rstrip("/")
+        yahoo_base_url = os.environ.get("WEATHER_YAHOO_BASE_URL", "https://weather.yahoo.co.jp").rstrip("/")
+        
         # 気象庁API URL
-        self.jma_forecast_url = "https://www.jma.go.jp/bosai/forecast/data/forecast/{area_code}.json"
-        self.jma_overview_url = "https://www.jma.go.jp/bosai/forecast/data/overview_forecast/{area_code}.json"
+        self.jma_forecast_url = jma_base_url + "/bosai/forecast/data/forecast/{area_code}.json"
+        self.jma_overview_url = jma_base_url + "/bosai/forecast/data/overview_forecast/{area_code}.json"
         
         # ウェザーマップURL
-        self.weathermap_url = "https://weathermap.jp/s/0/{area_name}/"
+        self.weathermap_url = weathermap_base_url + "/s/0/{area_name}/"
         
         # Yahoo!天気URL
-        self.yahoo_weather_url = "https://weather.yahoo.co.jp/weather/jp/{region_id}/{prefecture_id}/{city_id}.html"
-        
-        # 全国天気用エリアコード（全国を網羅する主要都市）
-        self.area_codes = {
-            "北海道": "016000",  # 札幌管区
-            "東北": "040000",    # 仙台管区
-            "関東甲信": "130000", # 東京管区
-            "北陸": "170000",    # 金沢地方
-            "東海": "230000",    # 名古屋地方
-            "近畿": "270000",    # 大阪管区
-            "中国": "340000",    # 広島地方
-            "四国": "390000",    # 高松地方
-            "九州": "400000",    # 福岡管区
-            "沖縄": "471000"     # 沖縄本島地方
-        }
+        self.yahoo_weather_url = yahoo_base_url + "/weather/jp/{region_id}/{prefecture_id}/{city_id}.html"
         
-        # 地域名とウェザーマップ検索キーワードのマッピング
-        self.weathermap_area_names = {
-            "北海道": "北海道",
-            "東北": "宮城県",
-            "関東甲信": "東京都",
-            "北陸": "石川県",
-            "東海": "愛知県",
-            "近畿": "大阪府",
-            "中国": "広島県",
-            "四国": "香川県",
-            "九州": "福岡県",
-            "沖縄": "沖縄県"
-        }
+        # 予報区の索引（同梱の予報区ファイルからワーカーごとに1回だけ読み込む）
+        self.area_index = get_area_index()
         
-        # Yahoo!天気の地域ID
-        self.yahoo_weather_ids = {
-            "北海道": {"region_id": "1", "prefecture_id": "1", "city_id": "2128"},  # 札幌
-            "東北": {"region_id": "2", "prefecture_id": "4", "city_id": "3410"},    # 仙台
-            "関東甲信": {"region_id": "3", "prefecture_id": "13", "city_id": "4410"}, # 東京
-            "北陸": {"region_id": "4", "prefecture_id": "17", "city_id": "5610"},   # 金沢
-            "東海": {"region_id": "5", "prefecture_id": "23", "city_id": "6710"},   # 名古屋
-            "近畿": {"region_id": "6", "prefecture_id": "27", "city_id": "6200"},   # 大阪
-            "中国": {"region_id": "7", "prefecture_id": "34", "city_id": "6710"},   # 広島
-            "四国": {"region_id": "8", "prefecture_id": "37", "city_id": "7110"},   # 高松
-            "九州": {"region_id": "9", "prefecture_id": "40", "city_id": "8210"},   # 福岡
-            "沖縄": {"region_id": "10", "prefecture_id": "47", "city_id": "9110"}   # 那覇
-        }
+        # 放送地域ごとの府県予報区コード・ウェザーマップ検索キーワード・Yahoo!天気の地域ID
+        self.area_codes = self.area_index.region_offices
+        self.weathermap_area_names = self.area_index.weathermap_area_names
+        self.yahoo_weather_ids = self.area_index.yahoo_weather_ids
+        
+        # 同時リクエスト数の上限（1以下の場合は逐次取得）
+        if fetch_concurrency is None:
+            fetch_concurrency = int(os.environ.get("WEATHER_FETCH_CONCURRENCY", "8"))
+        self.fetch_concurrency = fetch_concurrency
+        
+        # ヘッジ取得（気象庁の応答が遅い地域はフォールバック元を並列で取得する）
+        if hedge is None:
+            hedge = os.environ.get("WEATHER_HEDGE_ENABLED", "0") == "1"
+        self.hedge = hedge
+        # 応答時間の実績が少ない間に使う待ち時間と、待ち時間の下限（秒）
+        self.hedge_default_budget = float(os.environ.get("WEATHER_HEDGE_BUDGET_SECONDS", "3.0"))
+        self.hedge_min_budget = float(os.environ.get("WEATHER_HEDGE_MIN_BUDGET_SECONDS", "0.5"))
+        # 実績から待ち時間を決めるのに必要なサンプル数と、採用するパーセンタイル
+        self.hedge_min_samples = 5
+        self.hedge_percentile = 90
+        
+        # 全国モードで全府県予報区を取得するときの同時リクエスト数
+        self.nationwide_concurrency = int(os.environ.get("WEATHER_NATIONWIDE_CONCURRENCY", "16"))
+        
+        # スクレイピング対象ページの読み込み設定
+        # 必要な要素を読み終えた時点でダウンロードを打ち切り、1ページあたりのバイト数にも上限を設ける
+        self.html_early_stop = os.environ.get("WEATHER_HTML_EARLY_STOP", "1") == "1"
+        self.html_max_bytes = int(os.environ.get("WEATHER_HTML_MAX_BYTES", str(2 * 1024 * 1024)))
+        
+        # 取得した生のデータの扱い（スナップショットには通常持たせない）
+        # WEATHER_KEEP_RAW_DATA=1 でスナップショットに保持し（デバッグ用）、
+        # WEATHER_RAW_ARCHIVE_DIR を指定するとスナップショットIDごとにディスクへ保存する
+        self.keep_raw_data = os.environ.get("WEATHER_KEEP_RAW_DATA", "0") == "1"
+        self.raw_archive = get_raw_archive()
+        
+        # ホストごとのレートリミッター（プロセス全体で共有）
+        self.rate_limiter = get_rate_limiter()
+        
+        # ホストごとのキープアライブ接続プール（プロセス全体で共有）
+        self.session_pool = get_session_pool()
+        
+        # 気象庁JSONの条件付きGETキャッシュ（プロセス全体で共有）
+        self.http_cache = get_http_cache()
+        
+        # 地域ごとの応答時間の実績（プロセス全体で共有）
+        self.latency_tracker = get_latency_tracker()
+        
+        # 情報源ごとのサーキットブレーカー（プロセス全体で共有）
+        self.circuit_breakers = get_circuit_breakers()
+        
+        # 情報源・地域ごとの取得処理の計測（プロセス全体で共有）
+        self.fetch_stats = get_fetch_stats()
         
         # ユーザーエージェント（Webスクレイピング用）
         self.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -194,28 +250,46 @@ class WeatherDataCollector:
             "450": "雪で雷を伴う"
         }
         
-    def get_jma_weather_data(self) -> Dict[str, Any]:
+        # 天気テキストから天気コードを最長一致で求めるリゾルバー（天気コード表から1回だけ組み立てる）
+        self.weather_text_resolver = WeatherTextResolver(self.weather_code_mapping)
+        
+    def get_jma_weather_data(self, concurrent=None, deadline=None, include_overview=True) -> Dict[str, Any]:
         """
         気象庁APIから全国の天気予報データを取得する
         
+        Args:
+            concurrent: Trueの場合は予報・概況の全リクエストを並列に発行する
+                        （Noneの場合はfetch_concurrencyの設定に従う）
+            deadline: 処理全体の期限（期限を過ぎた地域はNoneとする）
+            include_overview: Falseの場合は概況データを取得しない（"overview"はNoneとなる）
+        
         Returns:
             Dict[str, Any]: 全国の天気予報データ
         """
+        if concurrent is None:
+            concurrent = self.fetch_concurrency > 1
+        
+        if concurrent:
+            return self._get_jma_weather_data_concurrent(deadline, include_overview)
+        
         all_weather_data = {}
         
         for region_name, area_code in self.area_codes.items():
+            if deadline is not None and deadline.expired():
+                all_weather_data[region_name] = None
+                continue
+            
+            region_started_at = time.monotonic()
             try:
                 # 予報データを取得
                 forecast_url = self.jma_forecast_url.format(area_code=area_code)
-                forecast_response = requests.get(forecast_url, timeout=10)
-                forecast_response.raise_for_status()
-                forecast_data = forecast_response.json()
+                forecast_data = self._fetch_json(forecast_url, cache_key=area_code, deadline=deadline, source="jma_forecast")
                 
                 # 概況データを取得
-                overview_url = self.jma_overview_url.format(area_code=area_code)
-                overview_response = requests.get(overview_url, timeout=10)
-                overview_response.raise_for_status()
-                overview_data = overview_response.json()
+                overview_data = None
+                if include_overview:
+                    overview_url = self.jma_overview_url.format(area_code=area_code)
+                    overview_data = self._fetch_json(overview_url, cache_key=area_code, deadline=deadline, source="jma_overview")
                 
                 # データを統合
                 all_weather_data[region_name] = {
@@ -223,105 +297,649 @@ class WeatherDataCollector:
                     "overview": overview_data
                 }
                 
-                # APIリクエスト間隔を空ける（サーバー負荷軽減）
-                time.sleep(0.5)
-                
             except Exception as e:
                 print(f"Error fetching JMA data for {region_name}: {e}")
                 all_weather_data[region_name] = None
+            finally:
+                # 失敗した場合も含めて地域ごとの応答時間を記録
+                self.latency_tracker.record(f"jma:{area_code}", time.monotonic() - region_started_at)
                 
         return all_weather_data
     
-    def get_weathermap_data(self) -> Dict[str, Any]:
+    def _get_jma_weather_data_concurrent(self, deadline=None, include_overview=True) -> Dict[str, Any]:
+        """
+        気象庁APIの予報・概況データをスレッドプールで並列に取得する
+        同時リクエスト数はfetch_concurrencyで制限する
+        
+        Args:
+            deadline: 処理全体の期限
+            include_overview: Falseの場合は概況データを取得しない
+        
+        Returns:
+            Dict[str, Any]: 全国の天気予報データ（逐次取得と同じ形式）
+        """
+        all_weather_data = {}
+        
+        executor = ThreadPoolExecutor(max_workers=self._jma_max_workers(), thread_name_prefix="jma-fetch")
+        try:
+            # 全地域の予報・概況リクエストを一度に発行
+            futures = self._submit_jma_requests(executor, deadline, include_overview)
+            
+            # 期限までに揃った分だけ使う（期限がない場合は全て揃うまで待つ）
+            wait([future for pair in futures.values() for future in pair if future is not None],
+                 timeout=max(0.0, deadline.remaining()) if deadline is not None else None)
+            
+            # 地域の定義順に結果を統合
+            for region_name, (forecast_future, overview_future) in futures.items():
+                if not self._jma_region_done(forecast_future, overview_future):
+                    print(f"Deadline exceeded, giving up on JMA data for {region_name}")
+                    all_weather_data[region_name] = None
+                    continue
+                try:
+                    all_weather_data[region_name] = self._jma_region_result(forecast_future, overview_future)
+                except Exception as e:
+                    print(f"Error fetching JMA data for {region_name}: {e}")
+                    all_weather_data[region_name] = None
+        finally:
+            # 期限までに終わらなかったリクエストの完了は待たない
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return all_weather_data
+    
+    def _jma_max_workers(self) -> int:
+        """気象庁APIの並列取得に使うスレッド数を求める"""
+        return max(1, min(self.fetch_concurrency, len(self.area_codes) * 2))
+    
+    def _submit_jma_requests(self, executor, deadline=None, include_overview=True) -> Dict[str, Any]:
+        """
+        全地域の予報・概況リクエストをスレッドプールに投入する
+        
+        Args:
+            executor: リクエストを実行するスレッドプール
+            deadline: 処理全体の期限
+            include_overview: Falseの場合は概況リクエストを投入しない（概況のFutureはNone）
+            
+        Returns:
+            Dict[str, Any]: 地域名をキーとした（予報, 概況）のFutureの組
+        """
+        futures = {}
+        submitted_at = time.monotonic()
+        for region_name, area_code in self.area_codes.items():
+            forecast_future = executor.submit(
+                self._fetch_json, self.jma_forecast_url.format(area_code=area_code), area_code, deadline, "jma_forecast"
+            )
+            overview_future = None
+            if include_overview:
+                overview_future = executor.submit(
+                    self._fetch_json, self.jma_overview_url.format(area_code=area_code), area_code, deadline, "jma_overview"
+                )
+            futures[region_name] = (forecast_future, overview_future)
+            self._record_region_latency(area_code, (forecast_future, overview_future), submitted_at)
+        return futures
+    
+    def _record_region_latency(self, area_code, futures, submitted_at):
+        """
+        1地域分の気象庁リクエストが全て終わった時点で、投入からの経過時間を応答時間として記録する
+        失敗・取り消し・期限で採用されなかったリクエストも終わった時点で記録し、
+        ヘッジの待ち時間が成功した速い応答だけから求められないようにする
+        
+        Args:
+            area_code: 気象庁のエリアコード
+            futures: 予報・概況のFuture（概況を取得しない場合はNoneを含む）
+            submitted_at: リクエストを投入した時刻（time.monotonic）
+        """
+        futures = [future for future in futures if future is not None]
+        remaining = [len(futures)]
+        lock = threading.Lock()
+        
+        def on_done(_future):
+            with lock:
+                remaining[0] -= 1
+                finished = remaining[0] == 0
+            if finished:
+                self.latency_tracker.record(f"jma:{area_code}", time.monotonic() - submitted_at)
+        
+        for future in futures:
+            future.add_done_callback(on_done)
+    
+    def _jma_region_done(self, forecast_future, overview_future) -> bool:
+        """
+        1地域分の結果が揃ったかどうか（予報が失敗していれば概況を待たずに揃ったものとする）
+        
+        Args:
+            forecast_future: 予報データのFuture
+            overview_future: 概況データのFuture（概況を取得しない場合はNone）
+            
+        Returns:
+            bool: _jma_region_result で結果を組み立てられる場合はTrue
+        """
+        if not forecast_future.done():
+            return False
+        return overview_future is None or overview_future.done() or forecast_future.exception() is not None
+    
+    def _jma_region_result(self, forecast_future, overview_future) -> Dict[str, Any]:
+        """
+        1地域分の予報・概況のFutureから結果を組み立てる（失敗時は例外を送出する）
+        予報の取得に失敗した場合は、まだ送信していない概況のリクエストを取り消す
+        
+        Args:
+            forecast_future: 予報データのFuture
+            overview_future: 概況データのFuture（概況を取得しない場合はNone）
+            
+        Returns:
+            Dict[str, Any]: {"forecast": ..., "overview": ...}
+        """
+        try:
+            forecast = forecast_future.result()
+        except Exception:
+            if overview_future is not None:
+                overview_future.cancel()
+            raise
+        return {
+            "forecast": forecast,
+            "overview": overview_future.result() if overview_future is not None else None
+        }
+    
+    def _hedge_budget(self, area_code) -> float:
+        """
+        フォールバック元の取得を開始するまでの待ち時間を求める
+        実績が十分にあれば地域ごとの応答時間（全モードの取得で、失敗・打ち切りも含めて記録）のパーセンタイルを使う
+        
+        Args:
+            area_code: 気象庁のエリアコード
+            
+        Returns:
+            float: 待ち時間（秒）
+        """
+        key = f"jma:{area_code}"
+        if self.latency_tracker.count(key) < self.hedge_min_samples:
+            return self.hedge_default_budget
+        return max(self.hedge_min_budget, self.latency_tracker.percentile(key, self.hedge_percentile))
+    
+    def _fetch_fallback_region(self, region_name, deadline=None):
+        """
+        1地域分のデータをウェザーマップ、Yahoo!天気の順に取得する
+        
+        Args:
+            region_name: 地域名
+            deadline: 処理全体の期限
+            
+        Returns:
+            tuple: (情報源名, データ)。どちらも取得できない場合は (None, None)
+        """
+        weathermap_data = self.get_weathermap_data([region_name], deadline).get(region_name)
+        if weathermap_data is not None:
+            return "weathermap", weathermap_data
+        
+        yahoo_data = self.get_yahoo_weather_data([region_name], deadline).get(region_name)
+        if yahoo_data is not None:
+            return "yahoo", yahoo_data
+        
+        return None, None
+    
+    def get_hedged_weather_data(self, deadline=None):
+        """
+        気象庁APIとフォールバック元をヘッジして全国のデータを取得する
+        気象庁の応答が待ち時間を超えた地域、または取得に失敗した地域は
+        フォールバック元の取得を並列で開始し、先に揃った有効な結果を採用する
+        
+        Args:
+            deadline: 処理全体の期限（期限を過ぎた時点で揃っている地域のみ返す）
+        
+        Returns:
+            tuple: (気象庁データ, ウェザーマップデータ, Yahoo!天気データ)
+        """
+        jma_data = {region_name: None for region_name in self.area_codes}
+        fallback_data = {"weathermap": {}, "yahoo": {}}
+        
+        executor = ThreadPoolExecutor(
+            max_workers=self._jma_max_workers() + len(self.area_codes),
+            thread_name_prefix="jma-hedge"
+        )
+        try:
+            started_at = time.monotonic()
+            jma_futures = self._submit_jma_requests(executor, deadline)
+            budgets = {region_name: self._hedge_budget(area_code) for region_name, area_code in self.area_codes.items()}
+            hedge_futures = {}
+            jma_failed = set()
+            pending = set(self.area_codes)
+            
+            while pending:
+                if deadline is not None and deadline.expired():
+                    print(f"Deadline exceeded, giving up on {', '.join(pending)}")
+                    break
+                
+                elapsed = time.monotonic() - started_at
+                
+                for region_name in list(pending):
+                    forecast_future, overview_future = jma_futures[region_name]
+                    
+                    # 気象庁の結果が揃っていれば採用（予報が失敗していれば概況を待たずに失敗とする）
+                    if region_name not in jma_failed and self._jma_region_done(forecast_future, overview_future):
+                        try:
+                            jma_data[region_name] = self._jma_region_result(forecast_future, overview_future)
+                            pending.discard(region_name)
+                            continue
+                        except Exception as e:
+                            print(f"Error fetching JMA data for {region_name}: {e}")
+                            jma_failed.add(region_name)
+                    
+                    # 失敗または待ち時間超過の場合はフォールバック元の取得を開始
+                    if region_name not in hedge_futures and (region_name in jma_failed or elapsed >= budgets[region_name]):
+                        if region_name not in jma_failed:
+                            print(f"JMA data for {region_name} is slow, hedging with fallback sources...")
+                        hedge_futures[region_name] = executor.submit(self._fetch_fallback_region, region_name, deadline)
+                    
+                    # フォールバック元の結果が先に揃えば採用
+                    hedge_future = hedge_futures.get(region_name)
+                    if hedge_future is not None and hedge_future.done():
+                        source, data = hedge_future.result()
+                        if source is not None:
+                            fallback_data[source][region_name] = data
+                            pending.discard(region_name)
+                        elif region_name in jma_failed:
+                            # どの情報源からも取得できなかった
+                            pending.discard(region_name)
+                
+                if not pending:
+                    break
+                
+                # 次の結果が揃うか、次の待ち時間を超えるまで待機
+                waiting = [f for region_name in pending for f in jma_futures[region_name]]
+                waiting += [hedge_futures[region_name] for region_name in pending if region_name in hedge_futures]
+                timeouts = [budgets[region_name] - elapsed for region_name in pending
+                            if region_name not in hedge_futures and budgets[region_name] > elapsed]
+                if deadline is not None:
+                    timeouts.append(deadline.remaining())
+                wait([f for f in waiting if not f.done()], timeout=min(timeouts) if timeouts else None,
+                     return_when=FIRST_COMPLETED)
+        finally:
+            # 採用されなかった遅いリクエストの完了は待たない
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return jma_data, fallback_data["weathermap"] or None, fallback_data["yahoo"] or None
+    
+    def get_nationwide_weather_data(self, deadline=None, include_overview=False) -> Dict[str, Any]:
+        """
+        全国の全府県予報区の予報を並行して取得し、全ての細分区域・地点を正規化する
+        取得を終えた予報区から順に正規化するため、通信と正規化が重なって進む
+        
+        Args:
+            deadline: 処理全体の期限（期限を過ぎた予報区は欠損とする）
+            include_overview: Trueの場合は府県予報区ごとの天気概況も取得する
+        
+        Returns:
+            Dict[str, Any]: 府県予報区コードをキーとした正規化済みの予報と、欠損した予報区・期限超過の有無・処理時間
+        """
+        started_at = time.monotonic()
+        
+        # 別の予報区のファイルにまとめて発表される予報区は、そのファイルを1回だけ取得する
+        office_codes = [office.code for office in self.area_index.offices()]
+        file_codes = sorted({self.area_index.forecast_file_code(office_code) for office_code in office_codes})
+        
+        normalized_files = {}
+        overviews = {}
+        normalize_seconds = 0.0
+        
+        # 全府県予報区で同じ発表時刻が繰り返されるため、時刻の解析結果を共有する
+        timestamps = TimestampCache()
+        
+        deadline_exceeded = False
+        executor = ThreadPoolExecutor(max_workers=self.nationwide_concurrency, thread_name_prefix="jma-nationwide")
+        try:
+            futures = {}
+            for file_code in file_codes:
+                future = executor.submit(
+                    self._fetch_json, self.jma_forecast_url.format(area_code=file_code), file_code, deadline, "jma_forecast"
+                )
+                futures[future] = ("forecast", file_code)
+            if include_overview:
+                for office_code in office_codes:
+                    future = executor.submit(
+                        self._fetch_json, self.jma_overview_url.format(area_code=office_code), office_code, deadline, "jma_overview"
+                    )
+                    futures[future] = ("overview", office_code)
+            
+            try:
+                for future in as_completed(futures, timeout=max(0.0, deadline.remaining()) if deadline is not None else None):
+                    kind, code = futures[future]
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        print(f"Error fetching JMA {kind} for office {code}: {e}")
+                        continue
+                    
+                    if kind == "overview":
+                        overviews[code] = data.get("text") if isinstance(data, dict) else None
+                        continue
+                    
+                    normalize_started_at = time.perf_counter()
+                    try:
+                        normalized_files[code] = normalize_office_forecast(code, data, timestamps=timestamps)
+                    except Exception as e:
+                        print(f"Error normalizing JMA forecast for office {code}: {e!r}")
+                    normalize_seconds += time.perf_counter() - normalize_started_at
+            except FutureTimeoutError:
+                # 期限までに取得できなかった予報区は欠損とする
+                deadline_exceeded = True
+                unfinished = sorted({code for future, (kind, code) in futures.items() if not future.done()})
+                print(f"Deadline exceeded, giving up on JMA data for offices {', '.join(unfinished)}")
+        finally:
+            # 期限までに終わらなかったリクエストの完了は待たない
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # 同じファイルを共有する予報区は、それぞれ自身の区域だけに絞ってからJSONで返す辞書に変換する
+        offices = {}
+        for office_code in office_codes:
+            file_code = self.area_index.forecast_file_code(office_code)
+            normalized = normalized_files.get(file_code)
+            if normalized is not None:
+                area_codes = self._shared_file_area_codes(office_code, file_code, normalized, office_codes)
+                if area_codes is not None:
+                    normalized = normalized.subset(office_code, area_codes)
+            offices[office_code] = normalized.to_dict() if normalized is not None else None
+        
+        return {
+            "offices": offices,
+            "overviews": overviews,
+            "missing_offices": [office_code for office_code, data in offices.items() if data is None],
+            "deadline_exceeded": deadline_exceeded,
+            "area_count": sum(normalized.area_count() for normalized in normalized_files.values()),
+            "timings": {
+                "normalize": round(normalize_seconds, 3),
+                "total": round(time.monotonic() - started_at, 3)
+            }
+        }
+    
+    def _shared_file_area_codes(self, office_code, file_code, normalized, office_codes):
+        """
+        予報JSONのファイルを別の予報区と共有する場合に、その予報区として返す区域のコードを求める
+        まとめられた予報区（十勝地方・奄美地方）は自身の区域、ファイル本来の予報区はそれ以外の区域とする
+        
+        Args:
+            office_code: 府県予報区コード
+            file_code: 予報JSONのファイル名に使うコード
+            normalized: ファイルの正規化済みの予報
+            office_codes: 全ての府県予報区コード
+            
+        Returns:
+            Optional[set]: 区域のコード（ファイルを共有しない場合はNone）
+        """
+        if file_code != office_code:
+            return self.area_index.forecast_area_codes(office_code)
+        
+        merged = [code for code in office_codes if code != file_code and self.area_index.forecast_file_code(code) == file_code]
+        if not merged:
+            return None
+        excluded = set()
+        for code in merged:
+            excluded |= self.area_index.forecast_area_codes(code)
+        return {code for code in list(normalized.areas) + list(normalized.weekly_areas) if code not in excluded}
+    
+    def _fetch_json(self, url, cache_key=None, deadline=None, source="jma_forecast"):
+        """
+        URLからJSONデータを取得する
+        cache_keyを指定した場合は条件付きGETを行い、304なら保存済みのデータを返す
+        
+        Args:
+            url: 取得するURL
+            cache_key: キャッシュ統計の集計キー（エリアコード）
+            deadline: 処理全体の期限
+            source: サーキットブレーカーの名前（予報は jma_forecast、概況は jma_overview）。
+                    概況の成功で予報の失敗回数が打ち消されないよう、エンドポイントごとに分ける
+            
+        Returns:
+            Any: デコード済みのJSONデータ
+        """
+        if cache_key is None:
+            response = self._http_get(url, source=source, deadline=deadline)
+            self._record_transfer("jma", None, response, len(response.content))
+            response.raise_for_status()
+            return response.json()
+        
+        # 保存済みのETag・Last-Modifiedを送信
+        entry = self.http_cache.get(url)
+        headers = entry.validators() if entry else {}
+        response = self._http_get(url, source=source, deadline=deadline, headers=headers)
+        self._record_transfer("jma", self.area_index.office_regions.get(cache_key, cache_key), response, len(response.content))
+        
+        if response.status_code == 304 and entry is not None:
+            self.http_cache.record(cache_key, hit=True)
+            return entry.body
+        
+        response.raise_for_status()
+        data = response.json()
+        self.http_cache.store(url, data, response.headers)
+        self.http_cache.record(cache_key, hit=False)
+        return data
+    
+    def _http_get(self, url, source=None, deadline=None, **kwargs):
+        """
+        レート制限を適用してGETリクエストを送信する
+        外部へのリクエストは全てこのメソッドを経由する
+        
+        Args:
+            url: 取得するURL
+            source: 情報源の名前（指定した場合はサーキットブレーカーと応答時間の計測を行う）
+            deadline: 処理全体の期限（タイムアウトを残り時間までに短縮する）
+            **kwargs: Session.getに渡す追加引数
+            
+        Returns:
+            requests.Response: レスポンス
+            
+        Raises:
+            DeadlineExceeded: 期限を過ぎている場合
+            CircuitOpenError: 情報源のブレーカーが開いている場合
+        """
+        if deadline is not None and deadline.expired():
+            raise DeadlineExceeded(f"Deadline exceeded before requesting {url}")
+        
+        # 期限の確認はブレーカーの試行枠を取る前に済ませる（期限切れで試行枠を消費しない）
+        kwargs.setdefault("timeout", 10)
+        if deadline is not None:
+            kwargs["timeout"] = deadline.timeout(kwargs["timeout"])
+        
+        breaker = self.circuit_breakers.get(source) if source else None
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(source)
+        
+        try:
+            # ホストごとのトークンバケットで間隔を制御（サーバー負荷軽減）
+            self.rate_limiter.acquire(url, deadline=deadline)
+            if deadline is not None:
+                # 待機した分だけタイムアウトを短縮
+                kwargs["timeout"] = deadline.timeout(kwargs["timeout"])
+        except DeadlineExceeded:
+            if breaker is not None:
+                breaker.release_probe()
+            raise
+        
+        start = time.monotonic()
+        try:
+            response = self.session_pool.get_session(url).get(url, **kwargs)
+        except Exception:
+            if breaker is not None:
+                if deadline is not None and deadline.expired():
+                    # 期限による打ち切りは失敗として数えず、試行枠だけ返す
+                    breaker.release_probe()
+                else:
+                    # タイムアウト・接続エラーは失敗として記録
+                    self.latency_tracker.record(f"source:{source}", time.monotonic() - start)
+                    breaker.record_failure()
+            raise
+        
+        if breaker is not None:
+            self.latency_tracker.record(f"source:{source}", time.monotonic() - start)
+            # 5xx・429（過負荷）に加え、404・403 など（エンドポイントの移動・アクセス拒否）も失敗として数える
+            # （304 は条件付きGETの成功）
+            if response.status_code >= 400:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        
+        return response
+    
+    def _record_transfer(self, source, region_name, response, uncompressed_bytes, **counters):
+        """
+        レスポンスの転送量を記録する
+        圧縮後のバイト数は受信した本文のバイト数、展開後のバイト数は展開した本文のバイト数とする
+        
+        Args:
+            source: 情報源の名前
+            region_name: 地域名（Noneの場合は情報源ごとにのみ集計する）
+            response: 本文を読み込み済みのレスポンス
+            uncompressed_bytes: 展開後の本文のバイト数
+            **counters: 合わせて記録するカウンター
+        """
+        raw = getattr(response, "raw", None)
+        try:
+            compressed_bytes = raw.tell()
+        except (AttributeError, OSError, ValueError):
+            compressed_bytes = uncompressed_bytes
+        
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+        self.fetch_stats.record(
+            source, region_name,
+            responses=1,
+            compressed_bytes=compressed_bytes,
+            uncompressed_bytes=uncompressed_bytes,
+            **{f"encoding_{encoding}": 1},
+            **counters
+        )
+    
+    def _fetch_html(self, url, source, region_name, end_class, deadline=None, **kwargs):
+        """
+        スクレイピング対象のページを取得する
+        本文を少しずつ読み込み、end_classの要素を読み終えた時点でダウンロードを打ち切る
+        文字コードはヘッダーかmetaタグから決め、自動判定を行わずに1回だけデコードする
+        期限を過ぎて途中までしか読み込めなかった場合は、一部だけの表から誤った値を抽出しないよう結果を使わない
+        
+        Args:
+            url: 取得するURL
+            source: 情報源の名前
+            region_name: 地域名（計測用）
+            end_class: 読み終えたら打ち切る要素のクラス名
+            deadline: 処理全体の期限
+            **kwargs: Session.getに渡す追加引数
+            
+        Returns:
+            Optional[str]: デコードしたページの本文（期限で打ち切った場合はNone）
+        """
+        response = self._http_get(url, source=source, deadline=deadline, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+            body, reason = read_html_stream(
+                response,
+                end_class if self.html_early_stop else None,
+                self.html_max_bytes,
+                deadline=deadline
+            )
+        finally:
+            # 打ち切った場合は残りを読まずに接続を閉じる
+            response.close()
+        
+        if reason == STOP_DEADLINE:
+            self._record_transfer(source, region_name, response, len(body), deadline_truncations=1)
+            print(f"Error: {url} was cut off by the deadline after {len(body)} bytes, discarded")
+            return None
+        
+        decode_start = time.perf_counter()
+        text, _ = decode_html(body, response.headers.get("Content-Type"))
+        decode_seconds = time.perf_counter() - decode_start
+        
+        self._record_transfer(
+            source, region_name, response, len(body),
+            early_stops=1 if reason == STOP_TARGET else 0,
+            max_bytes_hits=1 if reason == STOP_MAX_BYTES else 0,
+            decode_seconds=decode_seconds
+        )
+        if reason == STOP_MAX_BYTES:
+            print(f"Error: {url} exceeded {self.html_max_bytes} bytes, truncated")
+        return text
+    
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """
+        レート制限による待機時間の統計を取得する
+        
+        Returns:
+            Dict[str, Any]: ホストごとの待機時間の統計
+        """
+        return self.rate_limiter.get_stats()
+    
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        接続プールの再利用状況を取得する
+        
+        Returns:
+            Dict[str, Any]: ホストごとの新規接続数・再利用数
+        """
+        return self.session_pool.get_stats()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        条件付きGETキャッシュのヒット・ミス数を取得する
+        
+        Returns:
+            Dict[str, Any]: エリアコードごとのヒット・ミス数
+        """
+        return self.http_cache.get_stats()
+    
+    def get_fetch_stats(self) -> Dict[str, Any]:
+        """
+        情報源・地域ごとの読み込みバイト数やダウンロードの打ち切り回数を取得する
+        
+        Returns:
+            Dict[str, Any]: 情報源ごと・地域ごとのカウンター
+        """
+        return self.fetch_stats.get_stats()
+    
+    def get_source_health(self) -> Dict[str, Any]:
+        """
+        情報源ごとの健全性（成功率・応答時間・ブレーカーの状態）を取得する
+        
+        Returns:
+            Dict[str, Any]: 情報源ごとの健全性の統計
+        """
+        return self.circuit_breakers.get_stats()
+    
+    def get_weathermap_data(self, regions=None, deadline=None) -> Dict[str, Any]:
         """
         ウェザーマップから全国の天気予報データを取得する
         
+        Args:
+            regions: 取得する地域名のリスト（Noneの場合は全地域）
+            deadline: 処理全体の期限（期限を過ぎた地域はNoneとする）
+        
         Returns:
             Dict[str, Any]: 全国の天気予報データ
         """
         all_weather_data = {}
         
+        # ブレーカーが開いている場合はリクエストを送らずに全地域を欠損とする
+        if self.circuit_breakers.get("weathermap").is_open():
+            print("Weathermap circuit breaker is open, skipping...")
+            return {region_name: None for region_name in self.weathermap_area_names
+                    if regions is None or region_name in regions}
+        
         headers = {
             "User-Agent": self.user_agent
         }
         
         for region_name, area_name in self.weathermap_area_names.items():
+            if regions is not None and region_name not in regions:
+                continue
+            
+            if deadline is not None and deadline.expired():
+                all_weather_data[region_name] = None
+                continue
+            
             try:
                 url = self.weathermap_url.format(area_name=area_name)
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                
-                # BeautifulSoupでHTMLを解析
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                # 今日の天気
-                today_weather = None
-                today_element = soup.select_one(".today-weather")
-                if today_element:
-                    today_weather = today_element.text.strip()
+                html = self._fetch_html(url, "weathermap", region_name, WEATHERMAP_END_CLASS,
+                                        deadline=deadline, headers=headers)
                 
-                # 明日の天気
-                tomorrow_weather = None
-                tomorrow_element = soup.select_one(".tomorrow-weather")
-                if tomorrow_element:
-                    tomorrow_weather = tomorrow_element.text.strip()
-                
-                # 気温データ
-                temps = {}
-                temp_elements = soup.select(".temperature")
-                if temp_elements and len(temp_elements) >= 2:
-                    today_temp = temp_elements[0].text.strip()
-                    tomorrow_temp = temp_elements[1].text.strip()
-                    
-                    # 気温から最高・最低を抽出
-                    today_match = re.search(r"(\d+)[^\d]+(\d+)", today_temp)
-                    if today_match:
-                        temps["today_max"] = today_match.group(1)
-                        temps["today_min"] = today_match.group(2)
-                    
-                    tomorrow_match = re.search(r"(\d+)[^\d]+(\d+)", tomorrow_temp)
-                    if tomorrow_match:
-                        temps["tomorrow_max"] = tomorrow_match.group(1)
-                        temps["tomorrow_min"] = tomorrow_match.group(2)
-                
-                # 週間天気
-                weekly = {}
-                weekly_elements = soup.select(".weekly-forecast .day")
-                for i, element in enumerate(weekly_elements):
-                    if i < 7:  # 7日分まで取得
-                        date_elem = element.select_one(".date")
-                        weather_elem = element.select_one(".weather")
-                        temp_elem = element.select_one(".temp")
-                        
-                        if date_elem and weather_elem and temp_elem:
-                            date = date_elem.text.strip()
-                            weather = weather_elem.text.strip()
-                            temp = temp_elem.text.strip()
-                            
-                            # 気温から最高・最低を抽出
-                            temp_match = re.search(r"(\d+)[^\d]+(\d+)", temp)
-                            if temp_match:
-                                max_temp = temp_match.group(1)
-                                min_temp = temp_match.group(2)
-                            else:
-                                max_temp = None
-                                min_temp = None
-                            
-                            weekly[date] = {
-                                "weather": weather,
-                                "max_temp": max_temp,
-                                "min_temp": min_temp
-                            }
-                
-                all_weather_data[region_name] = {
-                    "today_weather": today_weather,
-                    "tomorrow_weather": tomorrow_weather,
-                    "temperatures": temps,
-                    "weekly": weekly
-                }
-                
-                # APIリクエスト間隔を空ける（サーバー負荷軽減）
-                time.sleep(0.5)
+                # 必要な要素だけを解析して抽出（期限で途中までしか読めなかった場合は使わない）
+                all_weather_data[region_name] = parse_weathermap_html(html) if html is not None else None
                 
             except Exception as e:
                 print(f"Error fetching Weathermap data for {region_name}: {e}")
@@ -329,96 +947,48 @@ class WeatherDataCollector:
                 
         return all_weather_data
     
-    def get_yahoo_weather_data(self) -> Dict[str, Any]:
+    def get_yahoo_weather_data(self, regions=None, deadline=None) -> Dict[str, Any]:
         """
         Yahoo!天気から全国の天気予報データを取得する
         
+        Args:
+            regions: 取得する地域名のリスト（Noneの場合は全地域）
+            deadline: 処理全体の期限（期限を過ぎた地域はNoneとする）
+        
         Returns:
             Dict[str, Any]: 全国の天気予報データ
         """
         all_weather_data = {}
         
+        # ブレーカーが開いている場合はリクエストを送らずに全地域を欠損とする
+        if self.circuit_breakers.get("yahoo").is_open():
+            print("Yahoo Weather circuit breaker is open, skipping...")
+            return {region_name: None for region_name in self.yahoo_weather_ids
+                    if regions is None or region_name in regions}
+        
         headers = {
             "User-Agent": self.user_agent
         }
         
         for region_name, ids in self.yahoo_weather_ids.items():
+            if regions is not None and region_name not in regions:
+                continue
+            
+            if deadline is not None and deadline.expired():
+                all_weather_data[region_name] = None
+                continue
+            
             try:
                 url = self.yahoo_weather_url.format(
                     region_id=ids["region_id"],
                     prefecture_id=ids["prefecture_id"],
                     city_id=ids["city_id"]
                 )
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                
-                # BeautifulSoupでHTMLを解析
-                soup = BeautifulSoup(response.text, "html.parser")
-                
-                # 今日の天気
-                today_weather = None
-                today_element = soup.select_one(".forecastCity > table td.pict")
-                if today_element:
-                    img = today_element.select_one("img")
-                    if img and img.get("alt"):
-                        today_weather = img.get("alt")
-                
-                # 明日の天気
-                tomorrow_weather = None
-                tomorrow_element = soup.select_one(".forecastCity > table td.pict + td.pict")
-                if tomorrow_element:
-                    img = tomorrow_element.select_one("img")
-                    if img and img.get("alt"):
-                        tomorrow_weather = img.get("alt")
+                html = self._fetch_html(url, "yahoo", region_name, YAHOO_END_CLASS,
+                                        deadline=deadline, headers=headers)
                 
-                # 気温データ
-                temps = {}
-                high_elements = soup.select(".forecastCity > table td.temp .high em")
-                low_elements = soup.select(".forecastCity > table td.temp .low em")
-                
-                if high_elements and len(high_elements) >= 2:
-                    temps["today_max"] = high_elements[0].text.strip()
-                    temps["tomorrow_max"] = high_elements[1].text.strip()
-                
-                if low_elements and len(low_elements) >= 2:
-                    temps["today_min"] = low_elements[0].text.strip()
-                    temps["tomorrow_min"] = low_elements[1].text.strip()
-                
-                # 週間天気
-                weekly = {}
-                weekly_elements = soup.select(".forecastTable table tr")
-                for element in weekly_elements[1:8]:  # ヘッダー行を除いて7日分
-                    cells = element.select("td")
-                    if len(cells) >= 5:
-                        date_elem = cells[0]
-                        weather_elem = cells[1]
-                        high_elem = cells[3].select_one(".high em")
-                        low_elem = cells[3].select_one(".low em")
-                        
-                        if date_elem and weather_elem:
-                            date = date_elem.text.strip()
-                            
-                            img = weather_elem.select_one("img")
-                            weather = img.get("alt") if img and img.get("alt") else None
-                            
-                            max_temp = high_elem.text.strip() if high_elem else None
-                            min_temp = low_elem.text.strip() if low_elem else None
-                            
-                            weekly[date] = {
-                                "weather": weather,
-                                "max_temp": max_temp,
-                                "min_temp": min_temp
-                            }
-                
-                all_weather_data[region_name] = {
-                    "today_weather": today_weather,
-                    "tomorrow_weather": tomorrow_weather,
-                    "temperatures": temps,
-                    "weekly": weekly
-                }
-                
-                # APIリクエスト間隔を空ける（サーバー負荷軽減）
-                time.sleep(0.5)
+                # 必要な要素だけを解析して抽出（期限で途中までしか読めなかった場合は使わない）
+                all_weather_data[region_name] = parse_yahoo_html(html) if html is not None else None
                 
             except Exception as e:
                 print(f"Error fetching Yahoo Weather data for {region_name}: {e}")
@@ -426,17 +996,43 @@ class WeatherDataCollector:
                 
         return all_weather_data
     
+    def normalize_jma_data(self, jma_data) -> Dict[str, Any]:
+        """
+        地域ごとの気象庁データを正規化する（正規化済みのデータはそのまま使う）
+        時刻の解析結果は全地域で共有し、同じ発表時刻は1回だけ解析する
+        想定外の形式のデータはその地域だけ取得できなかったものとして扱う
+        
+        Args:
+            jma_data: 気象庁の天気予報データ（地域名をキーとした取得結果）
+            
+        Returns:
+            Dict[str, Any]: 地域名をキーとしたOfficeForecast（取得・正規化できなかった地域はNone）
+        """
+        if not jma_data:
+            return {}
+        timestamps = TimestampCache()
+        normalized = {}
+        for region_name, data in jma_data.items():
+            try:
+                normalized[region_name] = normalize_region_data(
+                    self.area_codes.get(region_name, region_name), data, timestamps
+                )
+            except Exception as e:
+                print(f"Error normalizing JMA data for {region_name}: {e!r}")
+                normalized[region_name] = None
+        return normalized
+    
     def extract_national_weather_overview(self, jma_data, weathermap_data=None, yahoo_data=None) -> Dict[str, Any]:
         """
         全国の天気概況を抽出する
         
         Args:
-            jma_data: 気象庁の天気予報データ
+            jma_data: 気象庁の天気予報データ（取得結果または正規化済みのデータ）
             weathermap_data: ウェザーマップの天気予報データ（オプション）
             yahoo_data: Yahoo!天気の天気予報データ（オプション）
             
         Returns:
-            Dict[str, Any]: 全国の天気概況
+            Dict[str, Any]: 全国の天気概況（today / tomorrow は地域名→RegionWeather、week は地域名→天気コードのタプル）
         """
         overview = {
             "today": {},
@@ -444,50 +1040,27 @@ class WeatherDataCollector:
             "week": {}
         }
         
-        # 気象庁データから抽出
-        if jma_data:
-            for region_name, data in jma_data.items():
-                if data is None:
-                    continue
-                    
-                try:
-                    forecast_data = data.get("forecast", [])
-                    if not forecast_data:
-                        continue
-                    
-                    # 今日の天気
-                    today_weather = forecast_data[0]["timeSeries"][0]["areas"][0]["weathers"][0]
-                    today_weather_code = forecast_data[0]["timeSeries"][0]["areas"][0]["weatherCodes"][0]
-                    
-                    # 明日の天気
-                    tomorrow_weather = forecast_data[0]["timeSeries"][0]["areas"][0]["weathers"][1]
-                    tomorrow_weather_code = forecast_data[0]["timeSeries"][0]["areas"][0]["weatherCodes"][1]
-                    
-                    # 週間天気（週間予報の最初の3日間）
-                    week_weathers = []
-                    week_weather_codes = []
-                    if len(forecast_data) > 1 and "timeSeries" in forecast_data[1]:
-                        for i in range(min(3, len(forecast_data[1]["timeSeries"][0]["areas"][0]["weatherCodes"]))):
-                            if i > 0:  # 最初の日は今日/明日と重複するので除外
-                                code = forecast_data[1]["timeSeries"][0]["areas"][0]["weatherCodes"][i]
-                                week_weather_codes.append(code)
-                    
-                    overview["today"][region_name] = {
-                        "weather": today_weather,
-                        "code": today_weather_code
-                    }
-                    
-                    overview["tomorrow"][region_name] = {
-                        "weather": tomorrow_weather,
-                        "code": tomorrow_weather_code
-                    }
-                    
-                    overview["week"][region_name] = {
-                        "codes": week_weather_codes
-                    }
-                    
-                except (KeyError, IndexError) as e:
-                    print(f"Error extracting JMA data for {region_name}: {e}")
+        # 気象庁データから抽出（正規化済みの代表区域を使う）
+        for region_name, forecast in self.normalize_jma_data(jma_data).items():
+            area = forecast.primary_area if forecast is not None else None
+            if area is None:
+                continue
+            
+            try:
+                # 今日・明日の天気
+                today_weather, tomorrow_weather = area.weathers[0], area.weathers[1]
+                today_weather_code, tomorrow_weather_code = area.weather_codes[0], area.weather_codes[1]
+                
+                # 週間天気（週間予報の2・3日目。最初の日は今日/明日と重複するので除外）
+                weekly_area = forecast.primary_weekly_area
+                week_weather_codes = tuple(weekly_area.weather_codes[1:3]) if weekly_area is not None else ()
+                
+                overview["today"][region_name] = RegionWeather(today_weather, today_weather_code)
+                overview["tomorrow"][region_name] = RegionWeather(tomorrow_weather, tomorrow_weather_code)
+                overview["week"][region_name] = week_weather_codes
+                
+            except IndexError as e:
+                print(f"Error extracting JMA data for {region_name}: {e}")
         
         # ウェザーマップデータで補完
         if weathermap_data:
@@ -500,16 +1073,10 @@ class WeatherDataCollector:
                     tomorrow_weather = data.get("tomorrow_weather")
                     
                     if today_weather:
-                        overview["today"][region_name] = {
-                            "weather": today_weather,
-                            "code": self._weather_text_to_code(today_weather)
-                        }
+                        overview["today"][region_name] = RegionWeather(today_weather, self._weather_text_to_code(today_weather))
                     
                     if tomorrow_weather:
-                        overview["tomorrow"][region_name] = {
-                            "weather": tomorrow_weather,
-                            "code": self._weather_text_to_code(tomorrow_weather)
-                        }
+                        overview["tomorrow"][region_name] = RegionWeather(tomorrow_weather, self._weather_text_to_code(tomorrow_weather))
                     
                 except Exception as e:
                     print(f"Error extracting Weathermap data for {region_name}: {e}")
@@ -525,16 +1092,10 @@ class WeatherDataCollector:
                     tomorrow_weather = data.get("tomorrow_weather")
                     
                     if today_weather and region_name not in overview["today"]:
-                        overview["today"][region_name] = {
-                            "weather": today_weather,
-                            "code": self._weather_text_to_code(today_weather)
-                        }
+                        overview["today"][region_name] = RegionWeather(today_weather, self._weather_text_to_code(today_weather))
                     
                     if tomorrow_weather and region_name not in overview["tomorrow"]:
-                        overview["tomorrow"][region_name] = {
-                            "weather": tomorrow_weather,
-                            "code": self._weather_text_to_code(tomorrow_weather)
-                        }
+                        overview["tomorrow"][region_name] = RegionWeather(tomorrow_weather, self._weather_text_to_code(tomorrow_weather))
                     
                 except Exception as e:
                     print(f"Error extracting Yahoo Weather data for {region_name}: {e}")
@@ -546,56 +1107,40 @@ class WeatherDataCollector:
         全国の気温情報を抽出する
         
         Args:
-            jma_data: 気象庁の天気予報データ
+            jma_data: 気象庁の天気予報データ（取得結果または正規化済みのデータ）
             weathermap_data: ウェザーマップの天気予報データ（オプション）
             yahoo_data: Yahoo!天気の天気予報データ（オプション）
             
         Returns:
-            Dict[str, Any]: 全国の気温情報
+            Dict[str, Any]: 全国の気温情報（today / tomorrow の地域名→RegionTemperature）
         """
         temperature = {
             "today": {},
             "tomorrow": {}
         }
         
-        # 気象庁データから抽出
-        if jma_data:
-            for region_name, data in jma_data.items():
-                if data is None:
-                    continue
-                    
-                try:
-                    forecast_data = data.get("forecast", [])
-                    if not forecast_data:
-                        continue
-                    
-                    # 気温データがある場合のみ処理
-                    if len(forecast_data[0]["timeSeries"]) > 2:
-                        # 代表都市の気温を取得
-                        city_temps = forecast_data[0]["timeSeries"][2]["areas"][0]["temps"]
-                        
-                        # 今日の最高気温
-                        today_max = city_temps[0] if len(city_temps) > 0 else None
-                        
-                        # 明日の最高気温と最低気温
-                        tomorrow_min = None
-                        tomorrow_max = None
-                        
-                        if len(city_temps) > 2:
-                            tomorrow_min = city_temps[2]
-                            tomorrow_max = city_temps[3] if len(city_temps) > 3 else None
-                        
-                        temperature["today"][region_name] = {
-                            "max": today_max
-                        }
-                        
-                        temperature["tomorrow"][region_name] = {
-                            "min": tomorrow_min,
-                            "max": tomorrow_max
-                        }
-                
-                except (KeyError, IndexError) as e:
-                    print(f"Error extracting JMA temperature for {region_name}: {e}")
+        # 気象庁データから抽出（正規化済みの代表地点を使う）
+        for region_name, forecast in self.normalize_jma_data(jma_data).items():
+            # 気温データがある場合のみ処理
+            city = forecast.primary_city if forecast is not None else None
+            if city is None:
+                continue
+            
+            city_temps = city.temps
+            
+            # 今日の最高気温
+            today_max = city_temps[0] if len(city_temps) > 0 else None
+            
+            # 明日の最高気温と最低気温
+            tomorrow_min = None
+            tomorrow_max = None
+            
+            if len(city_temps) > 2:
+                tomorrow_min = city_temps[2]
+                tomorrow_max = city_temps[3] if len(city_temps) > 3 else None
+            
+            temperature["today"][region_name] = RegionTemperature(max_temp=today_max)
+            temperature["tomorrow"][region_name] = RegionTemperature(tomorrow_min, tomorrow_max)
         
         # ウェザーマップデータで補完
         if weathermap_data:
@@ -608,16 +1153,11 @@ class WeatherDataCollector:
                     
                     # 今日の気温がない場合のみ補完
                     if region_name not in temperature["today"] and "today_max" in temps:
-                        temperature["today"][region_name] = {
-                            "max": temps["today_max"]
-                        }
+                        temperature["today"][region_name] = RegionTemperature(max_temp=temps["today_max"])
                     
                     # 明日の気温がない場合のみ補完
                     if region_name not in temperature["tomorrow"] and "tomorrow_max" in temps:
-                        temperature["tomorrow"][region_name] = {
-                            "min": temps.get("tomorrow_min"),
-                            "max": temps.get("tomorrow_max")
-                        }
+                        temperature["tomorrow"][region_name] = RegionTemperature(temps.get("tomorrow_min"), temps.get("tomorrow_max"))
                     
                 except Exception as e:
                     print(f"Error extracting Weathermap temperature for {region_name}: {e}")
@@ -633,16 +1173,11 @@ class WeatherDataCollector:
                     
                     # 今日の気温がない場合のみ補完
                     if region_name not in temperature["today"] and "today_max" in temps:
-                        temperature["today"][region_name] = {
-                            "max": temps["today_max"]
-                        }
+                        temperature["today"][region_name] = RegionTemperature(max_temp=temps["today_max"])
                     
                     # 明日の気温がない場合のみ補完
                     if region_name not in temperature["tomorrow"] and "tomorrow_max" in temps:
-                        temperature["tomorrow"][region_name] = {
-                            "min": temps.get("tomorrow_min"),
-                            "max": temps.get("tomorrow_max")
-                        }
+                        temperature["tomorrow"][region_name] = RegionTemperature(temps.get("tomorrow_min"), temps.get("tomorrow_max"))
                     
                 except Exception as e:
                     print(f"Error extracting Yahoo Weather temperature for {region_name}: {e}")
@@ -654,54 +1189,51 @@ class WeatherDataCollector:
         週間天気予報を抽出する
         
         Args:
-            jma_data: 気象庁の天気予報データ
+            jma_data: 気象庁の天気予報データ（取得結果または正規化済みのデータ）
             weathermap_data: ウェザーマップの天気予報データ（オプション）
             yahoo_data: Yahoo!天気の天気予報データ（オプション）
             
         Returns:
-            Dict[str, Any]: 週間天気予報
+            Dict[str, Any]: 週間天気予報（日付→WeeklyDay）
         """
         weekly = {}
         
         # 気象庁データから抽出（東京を代表として使用）
-        if jma_data and "関東甲信" in jma_data and jma_data["関東甲信"] is not None:
-            data = jma_data["関東甲信"]
+        forecast = self.normalize_jma_data(jma_data).get("関東甲信")
+        weekly_area = forecast.primary_weekly_area if forecast is not None else None
+        if weekly_area is not None:
+            # 週間天気予報の日付、天気、降水確率、最高/最低気温を抽出
+            time_defines = weekly_area.dates
+            weather_codes = weekly_area.weather_codes
+            pops = weekly_area.pops
             
-            try:
-                forecast_data = data.get("forecast", [])
-                if len(forecast_data) > 1:
-                    # 週間天気予報の日付、天気、降水確率、最高/最低気温を抽出
-                    time_defines = forecast_data[1]["timeSeries"][0]["timeDefines"]
-                    weather_codes = forecast_data[1]["timeSeries"][0]["areas"][0]["weatherCodes"]
-                    pops = forecast_data[1]["timeSeries"][0]["areas"][0]["pops"]
-                    
-                    # 気温データ
-                    if len(forecast_data[1]["timeSeries"]) > 1:
-                        temps_min = forecast_data[1]["timeSeries"][1]["areas"][0]["tempsMin"]
-                        temps_max = forecast_data[1]["timeSeries"][1]["areas"][0]["tempsMax"]
-                    else:
-                        temps_min = [None] * len(time_defines)
-                        temps_max = [None] * len(time_defines)
-                    
-                    # 日付ごとにデータを整理
-                    for i in range(len(time_defines)):
-                        if i == 0:  # 最初の日は今日/明日と重複するので除外
-                            continue
-                            
-                        date_str = time_defines[i]
-                        date_obj = datetime.datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                        date_formatted = date_obj.strftime("%m/%d")
-                        
-                        weekly[date_formatted] = {
-                            "weather_code": weather_codes[i] if i < len(weather_codes) else None,
-                            "weather": self._code_to_weather_text(weather_codes[i]) if i < len(weather_codes) else None,
-                            "pop": pops[i] if i < len(pops) else None,
-                            "temp_min": temps_min[i] if i < len(temps_min) else None,
-                            "temp_max": temps_max[i] if i < len(temps_max) else None
-                        }
+            # 気温データ
+            weekly_city = forecast.primary_weekly_city
+            if weekly_city is not None:
+                temps_min = weekly_city.temps_min
+                temps_max = weekly_city.temps_max
+            else:
+                temps_min = [None] * len(time_defines)
+                temps_max = [None] * len(time_defines)
             
-            except (KeyError, IndexError) as e:
-                print(f"Error extracting JMA weekly forecast: {e}")
+            # 日付ごとにデータを整理（日付・曜日の表示は正規化時に求めたものを使う）
+            for i in range(len(time_defines)):
+                if i == 0:  # 最初の日は今日/明日と重複するので除外
+                    continue
+                
+                time_define = time_defines[i]
+                if time_define.label is None:
+                    print(f"Error extracting JMA weekly forecast: invalid time define {time_define.text!r}")
+                    break
+                
+                weekly[time_define.label] = WeeklyDay(
+                    weather_codes[i] if i < len(weather_codes) else None,
+                    self._code_to_weather_text(weather_codes[i]) if i < len(weather_codes) else None,
+                    pop=pops[i] if i < len(pops) else None,
+                    temp_min=temps_min[i] if i < len(temps_min) else None,
+                    temp_max=temps_max[i] if i < len(temps_max) else None,
+                    weekday=time_define.weekday
+                )
         
         # ウェザーマップデータで補完
         if not weekly and weathermap_data and "関東甲信" in weathermap_data and weathermap_data["関東甲信"] is not None:
@@ -718,13 +1250,13 @@ class WeatherDataCollector:
                         day = date_match.group(2)
                         date_formatted = f"{month}/{day}"
                         
-                        weekly[date_formatted] = {
-                            "weather": day_data.get("weather"),
-                            "weather_code": self._weather_text_to_code(day_data.get("weather")),
-                            "temp_min": day_data.get("min_temp"),
-                            "temp_max": day_data.get("max_temp"),
-                            "pop": None  # 降水確率はウェザーマップでは取得できない
-                        }
+                        # 降水確率はウェザーマップでは取得できない
+                        weekly[date_formatted] = WeeklyDay(
+                            self._weather_text_to_code(day_data.get("weather")),
+                            day_data.get("weather"),
+                            temp_min=day_data.get("min_temp"),
+                            temp_max=day_data.get("max_temp")
+                        )
             
             except Exception as e:
                 print(f"Error extracting Weathermap weekly forecast: {e}")
@@ -744,25 +1276,26 @@ class WeatherDataCollector:
                         day = date_match.group(2)
                         date_formatted = f"{month}/{day}"
                         
-                        weekly[date_formatted] = {
-                            "weather": day_data.get("weather"),
-                            "weather_code": self._weather_text_to_code(day_data.get("weather")),
-                            "temp_min": day_data.get("min_temp"),
-                            "temp_max": day_data.get("max_temp"),
-                            "pop": None  # 降水確率はYahoo!天気でも取得が難しい
-                        }
+                        # 降水確率はYahoo!天気でも取得が難しい
+                        weekly[date_formatted] = WeeklyDay(
+                            self._weather_text_to_code(day_data.get("weather")),
+                            day_data.get("weather"),
+                            temp_min=day_data.get("min_temp"),
+                            temp_max=day_data.get("max_temp")
+                        )
             
             except Exception as e:
                 print(f"Error extracting Yahoo Weather weekly forecast: {e}")
         
         return weekly
     
-    def get_weather_warnings(self, jma_data) -> List[str]:
+    def get_weather_warnings(self, jma_data, codes_only=False) -> List[str]:
         """
         注意報・警報情報を抽出する
         
         Args:
-            jma_data: 気象庁の天気予報データ
+            jma_data: 気象庁の天気予報データ（取得結果または正規化済みのデータ）
+            codes_only: Trueの場合は概況テキストを使わず、予報の天気・天気コードのみから推測する
             
         Returns:
             List[str]: 注意報・警報情報のリスト
@@ -770,17 +1303,16 @@ class WeatherDataCollector:
         warnings = []
         
         # 各地方の概況から警報・注意報情報を抽出
-        for region_name, data in jma_data.items():
-            if data is None:
+        for region_name, forecast in self.normalize_jma_data(jma_data).items():
+            if forecast is None:
                 continue
                 
             try:
-                overview_data = data.get("overview", {})
-                if not overview_data:
+                if forecast.overview_text is None and not codes_only:
                     continue
                 
                 # 概況テキストから警報・注意報を抽出
-                text = overview_data.get("text", "")
+                text = "" if codes_only else forecast.overview_text
                 
                 # 警報・注意報のキーワードを検索
                 keywords = ["警報", "注意報", "特別警報", "警戒", "注意"]
@@ -795,33 +1327,47 @@ class WeatherDataCollector:
                                     warnings.append(warning)
                 
                 # 天気予報データからも警報情報を推測
-                forecast_data = data.get("forecast", [])
-                if forecast_data:
-                    try:
-                        today_weather = forecast_data[0]["timeSeries"][0]["areas"][0]["weathers"][0]
-                        today_weather_code = forecast_data[0]["timeSeries"][0]["areas"][0]["weatherCodes"][0]
-                        
-                        # 大雨・雷・強風などのキーワードがあれば警報として扱う
-                        alert_keywords = ["大雨", "暴風", "雷", "激しく", "非常に激しく"]
-                        for keyword in alert_keywords:
-                            if keyword in today_weather:
-                                warning = f"{region_name}地方では{keyword}に注意"
-                                if warning not in warnings:
-                                    warnings.append(warning)
-                        
-                        # 天気コードから警報情報を推測
-                        warning_codes = ["203", "204", "205", "206", "207", "208", "209", "300", "301", "302", "303", "304", "306", "308", "309", "350"]
-                        if today_weather_code in warning_codes:
-                            if not any(region_name in w for w in warnings):
-                                warnings.append(f"{region_name}地方では天候の急変に注意")
-                    except (KeyError, IndexError):
-                        pass
+                area = forecast.primary_area
+                if area is not None and area.weathers and area.weather_codes:
+                    today_weather = area.weathers[0]
+                    today_weather_code = area.weather_codes[0]
+                    
+                    # 大雨・雷・強風などのキーワードがあれば警報として扱う
+                    alert_keywords = ["大雨", "暴風", "雷", "激しく", "非常に激しく"]
+                    for keyword in alert_keywords:
+                        if keyword in today_weather:
+                            warning = f"{region_name}地方では{keyword}に注意"
+                            if warning not in warnings:
+                                warnings.append(warning)
+                    
+                    # 天気コードから警報情報を推測
+                    warning_codes = ["203", "204", "205", "206", "207", "208", "209", "300", "301", "302", "303", "304", "306", "308", "309", "350"]
+                    if today_weather_code in warning_codes:
+                        if not any(region_name in w for w in warnings):
+                            warnings.append(f"{region_name}地方では天候の急変に注意")
             
             except Exception as e:
                 print(f"Error extracting warnings for {region_name}: {e}")
         
         return warnings
     
+    def _find_missing_regions(self, source_data, regions=None) -> List[str]:
+        """
+        データが取得できなかった地域を求める
+        
+        Args:
+            source_data: 地域名をキーとした取得結果（Noneの場合は全地域が欠損）
+            regions: 確認する地域名のリスト（Noneの場合は全地域）
+            
+        Returns:
+            List[str]: データが欠けている地域名のリスト
+        """
+        if regions is None:
+            regions = list(self.area_codes.keys())
+        if not source_data:
+            return list(regions)
+        return [region_name for region_name in regions if source_data.get(region_name) is None]
+    
     def _weather_text_to_code(self, weather_text):
         """
         天気テキストから気象庁の天気コードを推測する
@@ -835,10 +1381,10 @@ class WeatherDataCollector:
         if not weather_text:
             return "200"  # デフォルトは曇り
         
-        # 天気コードと天気のマッピングを逆引き
-        for code, text in self.weather_code_mapping.items():
-            if text in weather_text:
-                return code
+        # 天気コードと天気のマッピングを逆引き（含まれる最も長い天気テキストのコード）
+        code = self.weather_text_resolver.resolve(weather_text)
+        if code is not None:
+            return code
         
         # キーワードベースでコードを推測
         if "晴" in weather_text and "曇" in weather_text:
@@ -870,64 +1416,128 @@ class WeatherDataCollector:
             return self.weather_code_mapping[weather_code]
         return "不明"
     
-    def get_complete_weather_data(self) -> Dict[str, Any]:
+    def get_complete_weather_data(self, deadline=None, mode=MODE_FULL) -> WeatherSnapshot:
         """
         天気予報原稿作成に必要な全データを取得する
         複数の情報源からデータを取得し、統合する
         
+        Args:
+            deadline: 処理全体の期限（期限を過ぎた場合は取得済みの地域のみで統合する）
+            mode: MODE_FASTの場合は気象庁の予報データのみを取得し、
+                  概況・ウェザーマップ・Yahoo!天気を使わずに天気コードから注意報を推測する
+        
         Returns:
-            Dict[str, Any]: 天気予報原稿作成に必要な全データ
+            WeatherSnapshot: 天気予報原稿作成に必要な全データ（JSONにする場合は to_dict() を使う）
         """
-        # 気象庁APIからデータ取得
-        jma_data = self.get_jma_weather_data()
+        # 段階ごとの処理時間（秒）
+        timings = {}
+        started_at = time.monotonic()
+        
+        # この取得での転送量（同時に実行中の取得があればその分も含まれる）
+        transfer_before = self.fetch_stats.get_totals("compressed_bytes", "uncompressed_bytes")
+        stage_started_at = started_at
+        normalized_jma = None
         
-        # ウェザーマップからデータ取得（気象庁データが不完全な場合のバックアップ）
-        weathermap_data = None
-        if not jma_data or any(data is None for region, data in jma_data.items()):
-            print("JMA data incomplete, fetching from Weathermap...")
-            weathermap_data = self.get_weathermap_data()
+        if mode == MODE_FAST:
+            # 気象庁の予報データのみ取得
+            jma_data = self.get_jma_weather_data(deadline=deadline, include_overview=False)
+            weathermap_data = None
+            yahoo_data = None
+            timings["jma"] = time.monotonic() - stage_started_at
+        elif self.hedge:
+            # 気象庁APIとフォールバック元をヘッジして取得
+            jma_data, weathermap_data, yahoo_data = self.get_hedged_weather_data(deadline)
+            timings["hedged_fetch"] = time.monotonic() - stage_started_at
+        else:
+            # 気象庁APIからデータ取得
+            jma_data = self.get_jma_weather_data(deadline=deadline)
+            timings["jma"] = time.monotonic() - stage_started_at
+            
+            # 正規化できなかった地域も欠けた地域として扱うため、先に正規化しておく
+            stage_started_at = time.monotonic()
+            normalized_jma = self.normalize_jma_data(jma_data)
+            timings["normalize"] = time.monotonic() - stage_started_at
+            
+            # ウェザーマップからデータ取得（気象庁データが欠けた地域のみバックアップとして取得）
+            missing_regions = self._find_missing_regions(normalized_jma)
+            weathermap_data = None
+            if missing_regions and not (deadline is not None and deadline.expired()):
+                print(f"JMA data incomplete for {', '.join(missing_regions)}, fetching from Weathermap...")
+                stage_started_at = time.monotonic()
+                weathermap_data = self.get_weathermap_data(missing_regions, deadline)
+                missing_regions = self._find_missing_regions(weathermap_data, missing_regions)
+                timings["weathermap"] = time.monotonic() - stage_started_at
+            
+            # Yahoo!天気からデータ取得（気象庁・ウェザーマップの両方で欠けた地域のみ取得）
+            yahoo_data = None
+            if missing_regions and not (deadline is not None and deadline.expired()):
+                print(f"JMA and Weathermap data incomplete for {', '.join(missing_regions)}, fetching from Yahoo Weather...")
+                stage_started_at = time.monotonic()
+                yahoo_data = self.get_yahoo_weather_data(missing_regions, deadline)
+                timings["yahoo"] = time.monotonic() - stage_started_at
         
-        # Yahoo!天気からデータ取得（気象庁・ウェザーマップデータが不完全な場合のバックアップ）
-        yahoo_data = None
-        if (not jma_data or any(data is None for region, data in jma_data.items())) and \
-           (not weathermap_data or any(data is None for region, data in weathermap_data.items())):
-            print("JMA and Weathermap data incomplete, fetching from Yahoo Weather...")
-            yahoo_data = self.get_yahoo_weather_data()
+        # 気象庁データを1回だけ走査して正規化し、以降の抽出は全てこれを使う
+        if normalized_jma is None:
+            stage_started_at = time.monotonic()
+            normalized_jma = self.normalize_jma_data(jma_data)
+            timings["normalize"] = time.monotonic() - stage_started_at
+        stage_started_at = time.monotonic()
         
         # 全国の天気概況を抽出
-        overview = self.extract_national_weather_overview(jma_data, weathermap_data, yahoo_data)
+        overview = self.extract_national_weather_overview(normalized_jma, weathermap_data, yahoo_data)
         
         # 全国の気温情報を抽出
-        temperature = self.extract_national_temperature(jma_data, weathermap_data, yahoo_data)
+        temperature = self.extract_national_temperature(normalized_jma, weathermap_data, yahoo_data)
         
         # 週間天気予報を抽出
-        weekly = self.extract_weekly_forecast(jma_data, weathermap_data, yahoo_data)
+        weekly = self.extract_weekly_forecast(normalized_jma, weathermap_data, yahoo_data)
         
         # 注意報・警報情報を抽出
-        warnings = self.get_weather_warnings(jma_data)
+        warnings = self.get_weather_warnings(normalized_jma, codes_only=(mode == MODE_FAST))
+        
+        timings["extract"] = time.monotonic() - stage_started_at
+        timings["total"] = time.monotonic() - started_at
+        
+        transfer_after = self.fetch_stats.get_totals("compressed_bytes", "uncompressed_bytes")
+        transfer = {name: transfer_after[name] - transfer_before[name] for name in transfer_after}
+        
+        # どの情報源からも天気を取得できなかった地域
+        missing_regions = [region_name for region_name in self.area_codes if region_name not in overview["today"]]
         
         # 現在の日時
         now = datetime.datetime.now()
         date_str = now.strftime("%Y年%m月%d日(%a)")
         
-        # 全データをまとめる
-        complete_data = {
-            "date": date_str,
-            "overview": overview,
-            "temperature": temperature,
-            "weekly": weekly,
-            "warnings": warnings,
-            "raw_data": {
+        # 生のデータは設定した場合のみアーカイブ・保持する
+        snapshot_id = new_snapshot_id(now)
+        raw_data = None
+        if self.raw_archive is not None or self.keep_raw_data:
+            raw_data = {
                 "jma": jma_data,
                 "weathermap": weathermap_data,
                 "yahoo": yahoo_data
             }
-        }
+            if self.raw_archive is not None:
+                self.raw_archive.save(snapshot_id, raw_data)
         
-        return complete_data
+        # 全データをまとめる
+        return WeatherSnapshot(
+            date_str,
+            mode,
+            overview,
+            temperature,
+            weekly,
+            warnings,
+            missing_regions,
+            deadline_exceeded=deadline is not None and deadline.expired(),
+            timings={stage: round(seconds, 3) for stage, seconds in timings.items()},
+            transfer=transfer,
+            snapshot_id=snapshot_id,
+            raw_data=raw_data if self.keep_raw_data else None
+        )
 
 # 単体テスト用
 if __name__ == "__main__":
     collector = WeatherDataCollector()
     data = collector.get_complete_weather_data()
-    print(json.dumps(data, ensure_ascii=False, indent=2))
+    print(json.dumps(data.to_dict(), ensure_ascii=False, indent=2))
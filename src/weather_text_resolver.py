@@ -0,0 +1,125 @@
+"""
+天気テキストから天気コードを求めるモジュール
+天気コード表の全テキストからAho-Corasickのオートマトンを1回だけ組み立て、
+入力テキストに含まれる最も長い（最も具体的な）天気テキストのコードを入力長に比例する時間で求めます。
+一度求めたテキストの結果はメモ表に保持します。
+"""
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class WeatherTextResolver:
+    """天気テキストの最長一致で天気コードを求めるリゾルバー"""
+
+    def __init__(self, code_mapping: Dict[str, str], memo_size: int = 1024):
+        """
+        Args:
+            code_mapping: 天気コードと天気テキストの対応表
+            memo_size: メモ表に保持するテキスト数の上限（超えた場合は表を空にして保持し直す）
+        """
+        self.memo_size = memo_size
+        self._memo: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+        # 状態ごとの遷移・失敗遷移・その状態で一致する最良の天気テキスト（長さ, 表の順番, コード）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._best: List[Optional[Tuple[int, int, str]]] = [None]
+
+        # 天気テキストのトライを組み立てる（同じテキストは表で先に現れるコードを使う）
+        for rank, (code, text) in enumerate(code_mapping.items()):
+            if not text:
+                continue
+            state = 0
+            for char in text:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(None)
+                state = next_state
+            if self._best[state] is None:
+                self._best[state] = (len(text), rank, code)
+
+        # 幅優先で失敗遷移を求め、接尾辞で一致するテキストも含めた最良の一致を各状態に持たせる
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._best[next_state] = self._better(self._best[next_state], self._best[self._fail[next_state]])
+                queue.append(next_state)
+
+        # 統計
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _better(a: Optional[Tuple[int, int, str]], b: Optional[Tuple[int, int, str]]) -> Optional[Tuple[int, int, str]]:
+        """長いテキストを優先し、同じ長さなら表で先に現れるものを選ぶ"""
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if a[0] != b[0]:
+            return a if a[0] > b[0] else b
+        return a if a[1] < b[1] else b
+
+    def _scan(self, weather_text: str) -> Optional[str]:
+        """オートマトンで入力を1回走査し、含まれる最長の天気テキストのコードを求める"""
+        goto, fail, best_at = self._goto, self._fail, self._best
+        state = 0
+        best = None
+        for char in weather_text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best_at[state] is not None:
+                best = self._better(best, best_at[state])
+        return best[2] if best is not None else None
+
+    def resolve(self, weather_text: str) -> Optional[str]:
+        """
+        天気テキストに含まれる最も具体的な天気テキストのコードを求める
+
+        Args:
+            weather_text: 天気テキスト（「晴れ時々曇り 所により雨」など）
+
+        Returns:
+            Optional[str]: 天気コード（表のどのテキストも含まない場合はNone）
+        """
+        try:
+            code = self._memo[weather_text]
+            self.hits += 1
+            return code
+        except KeyError:
+            pass
+
+        code = self._scan(weather_text)
+        with self._lock:
+            self.misses += 1
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[weather_text] = code
+        return code
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        リゾルバーの統計情報を取得する
+
+        Returns:
+            Dict[str, int]: オートマトンの状態数・メモ表の件数・ヒット数・ミス数
+        """
+        return {
+            "states": len(self._goto),
+            "memo_entries": len(self._memo),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,81 @@
+"""
+HTML抽出のテスト
+ダウンロードを打ち切る要素が、解析で読む全ての要素より後に現れることを
+モックサーバーの合成ページ（実ページと同じ要素構成）で確認します。
+"""
+
+import pytest
+
+from src.deadline import Deadline
+from src.html_extract import (
+    ElementEndScanner, read_html_stream, parse_weathermap_html, parse_yahoo_html,
+    WEATHERMAP_TARGET_CLASSES, YAHOO_TARGET_CLASSES, WEATHERMAP_END_CLASS, YAHOO_END_CLASS,
+    STOP_TARGET, STOP_DEADLINE
+)
+from src.mock_upstream_server import synthetic_weathermap_html, synthetic_yahoo_html
+
+PAGES = [
+    pytest.param(synthetic_weathermap_html("東京"), WEATHERMAP_TARGET_CLASSES, WEATHERMAP_END_CLASS,
+                 parse_weathermap_html, id="weathermap"),
+    pytest.param(synthetic_yahoo_html(), YAHOO_TARGET_CLASSES, YAHOO_END_CLASS,
+                 parse_yahoo_html, id="yahoo"),
+]
+
+
+class ChunkedResponse:
+    """本文を chunk_size バイトずつ返すレスポンス"""
+
+    def __init__(self, body):
+        self.body = body
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+def element_ends(page, class_name):
+    """クラスを持つ全ての要素の終わりの位置"""
+    ends = []
+    offset = 0
+    while True:
+        end = ElementEndScanner(class_name).feed(page[offset:])
+        if end is None:
+            return ends
+        offset += end
+        ends.append(offset)
+
+
+@pytest.mark.parametrize("page, target_classes, end_class, parse", PAGES)
+def test_end_class_is_a_target(page, target_classes, end_class, parse):
+    assert end_class in target_classes
+
+
+@pytest.mark.parametrize("page, target_classes, end_class, parse", PAGES)
+def test_stop_position_follows_every_target_element(page, target_classes, end_class, parse):
+    body, reason = read_html_stream(ChunkedResponse(page), end_class, max_bytes=len(page) * 2, chunk_size=64)
+
+    assert reason == STOP_TARGET
+    for class_name in target_classes:
+        ends = element_ends(page, class_name)
+        assert ends, class_name
+        assert max(ends) <= len(body), class_name
+
+
+@pytest.mark.parametrize("page, target_classes, end_class, parse", PAGES)
+def test_early_stop_parses_the_same_as_the_full_page(page, target_classes, end_class, parse):
+    body, _ = read_html_stream(ChunkedResponse(page), end_class, max_bytes=len(page) * 2, chunk_size=64)
+
+    full = parse(page.decode("utf-8"))
+    assert parse(body.decode("utf-8")) == full
+    assert full["today_weather"] and full["tomorrow_weather"]
+    assert len(full["temperatures"]) == 4
+    assert len(full["weekly"]) == 7
+
+
+@pytest.mark.parametrize("page, target_classes, end_class, parse", PAGES)
+def test_deadline_stops_the_download(page, target_classes, end_class, parse):
+    body, reason = read_html_stream(ChunkedResponse(page), end_class, max_bytes=len(page) * 2,
+                                    chunk_size=64, deadline=Deadline(0))
+
+    assert reason == STOP_DEADLINE
+    assert len(body) < len(page)
@@ -0,0 +1,94 @@
+"""
+予報区の索引のテスト
+update_area_file で area.json から作り直した予報区ファイルで、
+細分区域・市町村等のコードから府県予報区を引けること、府県予報区から下の階層を引けることを確認します。
+"""
+
+import json
+import shutil
+
+import pytest
+
+from src.jma_areas import (
+    AREA_LEVELS, DEFAULT_AREA_FILE, LEVEL_CLASS10, LEVEL_CLASS20, LEVEL_OFFICES,
+    AreaIndex, get_area_index, load_area_data, update_area_file
+)
+
+# 気象庁の area.json と同じ形の、東京都の一部だけを含む内容
+AREA_JSON = {
+    "centers": {
+        "010300": {"name": "関東甲信地方", "officeName": "気象庁", "children": ["130000"]}
+    },
+    "offices": {
+        "130000": {"name": "東京都", "officeName": "気象庁", "parent": "010300", "children": ["130010"]}
+    },
+    "class10s": {
+        "130010": {"name": "東京地方", "parent": "130000", "children": ["130011"]}
+    },
+    "class15s": {
+        "130011": {"name": "２３区東部", "parent": "130010", "children": ["1310100"]}
+    },
+    "class20s": {
+        "1310100": {"name": "千代田区", "kana": "ちよだく", "parent": "130011"}
+    }
+}
+
+
+@pytest.fixture
+def area_file(tmp_path):
+    """同梱の予報区ファイルの写しを AREA_JSON で更新したもの"""
+    path = tmp_path / "jma_areas.json"
+    shutil.copyfile(DEFAULT_AREA_FILE, path)
+    update_area_file(AREA_JSON, str(path))
+    return path
+
+
+def test_class10_and_class20_resolve_to_their_office(area_file):
+    index = AreaIndex(load_area_data(str(area_file)))
+
+    assert index.parent("130010").code == "130000"
+    assert index.office_of("130010").code == "130000"
+    assert index.office_of("1310100", LEVEL_CLASS20).code == "130000"
+    assert index.office_of("1310100").name == "東京都"
+
+
+def test_office_lists_its_children(area_file):
+    index = AreaIndex(load_area_data(str(area_file)))
+
+    assert [child.code for child in index.children("130000", LEVEL_OFFICES)] == ["130010"]
+    assert [child.code for child in index.children("130011")] == ["1310100"]
+    assert index.forecast_area_codes("130000") == {"130000", "130010"}
+
+
+def test_update_keeps_local_settings_and_drops_extra_keys(area_file):
+    bundled = load_area_data(DEFAULT_AREA_FILE)
+    updated = load_area_data(str(area_file))
+
+    assert updated["forecast_file_aliases"] == bundled["forecast_file_aliases"]
+    assert updated["broadcast_regions"] == bundled["broadcast_regions"]
+    assert updated["class20s"]["1310100"] == {"name": "千代田区", "parent": "130011"}
+
+
+def test_update_refuses_partial_area_json(tmp_path):
+    path = tmp_path / "jma_areas.json"
+    shutil.copyfile(DEFAULT_AREA_FILE, path)
+    before = path.read_text(encoding="utf-8")
+
+    partial = {level: AREA_JSON[level] for level in ("centers", "offices")}
+    with pytest.raises(ValueError):
+        update_area_file(partial, str(path))
+
+    assert path.read_text(encoding="utf-8") == before
+
+
+def test_bundled_file_covers_every_level():
+    stats = get_area_index().get_stats()
+    if not stats[LEVEL_CLASS10] or not stats[LEVEL_CLASS20]:
+        pytest.skip("bundled area file has no class10s/class20s; run `python -m src.jma_areas update`")
+
+    index = get_area_index()
+    assert all(stats[level] for level in AREA_LEVELS)
+    for office in index.offices():
+        assert index.children(office.code, LEVEL_OFFICES), office.code
+        for child in index.children(office.code, LEVEL_OFFICES):
+            assert index.office_of(child.code, LEVEL_CLASS10).code == office.code
@@ -0,0 +1,73 @@
+"""
+気象庁予報データの正規化のテスト
+別の府県予報区のファイルにまとめて発表される予報区（十勝地方は釧路・根室地方のファイル）が、
+ファイル全体ではなく自身の区域・地点だけを返すことを確認します。
+"""
+
+from src.jma_areas import get_area_index
+from src.jma_normalizer import normalize_office_forecast
+
+DAYS = ["2024-06-01T00:00:00+09:00", "2024-06-02T00:00:00+09:00"]
+
+# 区域は釧路地方・根室地方・十勝地方の順、地点も同じ順に1つずつ並ぶ
+AREAS = [("014010", "釧路地方"), ("014020", "根室地方"), ("014030", "十勝地方")]
+POINTS = [("10001", "釧路"), ("10002", "根室"), ("10003", "帯広")]
+
+
+def shared_file_forecast():
+    """十勝地方を含む釧路・根室地方の予報JSON（必要な項目のみ）"""
+    return [
+        {
+            "publishingOffice": "釧路地方気象台",
+            "reportDatetime": DAYS[0],
+            "timeSeries": [
+                {"timeDefines": DAYS, "areas": [
+                    {"area": {"code": code, "name": name}, "weatherCodes": ["100", "200"], "weathers": ["晴れ", "くもり"]}
+                    for code, name in AREAS
+                ]},
+                {"timeDefines": DAYS, "areas": [
+                    {"area": {"code": code, "name": name}, "temps": [str(20 + i), str(10 + i)]}
+                    for i, (code, name) in enumerate(POINTS)
+                ]}
+            ]
+        },
+        {
+            "timeSeries": [
+                {"timeDefines": DAYS, "areas": [
+                    {"area": {"code": code, "name": name}, "weatherCodes": ["100", "101"], "pops": ["", "10"]}
+                    for code, name in (AREAS[0], AREAS[2])
+                ]},
+                {"timeDefines": DAYS, "areas": [
+                    {"area": {"code": code, "name": name}, "tempsMin": ["", "9"], "tempsMax": ["", "21"]}
+                    for code, name in (POINTS[0], POINTS[2])
+                ]}
+            ]
+        }
+    ]
+
+
+def test_merged_office_keeps_only_its_own_areas_and_points():
+    shared = normalize_office_forecast("014100", shared_file_forecast())
+
+    tokachi = shared.subset("014030", get_area_index().forecast_area_codes("014030"))
+
+    assert tokachi.office_code == "014030"
+    assert list(tokachi.areas) == ["014030"]
+    assert list(tokachi.cities) == ["10003"]
+    assert tokachi.cities["10003"].temps == [22, 12]
+    assert list(tokachi.weekly_areas) == ["014030"]
+    assert list(tokachi.weekly_cities) == ["10003"]
+    assert tokachi.publishing_office == "釧路地方気象台"
+
+    # 元の予報は変更しない
+    assert len(shared.areas) == 3 and len(shared.cities) == 3
+
+
+def test_points_are_dropped_when_they_do_not_line_up_with_areas():
+    forecast = shared_file_forecast()
+    forecast[0]["timeSeries"][1]["areas"].pop()
+
+    tokachi = normalize_office_forecast("014100", forecast).subset("014030", {"014030"})
+
+    assert list(tokachi.areas) == ["014030"]
+    assert tokachi.cities == {}